@@ -0,0 +1,77 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.api.dependencies import verify_admin_token
+from app.api.middleware import request_profiles
+from app.core.config import get_job_store, settings
+from app.core.profiler import profile_for, profile_in_progress
+from app.dao.coalescing import flights
+
+
+router = APIRouter(prefix='/admin', tags=['Admin'], dependencies=[Depends(verify_admin_token)])
+
+
+def collapsed_response(stacks: str, name: str) -> PlainTextResponse:
+    return PlainTextResponse(stacks, headers={'Content-Disposition': f'attachment; filename="{name}.collapsed"'})
+
+
+@router.get('/profile')
+async def capture_profile(
+    seconds: float = Query(10, gt=0, le=300),
+    interval_ms: float | None = Query(None, ge=1, le=1000),
+    threads: bool = False,
+):
+    """
+    Профилирует процесс в течение seconds секунд и возвращает стеки в collapsed-формате.
+
+    Файл открывается в speedscope или преобразуется в SVG через flamegraph.pl / inferno-flamegraph.
+    """
+    if profile_in_progress():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail='Профилирование уже выполняется')
+    interval = (interval_ms or settings.PROFILING_INTERVAL_MS) / 1000
+    stacks, samples = await profile_for(seconds, interval=interval, threads=threads)
+    response = collapsed_response(stacks, f'profile-{datetime.now():%Y%m%d-%H%M%S}')
+    response.headers['X-Profile-Samples'] = str(samples)
+    return response
+
+
+@router.get('/profile/requests')
+async def list_request_profiles():
+    """Список сохранённых профилей запросов (без стеков)."""
+    return [{'id': profile_id, **profile._asdict(), 'stacks': None} for profile_id, profile in request_profiles.items()]
+
+
+@router.get('/profile/requests/{profile_id}')
+async def get_request_profile(profile_id: str):
+    """Профиль запроса в collapsed-формате по ID из заголовка X-Profile-Id."""
+    profile = request_profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Профиль не найден')
+    return collapsed_response(profile.stacks, f'request-{profile_id}')
+
+
+@router.get('/coalescing')
+async def coalescing_stats(reset: bool = False):
+    """
+    Статистика объединения одинаковых конкурентных чтений DAO (single-flight).
+
+    coalescing_ratio — доля вызовов, получивших результат чужого запроса вместо своего.
+    С reset=true счётчики обнуляются после ответа.
+    """
+    stats = flights.stats()
+    if reset:
+        flights.reset_stats()
+    return stats
+
+
+@router.get('/job-store')
+async def job_store_stats():
+    """
+    Состояние фоновой записи хранилища задач планировщика.
+
+    pending — операции, ещё не записанные в БД; failed_writes растёт, пока запись в БД
+    не проходит (пакет при этом повторяется, а не отбрасывается).
+    """
+    return get_job_store().stats()
@@ -0,0 +1,20 @@
+import secrets
+
+from fastapi import Header, HTTPException, status
+
+from app.core.config import settings
+
+
+def is_admin_token(token: str | None) -> bool:
+    """Проверяет токен администратора API (при пустом ADMIN_API_TOKEN доступ закрыт)."""
+    if not settings.ADMIN_API_TOKEN or not token:
+        return False
+    return secrets.compare_digest(token.encode(), settings.ADMIN_API_TOKEN.encode())
+
+
+async def verify_admin_token(x_admin_token: str | None = Header(None)) -> None:
+    """Зависимость для служебных эндпоинтов: требует заголовок X-Admin-Token."""
+    if not settings.ADMIN_API_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Not Found')
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Неверный токен администратора')
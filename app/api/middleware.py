@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import random
+import re
+import time
+import uuid
+from typing import List, NamedTuple, Tuple
+
+from loguru import logger
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.dependencies import is_admin_token
+from app.core.profiler import TaskSampler, collapse
+from app.dao.cache import PROCESS_ID, TTLCache, reference_cache
+
+
+class CacheRule(NamedTuple):
+    """
+    Правило кеширования для GET-эндпоинтов.
+
+    :param path: Регулярное выражение для пути запроса.
+    :param tables: Таблицы, от версий которых зависит ответ.
+    :param max_age: Значение max-age для заголовка Cache-Control (секунды).
+    """
+
+    path: str
+    tables: Tuple[str, ...]
+    max_age: int = 0
+
+
+class ResponseCacheMiddleware:
+    """
+    ASGI-middleware для кеширования ответов читающих эндпоинтов.
+
+    ETag строится из пути, строки запроса и версий таблиц, от которых зависит ответ,
+    поэтому проверка If-None-Match не требует ни запросов к БД, ни сериализации.
+    Тела успешных ответов хранятся в LRU-кеше по тому же ключу не дольше ttl секунд.
+    Версии таблиц ведутся в памяти процесса, поэтому ETag включает идентификатор процесса.
+
+    Запись в другом воркере меняет версии этого процесса только через канал инвалидации
+    (REFERENCE_CACHE_CHANNEL). Без канала (shared_versions=False) ключ включает ещё и номер
+    интервала ttl, поэтому и тело, и ETag устаревают не позже чем через ttl секунд: столько
+    воркер может отдавать данные без записей других воркеров.
+
+    Ключ кеша не учитывает заголовки запроса, поэтому middleware должно стоять внутри
+    CORSMiddleware: CORS-заголовки зависят от Origin и не попадают в кеш. На всякий случай
+    заголовки Access-Control-* из ответа приложения в кеш не сохраняются.
+    """
+
+    def __init__(self, app: ASGIApp, rules: List[CacheRule], maxsize: int = 512, ttl: float = 10,
+                 shared_versions: bool = False):
+        self.app = app
+        self._rules = [(re.compile(rule.path), rule) for rule in rules]
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._ttl = ttl
+        self._shared_versions = shared_versions
+
+    def _match(self, path: str) -> CacheRule | None:
+        for pattern, rule in self._rules:
+            if pattern.fullmatch(path):
+                return rule
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or scope['method'] not in ('GET', 'HEAD'):
+            await self.app(scope, receive, send)
+            return
+
+        rule = self._match(scope['path'])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        versions = tuple(reference_cache.version(table) for table in rule.tables)
+        if not self._shared_versions:
+            # Версии не видят записей других воркеров: ключ меняется хотя бы раз в ttl секунд
+            versions += (int(time.time() // self._ttl),)
+        key = (scope['path'], scope['query_string'], versions)
+        digest = hashlib.blake2b(repr((PROCESS_ID, key)).encode(), digest_size=16).hexdigest()
+        etag = f'"{digest}"'.encode()
+        cache_headers = [
+            (b'etag', etag),
+            (b'cache-control', f'max-age={rule.max_age}, must-revalidate'.encode()),
+        ]
+
+        if_none_match = Headers(scope=scope).get('if-none-match') or ''
+        tags = [tag.strip() for tag in if_none_match.split(',') if tag.strip()]
+        # «*» означает «любое представление»: 304 только если известно, что обработчик отвечает 200
+        wildcard = '*' in tags
+        cached = self._cache.get(key)
+        if etag.decode() in tags or (wildcard and cached is not None):
+            await self._send_not_modified(send, cache_headers)
+            return
+
+        if cached is not None:
+            status, headers, body = cached
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else body})
+            return
+
+        start_message: Message = {}
+        chunks: List[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message
+            if message['type'] == 'http.response.start':
+                start_message = message
+                return
+            if message['type'] != 'http.response.body':
+                await send(message)
+                return
+            chunks.append(message.get('body', b''))
+            if message.get('more_body', False):
+                return
+
+            status = start_message['status']
+            headers = list(start_message.get('headers', []))
+            body = b''.join(chunks)
+            if status == 200:
+                headers = [
+                    (name, value) for name, value in headers if name.lower() not in (b'etag', b'cache-control')
+                ] + cache_headers
+                if scope['method'] == 'GET':
+                    self._cache.set(key, (status, [
+                        (name, value) for name, value in headers if not name.lower().startswith(b'access-control-')
+                    ], body))
+                if wildcard:
+                    await self._send_not_modified(send, cache_headers)
+                    return
+            await send({**start_message, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    async def _send_not_modified(send: Send, headers: List[Tuple[bytes, bytes]]) -> None:
+        await send({'type': 'http.response.start', 'status': 304, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b''})
+
+
+class RequestProfile(NamedTuple):
+    """Профиль одного запроса в collapsed-формате."""
+
+    method: str
+    path: str
+    status: int
+    duration_ms: float
+    samples: int
+    stacks: str
+
+
+# Последние профили запросов: ID профиля -> RequestProfile
+request_profiles = TTLCache(maxsize=100, ttl=3600)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI-middleware для профилирования отдельных запросов.
+
+    Профилируется запрос с заголовком X-Profile (вместе с X-Admin-Token) и случайная доля
+    sample_rate всех запросов. Семплируется только задача запроса: и время на CPU, и ожидание
+    БД и Bot API. Все профилируемые запросы семплирует один общий поток (TaskSampler).
+    ID профиля возвращается в заголовке X-Profile-Id, сам профиль доступен
+    через GET /admin/profile/requests/{profile_id}.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 0.0, interval: float = 0.005):
+        self.app = app
+        self._sample_rate = sample_rate
+        self._sampler = TaskSampler(interval=interval)
+
+    def _should_profile(self, scope: Scope) -> bool:
+        headers = Headers(scope=scope)
+        if 'x-profile' in headers and is_admin_token(headers.get('x-admin-token')):
+            return True
+        return self._sample_rate > 0 and random.random() < self._sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                message = {**message, 'headers': [*message.get('headers', []), (b'x-profile-id', profile_id.encode())]}
+            await send(message)
+
+        task = asyncio.current_task()
+        start = time.perf_counter()
+        self._sampler.register(task)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stacks, samples = self._sampler.unregister(task)
+            duration_ms = (time.perf_counter() - start) * 1000
+            request_profiles.set(profile_id, RequestProfile(
+                scope['method'], scope['path'], status, duration_ms, samples, collapse(stacks),
+            ))
+            logger.info(f'Профиль запроса {scope["method"]} {scope["path"]}: {profile_id} ({duration_ms:.1f} ms)')
@@ -0,0 +1,30 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from app.db.database import Base
+from app.db.serializers import get_serializer
+
+
+def orjson_default(obj: Any) -> Any:
+    """Сериализация типов, которые orjson не поддерживает сам (модели SQLAlchemy, Decimal)."""
+    if isinstance(obj, Base):
+        return get_serializer(obj.__class__)(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f'Тип {type(obj).__name__} не сериализуется в JSON')
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON-ответ на orjson, который умеет напрямую отдавать модели SQLAlchemy.
+
+    Эндпоинты возвращают его явно, чтобы FastAPI не прогонял результат через jsonable_encoder.
+    """
+
+    media_type = 'application/json'
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
@@ -1,5 +1,5 @@
 from contextlib import asynccontextmanager
-from typing import List
+from typing import Dict, List
 import asyncio
 import logging
 import httpx
@@ -14,6 +14,7 @@ class HTTPClientManager:
             raise ValueError('Значение pool_size должно быть положительным целым числом')
 
         self._clients: List[httpx.AsyncClient] = []  # Пул клиентов
+        self._in_use: Dict[httpx.AsyncClient, int] = {}  # Сколько пользователей у каждого клиента
         self._pool_size = pool_size  # Максимальный размер пула
         self._client_kwargs = client_kwargs  # Аргументы для создания клиента
         self._lock = asyncio.Lock()  # Блокировка для обеспечения потокобезопасности
@@ -23,35 +24,40 @@ class HTTPClientManager:
 
     async def get_client(self) -> httpx.AsyncClient:
         """
-        Получение клиента из пула. Если пул пуст, создается новый клиент.
+        Получение клиента из пула. Свободный клиент переиспользуется; если свободных нет
+        и пул не заполнен, создается новый клиент, иначе выдается наименее загруженный
+        (httpx.AsyncClient допускает параллельные запросы). Клиентов не больше pool_size.
         """
         async with self._lock:
-            if len(self._clients) < self._pool_size:
+            client = next((client for client in self._clients if not self._in_use.get(client)), None)
+            if client is None and len(self._clients) < self._pool_size:
                 logging.info(f'Создание нового клиента. Размер пула: {len(self._clients)}/{self._pool_size}')
                 try:
                     # Создаем новый клиент с переданными параметрами (включая timeout)
                     client = httpx.AsyncClient(**self._client_kwargs)
                     self._clients.append(client)
-                    return client
                 except Exception as e:
                     logging.error(f'Не удалось создать HTTP-клиент: {e}')
                     raise RuntimeError(f'Не удалось создать HTTP-клиент: {e}')
-            else:
-                logging.info(f'Использование клиента из пула. Размер пула: {len(self._clients)}/{self._pool_size}')
-                return self._clients.pop(0)  # Возвращаем первый клиент из пула
+            elif client is None:
+                client = min(self._clients, key=lambda item: self._in_use.get(item, 0))
+            self._in_use[client] = self._in_use.get(client, 0) + 1
+            return client
 
     async def release_client(self, client: httpx.AsyncClient):
         """
-        Возвращение клиента в пул. Если пул заполнен, клиент закрывается.
+        Возвращение клиента в пул. Клиент остается открытым для следующих запросов;
+        закрытый клиент удаляется из пула.
         """
         async with self._lock:
+            users = self._in_use.pop(client, 0) - 1
+            if users > 0:
+                self._in_use[client] = users
             if client.is_closed:
                 logging.warning('Попытка вернуть закрытый клиент в пул.')
-                return
-            if len(self._clients) < self._pool_size:
-                self._clients.append(client) # Возвращаем клиент в пул
-            else:
-                await client.aclose() # Закрываем клиент, если пул заполнен
+                if client in self._clients:
+                    self._clients.remove(client)
+                self._in_use.pop(client, None)
 
     async def close_client(self, client: httpx.AsyncClient):
         """
@@ -63,6 +69,7 @@ class HTTPClientManager:
             try:
                 await client.aclose()  # Закрываем клиент
                 self._clients.remove(client)  # Удаляем клиент из пула
+                self._in_use.pop(client, None)
             except Exception as e:
                 logging.error(f'Не удалось закрыть клиент: {e}')
 
@@ -79,6 +86,7 @@ class HTTPClientManager:
                     raise f'Ошибки при закрытии клиентов: {e}'
                 finally:
                     self._clients.remove(client)  # Удаляем клиент из пула
+                    self._in_use.pop(client, None)
 
     @asynccontextmanager
     async def client(self):
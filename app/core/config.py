@@ -1,14 +1,17 @@
+from functools import cache
 import os
-from typing import List
+from typing import TYPE_CHECKING, List
 from dotenv import load_dotenv
 
 from urllib.parse import quote
-from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from faststream.rabbit import RabbitBroker
 from loguru import logger
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+if TYPE_CHECKING:
+    from faststream.rabbit import RabbitBroker
+    from app.core.job_store import BufferedSQLAlchemyJobStore
+    from app.core.scheduler import CoalescingAsyncIOScheduler, SchedulerLeader
+
 
 env_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '.env')
 
@@ -25,12 +28,38 @@ class Settings(BaseSettings):
     STORE_URL: str
 
     BASE_URL: str
+    FRONT_SITE: str
     RABBITMQ_USERNAME: str
     RABBITMQ_PASSWORD: str
     RABBITMQ_HOST: str
     RABBITMQ_PORT: int
     VHOST: str
 
+    REFERENCE_CACHE_CHANNEL: bool = False
+    USER_CACHE_SIZE: int = 10_000
+    USER_CACHE_TTL: int = 3600
+    AVAILABILITY_CACHE_TTL: int = 30
+    DAO_SINGLE_FLIGHT: bool = True
+    RESPONSE_CACHE_SIZE: int = 512
+    RESPONSE_CACHE_TTL: int = 10
+    SCHEDULER_LEASE_TTL: int = 30
+    BOOKING_ARCHIVE_AFTER_DAYS: int = 30
+    BOOKING_ARCHIVE_BATCH_SIZE: int = 1000
+    BOOKING_ARCHIVE_INTERVAL: int = 3600
+    MY_BOOKINGS_LIMIT: int = 5
+    SQLITE_WRITE_QUEUE: bool = False
+    SQLITE_WRITE_BATCH: int = 64
+    SQLITE_WRITE_DELAY_MS: float = 0.0
+
+    TG_API_URL: str = 'https://api.telegram.org'
+    STARTUP_CALL_TIMEOUT: float = 5.0
+    WEBHOOK_STATE_FILE: str = '.webhook_state'
+    WEBHOOK_INLINE_REPLY: bool = True
+
+    ADMIN_API_TOKEN: str = ''
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_MS: float = 5.0
+
     model_config = SettingsConfigDict(env_file=env_file_path)
 
     @property
@@ -49,22 +78,53 @@ class Settings(BaseSettings):
         """Возвращаем URL вебхука."""
         return f'{self.BASE_URL}/webhook'
 
+    def get_tg_api_url(self) -> str:
+        """Возвращаем базовый URL Telegram Bot API для бота."""
+        return f'{self.TG_API_URL}/bot{self.BOT_TOKEN}'
+
 
 # Инициализация конфигурации
 settings = Settings()
 
-# Настройка логирования
+# Настройка логирования (файл открывается при первой записи)
 log_file_path = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), 'log.txt'
     )
 logger.add(
-    log_file_path, format=settings.FORMAT_LOG, level="INFO", rotation=settings.LOG_ROTATION
+    log_file_path, format=settings.FORMAT_LOG, level="INFO", rotation=settings.LOG_ROTATION, delay=True
     )
 
-# Создание брокера сообщений RabbitMQ
-broker = RabbitBroker(url=settings.get_rabbitmq_url)
 
-# Создание планировщика задач
-scheduler = AsyncIOScheduler(
-    jobstores={'default': SQLAlchemyJobStore(url=settings.STORE_URL)
-               })
+# Брокер и планировщик создаются лениво: их импорт и инициализация заметно
+# замедляют старт, а нужны они не каждому процессу (миграции, скрипты).
+
+@cache
+def get_broker() -> 'RabbitBroker':
+    """Возвращает брокер сообщений RabbitMQ."""
+    from faststream.rabbit import RabbitBroker
+
+    return RabbitBroker(url=settings.get_rabbitmq_url)
+
+
+@cache
+def get_job_store() -> 'BufferedSQLAlchemyJobStore':
+    """Возвращает хранилище задач (запись задач в БД идёт в фоновом потоке)."""
+    from app.core.job_store import BufferedSQLAlchemyJobStore
+
+    return BufferedSQLAlchemyJobStore(url=settings.STORE_URL)
+
+
+@cache
+def get_scheduler() -> 'CoalescingAsyncIOScheduler':
+    """Возвращает планировщик задач."""
+    from app.core.scheduler import CoalescingAsyncIOScheduler
+
+    return CoalescingAsyncIOScheduler(jobstores={'default': get_job_store()})
+
+
+@cache
+def get_scheduler_leader() -> 'SchedulerLeader':
+    """Возвращает координатора лидерства: выполняет задачи только воркер-лидер, добавлять могут все."""
+    from app.core.scheduler import SchedulerLeader
+
+    return SchedulerLeader(get_scheduler(), get_job_store(), ttl=settings.SCHEDULER_LEASE_TTL)
@@ -0,0 +1,258 @@
+import asyncio
+import pickle
+import queue
+import threading
+import time
+from typing import Dict, List, Set, Tuple
+
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.util import datetime_to_utc_timestamp
+from loguru import logger
+
+
+# Служебные операции очереди записи
+_REMOVE_ALL = object()
+_STOP = object()
+
+
+class BufferedSQLAlchemyJobStore(SQLAlchemyJobStore):
+    """
+    Хранилище задач APScheduler, которое не блокирует цикл событий.
+
+    Все чтения планировщика (get_due_jobs, lookup_job, get_next_run_time) обслуживаются
+    из зеркала в памяти, загруженного из БД при старте. Изменения применяются к зеркалу
+    сразу, а в БД записываются фоновым потоком: операции из очереди объединяются
+    в пакеты (до batch_size штук) и фиксируются одной транзакцией, при этом несколько
+    изменений одной задачи схлопываются в последнее.
+
+    Если запись не удалась, пакет не отбрасывается: поток повторяет его с экспоненциальной
+    задержкой (от retry_delay до max_retry_delay секунд), добавляя к нему новые операции,
+    пока запись не пройдёт. flush дожидается именно записи. При остановке делается
+    stop_retries попыток, после чего незаписанные операции логируются как потерянные.
+    Ошибки записи видны в логах и в stats().
+    """
+
+    def __init__(self, *args, batch_size: int = 500, retry_delay: float = 0.5, max_retry_delay: float = 30.0,
+                 stop_retries: int = 3, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._memory = MemoryJobStore()
+        self._batch_size = batch_size
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+        self._stop_retries = stop_retries
+        self._stopping = threading.Event()
+        self.failed_writes = 0
+        self.last_error: str | None = None
+        self._queue: queue.Queue = queue.Queue()
+        self._writer: threading.Thread | None = None
+        # ID задач, изменённых локально во время refresh_async (None — обновление не идёт)
+        self._touched: Set[str] | None = None
+        self._touched_all = False
+
+    def start(self, scheduler, alias):
+        super().start(scheduler, alias)
+        self._memory.start(scheduler, alias)
+        for job in super().get_all_jobs():
+            self._memory.add_job(job)
+        logger.info(f'Хранилище задач {alias}: загружено {len(self._memory.get_all_jobs())} задач')
+        self._writer = threading.Thread(target=self._write_loop, name=f'jobstore-writer-{alias}', daemon=True)
+        self._writer.start()
+
+    def shutdown(self):
+        if self._writer is not None:
+            self._stopping.set()
+            self._queue.put(_STOP)
+            self._writer.join()
+            self._writer = None
+        self._memory.shutdown()
+        super().shutdown()
+
+    # Чтение — из зеркала в памяти
+
+    def lookup_job(self, job_id):
+        return self._memory.lookup_job(job_id)
+
+    def get_due_jobs(self, now):
+        return self._memory.get_due_jobs(now)
+
+    def get_next_run_time(self):
+        return self._memory.get_next_run_time()
+
+    def get_all_jobs(self):
+        return self._memory.get_all_jobs()
+
+    # Запись — в зеркало сразу, в БД через фоновый поток
+
+    def add_job(self, job):
+        self._memory.add_job(job)
+        self._touch(job.id)
+        self._enqueue_upsert(job)
+
+    def update_job(self, job):
+        self._memory.update_job(job)
+        self._touch(job.id)
+        self._enqueue_upsert(job)
+
+    def remove_job(self, job_id):
+        self._memory.remove_job(job_id)
+        self._touch(job_id)
+        self._queue.put((job_id, None))
+
+    def remove_all_jobs(self):
+        self._memory.remove_all_jobs()
+        self._touched_all = True
+        self._queue.put(_REMOVE_ALL)
+
+    def flush(self) -> None:
+        """Блокирующе дожидается записи всех операций из очереди в БД."""
+        self._queue.join()
+
+    async def flush_async(self) -> None:
+        """Дожидается записи всех операций, не блокируя цикл событий."""
+        await asyncio.get_running_loop().run_in_executor(None, self.flush)
+
+    def stats(self) -> dict:
+        """Операции в очереди записи, число неудачных попыток записи и последняя ошибка."""
+        return {
+            'pending': self._queue.unfinished_tasks,
+            'failed_writes': self.failed_writes,
+            'last_error': self.last_error,
+        }
+
+    async def refresh_async(self) -> None:
+        """
+        Синхронизирует зеркало в памяти с БД, не блокируя цикл событий.
+
+        Нужно, когда задачи в общую таблицу пишут другие процессы (см. SchedulerLeader).
+        Сначала дожидается записи собственной очереди, затем читает таблицу в потоке
+        и применяет снимок к зеркалу. Задачи, изменённые локально за время чтения, не трогаются.
+        """
+        self._touched, self._touched_all = set(), False
+        try:
+            jobs = await asyncio.get_running_loop().run_in_executor(None, self._load_snapshot)
+            touched, touched_all = self._touched, self._touched_all
+        finally:
+            self._touched, self._touched_all = None, False
+        if touched_all:
+            return
+
+        snapshot = {job.id: job for job in jobs}
+        changed = False
+        for job in self._memory.get_all_jobs():
+            if job.id not in snapshot and job.id not in touched:
+                self._memory.remove_job(job.id)
+                changed = True
+        for job_id, job in snapshot.items():
+            if job_id in touched:
+                continue
+            current = self._memory.lookup_job(job_id)
+            if current is None:
+                self._memory.add_job(job)
+                changed = True
+            elif current.__getstate__() != job.__getstate__():
+                self._memory.update_job(job)
+                changed = True
+
+        # Новые задачи могли оказаться раньше текущего таймера планировщика
+        if changed and self._scheduler is not None and self._scheduler.running:
+            self._scheduler.wakeup()
+
+    def _load_snapshot(self) -> List:
+        self.flush()
+        return super().get_all_jobs()
+
+    def _touch(self, job_id: str) -> None:
+        if self._touched is not None:
+            self._touched.add(job_id)
+
+    def _enqueue_upsert(self, job) -> None:
+        self._queue.put((job.id, (datetime_to_utc_timestamp(job.next_run_time), job.__getstate__())))
+
+    def _take(self, batch: List, block: bool) -> None:
+        """Добавляет в batch операции из очереди (до batch_size штук)."""
+        if block:
+            batch.append(self._queue.get())
+        while len(batch) < self._batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+    def _write_loop(self) -> None:
+        batch: List = []
+        attempt = 0
+        while True:
+            # После ошибки пакет остаётся: новые операции дописываются в его конец
+            self._take(batch, block=not batch)
+            stop = any(op is _STOP for op in batch)
+            try:
+                self._write_batch([op for op in batch if op is not _STOP])
+            except Exception as e:
+                attempt += 1
+                self.failed_writes += 1
+                self.last_error = repr(e)
+                if self._stopping.is_set() and attempt >= self._stop_retries:
+                    while not stop:
+                        batch.append(op := self._queue.get())
+                        stop = op is _STOP
+                    lost = sum(op is not _STOP for op in batch)
+                    logger.error(f'Хранилище задач остановлено, {lost} операций не записаны в БД: {e}')
+                    self._done(batch)
+                    return
+                delay = min(self._retry_delay * 2 ** (attempt - 1), self._max_retry_delay)
+                logger.opt(exception=attempt == 1).error(
+                    f'Не удалось записать {sum(op is not _STOP for op in batch)} операций в хранилище задач '
+                    f'(попытка {attempt}), повтор через {delay:.1f} с: {e}'
+                )
+                if self._stopping.is_set():
+                    time.sleep(self._retry_delay)
+                else:
+                    # Остановка прерывает ожидание: оставшиеся попытки делаются сразу с короткой паузой
+                    self._stopping.wait(delay)
+                continue
+
+            if attempt:
+                logger.info(f'Хранилище задач: запись восстановлена после {attempt} неудачных попыток')
+                attempt = 0
+            self._done(batch)
+            if stop:
+                return
+            batch = []
+
+    def _done(self, batch: List) -> None:
+        for _ in batch:
+            self._queue.task_done()
+
+    def _write_batch(self, batch: List) -> None:
+        if not batch:
+            return
+
+        remove_all = False
+        changes: Dict[str, Tuple[float, dict] | None] = {}
+        for op in batch:
+            if op is _REMOVE_ALL:
+                remove_all = True
+                changes.clear()
+            else:
+                job_id, payload = op
+                changes[job_id] = payload
+
+        rows = [
+            {
+                'id': job_id,
+                'next_run_time': next_run_time,
+                'job_state': pickle.dumps(state, self.pickle_protocol),
+            }
+            for job_id, payload in changes.items()
+            if payload is not None
+            for next_run_time, state in (payload,)
+        ]
+        with self.engine.begin() as connection:
+            if remove_all:
+                connection.execute(self.jobs_t.delete())
+            elif changes:
+                connection.execute(self.jobs_t.delete().where(self.jobs_t.c.id.in_(list(changes))))
+            if rows:
+                connection.execute(self.jobs_t.insert(), rows)
+        logger.debug(f'Хранилище задач: записано {len(rows)} задач, удалено {len(changes) - len(rows)}')
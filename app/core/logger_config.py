@@ -11,7 +11,11 @@ import sys
 import logging
 import os
 from pathlib import Path
-from loguru import logger, Logger
+from typing import TYPE_CHECKING
+from loguru import logger
+
+if TYPE_CHECKING:
+    from loguru import Logger
 
 
 class InterceptHandler(logging.Handler):
@@ -44,7 +48,7 @@ def setup_logger(
     log_level: str = "INFO",
     rotation: str = "100 MB",
     retention: str = "7 days",
-    ) -> Logger:
+    ) -> 'Logger':
     """
     Настройка логгера для приложения.
 
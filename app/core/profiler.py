@@ -0,0 +1,255 @@
+import asyncio
+from collections import Counter
+import os
+import sys
+import threading
+import time
+from types import CodeType, FrameType
+from typing import Dict, List
+
+
+# Корень проекта: пути внутри него показываются относительно него
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Кадры цикла событий, на которых стек обрезается: запуск колбэка задачи и итерация цикла
+_LOOP_FRAMES = {
+    (os.path.join('asyncio', 'events.py'), '_run'),
+    (os.path.join('asyncio', 'base_events.py'), '_run_once'),
+}
+
+_labels: Dict[CodeType, str] = {}
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(PROJECT_ROOT + os.sep):
+        return os.path.relpath(filename, PROJECT_ROOT)
+    for marker in ('site-packages' + os.sep, 'dist-packages' + os.sep):
+        index = filename.rfind(marker)
+        if index != -1:
+            return filename[index + len(marker):]
+    return os.path.join(*filename.split(os.sep)[-2:])
+
+
+def _is_loop_frame(code: CodeType) -> bool:
+    return any(code.co_name == name and code.co_filename.endswith(path) for path, name in _LOOP_FRAMES)
+
+
+def _label(code: CodeType) -> str:
+    """Подпись кадра для collapsed-формата: функция и файл (символ ';' заменяется)."""
+    label = _labels.get(code)
+    if label is None:
+        name = getattr(code, 'co_qualname', code.co_name)
+        label = f'{name} ({_short_path(code.co_filename)})'.replace(';', ':')
+        _labels[code] = label
+    return label
+
+
+def frame_stack(frame: FrameType | None) -> List[str]:
+    """Стек потока от внешнего кадра к внутреннему; кадры цикла событий выше колбэка отбрасываются."""
+    stack = []
+    while frame is not None:
+        if _is_loop_frame(frame.f_code):
+            break
+        stack.append(_label(frame.f_code))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def coroutine_stack(coro) -> List[str]:
+    """Стек ожидания корутины: цепочка await от задачи до объекта, которого она ждёт."""
+    stack = []
+    while coro is not None:
+        frame = getattr(coro, 'cr_frame', None) or getattr(coro, 'gi_frame', None) or getattr(coro, 'ag_frame', None)
+        if frame is None:
+            stack.append(f'<{type(coro).__name__}>')
+            break
+        stack.append(_label(frame.f_code))
+        coro = getattr(coro, 'cr_await', None) or getattr(coro, 'gi_yieldfrom', None) or getattr(coro, 'ag_await', None)
+    return stack
+
+
+class SamplingProfiler:
+    """
+    Семплирующий профилировщик по реальному времени с учётом корутин.
+
+    Фоновый поток каждые interval секунд снимает стек потока цикла событий. Выполняющаяся
+    задача попадает в ветку [running], каждая ожидающая задача — в ветку [waiting] со своей
+    цепочкой await (так видно время, проведённое в ожидании БД и Bot API). Если задан task,
+    семплируется только она. С threads=True добавляются стеки остальных потоков ([thread:имя]).
+    Создавать нужно из потока цикла событий.
+
+    Результат — счётчики стеков в collapsed-формате (flamegraph.pl, speedscope, inferno).
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.005,
+        task: asyncio.Task | None = None,
+        threads: bool = False,
+    ):
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._interval = interval
+        self._task = task
+        self._threads = threads
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.stacks
+
+    def _run(self) -> None:
+        next_sample = time.perf_counter()
+        while not self._stop.wait(max(0.0, next_sample - time.perf_counter())):
+            next_sample += self._interval
+            try:
+                self._sample()
+            except RuntimeError:
+                # Множество задач изменилось во время обхода — пропускаем семпл
+                continue
+
+    def _add(self, stack: List[str]) -> None:
+        self.stacks[';'.join(stack)] += 1
+
+    def _sample(self) -> None:
+        frames = sys._current_frames()
+        current = asyncio.current_task(self._loop)
+        self.samples += 1
+
+        tasks = [self._task] if self._task is not None else list(asyncio.all_tasks(self._loop))
+        for task in tasks:
+            if task is current:
+                self._add(['[running]', *frame_stack(frames.get(self._loop_thread))])
+            elif not task.done():
+                self._add(['[waiting]', *coroutine_stack(task.get_coro())])
+
+        if self._task is None and current is None:
+            # Цикл выполняет колбэк вне задач или ждёт событий в select
+            self._add(['[loop]', *frame_stack(frames.get(self._loop_thread))])
+
+        if self._threads:
+            own = threading.get_ident()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident not in (own, self._loop_thread):
+                    self._add([f'[thread:{names.get(ident, ident)}]', *frame_stack(frame)])
+
+
+class _TaskSamples:
+    """Стеки и число семплов одной задачи."""
+
+    __slots__ = ('stacks', 'samples')
+
+    def __init__(self):
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+
+class TaskSampler:
+    """
+    Общий семплирующий поток для профилирования отдельных задач (запросов).
+
+    В отличие от SamplingProfiler с task, поток один на все зарегистрированные задачи:
+    за семпл стек потока цикла событий снимается один раз, а каждая задача получает
+    свою ветку [running] или [waiting]. Поток работает, пока есть хотя бы одна задача,
+    поэтому стоимость профилирования не растёт с числом одновременно профилируемых запросов.
+    Регистрировать задачи нужно из потока их цикла событий.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._tasks: Dict[asyncio.Task, _TaskSamples] = {}
+        self._thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+
+    def register(self, task: asyncio.Task) -> None:
+        """Начинает семплировать задачу."""
+        with self._lock:
+            self._tasks[task] = _TaskSamples()
+            if self._thread is None:
+                self._loop = asyncio.get_running_loop()
+                self._loop_thread = threading.get_ident()
+                self._thread = threading.Thread(target=self._run, name='task-sampler', daemon=True)
+                self._thread.start()
+
+    def unregister(self, task: asyncio.Task) -> tuple[Counter, int]:
+        """
+        Прекращает семплировать задачу.
+
+        :return: Стеки задачи и число семплов.
+        """
+        with self._lock:
+            samples = self._tasks.pop(task)
+        return samples.stacks, samples.samples
+
+    def _run(self) -> None:
+        next_sample = time.perf_counter()
+        while True:
+            time.sleep(max(0.0, next_sample - time.perf_counter()))
+            next_sample += self._interval
+            with self._lock:
+                if not self._tasks:
+                    self._thread = None
+                    return
+                try:
+                    self._sample()
+                except RuntimeError:
+                    # Задача изменилась во время обхода — пропускаем семпл
+                    continue
+
+    def _sample(self) -> None:
+        frames = sys._current_frames()
+        current = asyncio.current_task(self._loop)
+        running: List[str] | None = None
+        for task, samples in self._tasks.items():
+            samples.samples += 1
+            if task is current:
+                if running is None:
+                    running = ';'.join(['[running]', *frame_stack(frames.get(self._loop_thread))])
+                samples.stacks[running] += 1
+            elif not task.done():
+                samples.stacks[';'.join(['[waiting]', *coroutine_stack(task.get_coro())])] += 1
+
+
+def collapse(stacks: Counter) -> str:
+    """Форматирует счётчики стеков в collapsed-формат: 'кадр;кадр;кадр число' на строку."""
+    return ''.join(f'{stack} {count}\n' for stack, count in stacks.most_common())
+
+
+_profile_lock = asyncio.Lock()
+
+
+def profile_in_progress() -> bool:
+    return _profile_lock.locked()
+
+
+async def profile_for(seconds: float, interval: float = 0.005, threads: bool = False) -> tuple[str, int]:
+    """
+    Профилирует весь процесс в течение seconds секунд.
+
+    :param seconds: Длительность профилирования.
+    :param interval: Интервал между семплами (секунды).
+    :param threads: Семплировать также остальные потоки.
+    :return: Стеки в collapsed-формате и количество семплов.
+    """
+    async with _profile_lock:
+        profiler = SamplingProfiler(interval=interval, threads=threads)
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            stacks = profiler.stop()
+        return collapse(stacks), profiler.samples
@@ -0,0 +1,200 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+import os
+import socket
+import time
+import uuid
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from loguru import logger
+from sqlalchemy import Column, Float, MetaData, Table, Unicode, delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.job_store import BufferedSQLAlchemyJobStore
+
+
+class CoalescingAsyncIOScheduler(AsyncIOScheduler):
+    """
+    AsyncIOScheduler, который объединяет пробуждения планировщика.
+
+    Стандартный wakeup на каждый add_job ставит обработку задач через
+    call_soon_threadsafe (запись в сокет цикла событий). Здесь серия add_job
+    в пределах одной итерации цикла приводит к одному вызову _process_jobs,
+    а из потока цикла событий используется обычный call_soon.
+    """
+
+    _wakeup_pending = False
+
+    def wakeup(self):
+        if self._wakeup_pending:
+            return
+        self._wakeup_pending = True
+        try:
+            in_loop = asyncio.get_running_loop() is self._eventloop
+        except RuntimeError:
+            in_loop = False
+        if in_loop:
+            self._eventloop.call_soon(self._process_wakeup)
+        else:
+            self._eventloop.call_soon_threadsafe(self._process_wakeup)
+
+    def _process_wakeup(self):
+        self._wakeup_pending = False
+        self._stop_timer()
+        wait_seconds = self._process_jobs()
+        self._start_timer(wait_seconds)
+
+
+class SchedulerLeader:
+    """
+    Выбор лидера планировщика для запуска в нескольких воркерах.
+
+    Лидерство — это аренда (lease) в таблице scheduler_leases той же БД, где хранятся задачи.
+    Все воркеры запускают планировщик на паузе, поэтому каждый может добавлять задачи
+    в общее хранилище, но выполняет их только держатель аренды. Аренда продлевается
+    каждые ttl / 3 секунд; если лидер перестал её продлевать, после истечения ttl
+    её забирает другой воркер. Обращения к БД выполняются в потоке, вне цикла событий.
+
+    Лидер ставит планировщик на паузу сам, как только с начала последнего успешного
+    продления прошло ttl секунд (по монотонным часам), не дожидаясь ответа очередной
+    попытки: к этому моменту аренду уже может забрать другой воркер. Продление идёт
+    в отдельном потоке, чтобы не стоять в очереди за чтением хранилища задач.
+    Хранилище задач перечитывает только лидер; остальные воркеры лишь добавляют задачи
+    и перечитывают его, когда становятся лидером.
+    """
+
+    def __init__(self, scheduler: AsyncIOScheduler, job_store: BufferedSQLAlchemyJobStore,
+                 name: str = 'default', ttl: float = 30):
+        self._scheduler = scheduler
+        self._job_store = job_store
+        self._name = name
+        self._ttl = ttl
+        self.holder_id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self.is_leader = False
+        self._task: asyncio.Task | None = None
+        # Срок аренды по локальным монотонным часам и таймер, снимающий лидерство по его истечении
+        self._deadline = 0.0
+        self._expiry: asyncio.TimerHandle | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scheduler-lease')
+        self._leases_t = Table(
+            'scheduler_leases',
+            MetaData(),
+            Column('name', Unicode(64), primary_key=True),
+            Column('holder', Unicode(191), nullable=False),
+            Column('expires_at', Float(25), nullable=False),
+        )
+
+    async def start(self) -> None:
+        """Запускает планировщик на паузе и начинает борьбу за лидерство."""
+        self._scheduler.start(paused=True)
+        await self._run_sync(self._leases_t.create, self._job_store.engine, True)
+        await self._tick()
+        self._task = asyncio.create_task(self._heartbeat())
+
+    async def stop(self) -> None:
+        """Останавливает продление аренды, освобождает её и останавливает планировщик."""
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._expiry is not None:
+            self._expiry.cancel()
+            self._expiry = None
+        if self.is_leader:
+            self._step_down()
+            try:
+                await self._run_sync(self._release_sync)
+            except Exception as e:
+                logger.error(f'Не удалось освободить аренду планировщика: {e}')
+        self._scheduler.shutdown()
+        self._executor.shutdown(wait=False)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self._ttl / 3)
+            await self._tick()
+
+    async def _tick(self) -> None:
+        # Аренда в БД истекает не раньше чем через ttl после начала попытки
+        started = time.monotonic()
+        try:
+            acquired = await self._run_sync(self._acquire_sync)
+        except Exception as e:
+            logger.error(f'Ошибка при продлении аренды планировщика: {e}')
+            acquired = False
+
+        if not acquired:
+            if self.is_leader:
+                self._step_down()
+                logger.warning(f'Воркер {self.holder_id} потерял лидерство планировщика')
+            return
+
+        self._extend(started + self._ttl)
+        if time.monotonic() >= self._deadline:
+            # Продление ответило уже после истечения срока: аренду могли забрать
+            return
+        if self.is_leader:
+            await self._job_store.refresh_async()
+            return
+
+        await self._job_store.refresh_async()
+        if time.monotonic() < self._deadline:
+            self.is_leader = True
+            self._scheduler.resume()
+            logger.info(f'Воркер {self.holder_id} стал лидером планировщика')
+
+    def _extend(self, deadline: float) -> None:
+        """Переносит локальный срок аренды и таймер, снимающий лидерство."""
+        self._deadline = deadline
+        if self._expiry is not None:
+            self._expiry.cancel()
+        loop = asyncio.get_running_loop()
+        self._expiry = loop.call_later(max(0.0, deadline - time.monotonic()), self._on_expired)
+
+    def _on_expired(self) -> None:
+        self._expiry = None
+        if self.is_leader:
+            self._step_down()
+            logger.warning(
+                f'Воркер {self.holder_id}: аренда планировщика не продлена за {self._ttl} с, выполнение задач остановлено'
+            )
+
+    def _step_down(self) -> None:
+        self._scheduler.pause()
+        self.is_leader = False
+
+    def _acquire_sync(self) -> bool:
+        now = time.time()
+        leases = self._leases_t
+        values = {'holder': self.holder_id, 'expires_at': now + self._ttl}
+        try:
+            with self._job_store.engine.begin() as connection:
+                renewed = connection.execute(
+                    update(leases)
+                    .where(
+                        leases.c.name == self._name,
+                        or_(leases.c.holder == self.holder_id, leases.c.expires_at < now),
+                    )
+                    .values(**values)
+                ).rowcount
+                if renewed:
+                    return True
+                exists = connection.execute(select(leases.c.name).where(leases.c.name == self._name)).first()
+                if exists:
+                    return False
+                connection.execute(insert(leases).values(name=self._name, **values))
+                return True
+        except IntegrityError:
+            return False
+
+    def _release_sync(self) -> None:
+        leases = self._leases_t
+        with self._job_store.engine.begin() as connection:
+            connection.execute(
+                delete(leases).where(leases.c.name == self._name, leases.c.holder == self.holder_id)
+            )
+
+    async def _run_sync(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
@@ -1,22 +1,134 @@
-from typing import List, TypeVar, Generic, Type
+from typing import Any, List, Mapping, Sequence, TypeVar, Generic, Type
 from pydantic import BaseModel
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.future import select
-from sqlalchemy import update as sqlalchemy_update, delete as sqlalchemy_delete, func
+from sqlalchemy import bindparam, update as sqlalchemy_update, delete as sqlalchemy_delete, func
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.dao.statements import statements
 from app.db.database import Base
 
 # Объявляем типовой параметр T с ограничением, что это наследник Base
 T = TypeVar('T', bound=Base)
 
+# Фильтры и значения: Pydantic модель или готовый словарь (внутренние вызовы без валидации)
+Values = BaseModel | Mapping[str, Any]
+
+
+def to_dict(data: Values | None) -> dict:
+    """
+    Приводит фильтры или значения к словарю.
+
+    У Pydantic модели берутся только заданные поля, словарь копируется без проверки:
+    данные внутренних вызовов уже проверены на границе (см. app.schemas.validation).
+    """
+    if data is None:
+        return {}
+    if isinstance(data, BaseModel):
+        return data.model_dump(exclude_unset=True)
+    return dict(data)
+
+
+# Операторы фильтров: ключ 'поле__оператор' (без оператора — равенство)
+FILTER_OPERATORS = {
+    'eq': lambda column, value: column == value,
+    'ne': lambda column, value: column != value,
+    'lt': lambda column, value: column < value,
+    'lte': lambda column, value: column <= value,
+    'gt': lambda column, value: column > value,
+    'gte': lambda column, value: column >= value,
+    'in': lambda column, value: column.in_(value),
+    'not_in': lambda column, value: column.not_in(value),
+    'is_null': lambda column, value: column.is_(None) if value else column.is_not(None),
+}
+
+# Стратегии загрузки связей для профилей загрузки (BaseDAO.loader_profiles)
+LOADER_STRATEGIES = {
+    'selectin': selectinload,
+    'joined': joinedload,
+    'raise': raiseload,
+}
+
 
 class BaseDAO(Generic[T]):
     """Базовый DAO (Data Access Object) для работы с моделями SQLAlchemy."""
 
     model: type[T]
 
+    # Профили загрузки связей: имя -> {связь: стратегия}, '*' — все остальные связи.
+    # plain — только колонки сущности, обращение к незагруженной связи вызывает ошибку
+    loader_profiles: dict[str, dict[str, str]] = {
+        'plain': {'*': 'raise'},
+    }
+
+    @classmethod
+    def _column(cls, field: str):
+        if field not in cls.model.__mapper__.all_orm_descriptors:
+            raise ValueError(f'У {cls.model.__name__} нет поля {field}')
+        return getattr(cls.model, field)
+
+    @classmethod
+    def _loader_options(cls, profile: str | None, entity=None) -> list:
+        """Опции загрузки связей по имени профиля (entity — сущность или её псевдоним)."""
+        if profile is None:
+            return []
+        if profile not in cls.loader_profiles:
+            raise ValueError(f'У {cls.__name__} нет профиля загрузки {profile}')
+        entity = entity if entity is not None else cls.model
+        return [
+            LOADER_STRATEGIES[strategy]('*' if name == '*' else getattr(entity, name))
+            for name, strategy in cls.loader_profiles[profile].items()
+        ]
+
+    @classmethod
+    def _select(cls, columns: Sequence[str] | None = None, profile: str | None = None):
+        """
+        SELECT сущности с профилем загрузки связей или только указанных колонок.
+
+        С columns возвращаются лёгкие строки Row (доступ по атрибутам и row._mapping)
+        вместо объектов ORM; профиль загрузки к ним неприменим.
+        """
+        if columns:
+            if profile is not None:
+                raise ValueError('Проекция колонок и профиль загрузки несовместимы.')
+            return select(*[cls._column(field) for field in columns])
+        return select(cls.model).options(*cls._loader_options(profile))
+
+    @classmethod
+    def _where(cls, filter_dict: dict) -> list:
+        """
+        Переводит фильтры в условия WHERE.
+
+        Ключ — имя поля или 'поле__оператор' (eq, ne, lt, lte, gt, gte, in, not_in, is_null):
+        {'date__gte': today, 'status__in': [...], 'user_id__is_null': False}.
+        """
+        clauses = []
+        for key, value in filter_dict.items():
+            field, _, operator = key.partition('__')
+            if operator and operator not in FILTER_OPERATORS:
+                raise ValueError(f'Неизвестный оператор фильтра: {key}')
+            clauses.append(FILTER_OPERATORS[operator or 'eq'](cls._column(field), value))
+        return clauses
+
+    @classmethod
+    def _order_by(cls, order_by: Sequence[str] | None) -> list:
+        """Переводит список полей в ORDER BY: 'date' — по возрастанию, '-date' — по убыванию."""
+        return [
+            cls._column(field[1:]).desc() if field.startswith('-') else cls._column(field).asc()
+            for field in order_by or ()
+        ]
+
+    @classmethod
+    def _by_id_statement(cls):
+        """SELECT записи по ID (bindparam data_id)."""
+        return statements.get(
+            (cls.model, 'by_id'), lambda: select(cls.model).where(cls.model.id == bindparam('data_id'))
+        )
+
     @classmethod
     async def find_one_or_none_by_id(cls, data_id: int, session: AsyncSession):
         """
@@ -28,8 +140,7 @@ class BaseDAO(Generic[T]):
         """
         logger.info(f'Поиск {cls.model.__name__} с ID: {data_id}')
         try:
-            query = select(cls.model).filter_by(id=data_id)
-            result = await session.execute(query)
+            result = await session.execute(cls._by_id_statement(), {'data_id': data_id})
             record = result.scalar_one_or_none()
             if record:
                 logger.info(f'Запись с ID {data_id} найдена.')
@@ -41,20 +152,28 @@ class BaseDAO(Generic[T]):
             raise
 
     @classmethod
-    async def find_one_or_none(cls, session: AsyncSession, filters: BaseModel):
+    async def find_one_or_none(
+        cls,
+        session: AsyncSession,
+        filters: Values,
+        columns: Sequence[str] | None = None,
+        profile: str | None = None,
+    ):
         """
         Находит одну запись по фильтрам.
 
         :param session: Асинхронная сессия SQLAlchemy.
-        :param filters: Фильтры в виде Pydantic модели.
+        :param filters: Фильтры в виде Pydantic модели или словаря (поддерживаются операторы, см. _where).
+        :param columns: Загружаемые колонки; запись возвращается строкой Row (опционально).
+        :param profile: Профиль загрузки связей из loader_profiles (опционально).
         :return: Найденная запись или None, если запись не найдена.
         """
-        filter_dict = filters.model_dump(exclude_unset=True)
+        filter_dict = to_dict(filters)
         logger.info(f'Поиск одной записи {cls.model.__name__} по фильтрам: {filter_dict}')
         try:
-            query = select(cls.model).filter_by(**filter_dict)
+            query = cls._select(columns, profile).where(*cls._where(filter_dict))
             result = await session.execute(query)
-            record = result.scalar_one_or_none()
+            record = result.one_or_none() if columns else result.scalar_one_or_none()
             if record:
                 logger.info(f'Запись найдена по фильтрам: {filter_dict}')
             else:
@@ -65,20 +184,34 @@ class BaseDAO(Generic[T]):
             raise
 
     @classmethod
-    async def find_all(cls, session: AsyncSession, filters: BaseModel | None = None):
+    async def find_all(
+        cls,
+        session: AsyncSession,
+        filters: Values | None = None,
+        order_by: Sequence[str] | None = None,
+        limit: int | None = None,
+        columns: Sequence[str] | None = None,
+        profile: str | None = None,
+    ):
         """
         Находит все записи по фильтрам.
 
         :param session: Асинхронная сессия SQLAlchemy.
-        :param filters: Фильтры в виде Pydantic модели (опционально).
+        :param filters: Фильтры в виде Pydantic модели или словаря (опционально, поддерживаются операторы, см. _where).
+        :param order_by: Поля сортировки, '-поле' — по убыванию (опционально).
+        :param limit: Максимальное количество записей (опционально).
+        :param columns: Загружаемые колонки; записи возвращаются строками Row (опционально).
+        :param profile: Профиль загрузки связей из loader_profiles (опционально).
         :return: Список найденных записей.
         """
-        filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
+        filter_dict = to_dict(filters)
         logger.info(f'Поиск всех записей {cls.model.__name__} по фильтрам: {filter_dict}')
         try:
-            query = select(cls.model).filter_by(**filter_dict)
+            query = cls._select(columns, profile).where(*cls._where(filter_dict)).order_by(*cls._order_by(order_by))
+            if limit is not None:
+                query = query.limit(limit)
             result = await session.execute(query)
-            records = result.scalars().all()
+            records = result.all() if columns else result.scalars().all()
             logger.info(f'Найдено {len(records)} записей.')
             return records
         except SQLAlchemyError as e:
@@ -86,15 +219,15 @@ class BaseDAO(Generic[T]):
             raise
 
     @classmethod
-    async def add(cls, session: AsyncSession, values: BaseModel):
+    async def add(cls, session: AsyncSession, values: Values):
         """
         Добавляет одну запись.
 
         :param session: Асинхронная сессия SQLAlchemy.
-        :param values: Данные для создания записи в виде Pydantic модели.
+        :param values: Данные для создания записи в виде Pydantic модели или словаря.
         :return: Созданная запись.
         """
-        values_dict = values.model_dump(exclude_unset=True)
+        values_dict = to_dict(values)
         logger.info(f'Добавление записи {cls.model.__name__} с параметрами: {values_dict}')
         new_instance = cls.model(**values_dict)
         session.add(new_instance)
@@ -108,15 +241,15 @@ class BaseDAO(Generic[T]):
         return new_instance
 
     @classmethod
-    async def add_many(cls, session: AsyncSession, instances: List[BaseModel]):
+    async def add_many(cls, session: AsyncSession, instances: List[Values]):
         """
         Добавляет несколько записей.
 
         :param session: Асинхронная сессия SQLAlchemy.
-        :param instances: Список данных для создания записей в виде Pydantic моделей.
+        :param instances: Список данных для создания записей в виде Pydantic моделей или словарей.
         :return: Список созданных записей.
         """
-        values_list = [item.model_dump(exclude_unset=True) for item in instances]
+        values_list = [to_dict(item) for item in instances]
         logger.info(f'Добавление нескольких записей {cls.model.__name__}. Количество: {len(values_list)}')
         new_instances = [cls.model(**values) for values in values_list]
         session.add_all(new_instances)
@@ -130,50 +263,75 @@ class BaseDAO(Generic[T]):
         return new_instances
 
     @classmethod
-    async def update(cls, session: AsyncSession, filters: BaseModel, values: BaseModel):
+    def _update_statement(cls, filter_keys: tuple, value_keys: tuple):
+        """UPDATE по набору полей фильтра и значений (bindparam filter_*/value_*), возвращает ID записей."""
+        def build():
+            return (
+                sqlalchemy_update(cls.model)
+                .where(*[getattr(cls.model, k) == bindparam(f'filter_{k}') for k in filter_keys])
+                .values({k: bindparam(f'value_{k}') for k in value_keys})
+                .returning(cls.model.id)
+                .execution_options(synchronize_session=False)
+            )
+        return statements.get((cls.model, 'update', filter_keys, value_keys), build)
+
+    @classmethod
+    def _synchronize(cls, session: AsyncSession, record_ids: List[int], values: dict) -> None:
+        """Переносит новые значения в уже загруженные в сессию объекты (как synchronize_session='fetch')."""
+        identity_map = session.sync_session.identity_map
+        for record_id in record_ids:
+            instance = identity_map.get(identity_key(cls.model, record_id))
+            if instance is not None:
+                for key, value in values.items():
+                    set_committed_value(instance, key, value)
+
+    @classmethod
+    async def update(cls, session: AsyncSession, filters: Values, values: Values):
         """
         Обновляет записи по фильтрам.
 
         :param session: Асинхронная сессия SQLAlchemy.
-        :param filters: Фильтры для поиска записей в виде Pydantic модели.
-        :param values: Новые значения для обновления в виде Pydantic модели.
+        :param filters: Фильтры для поиска записей в виде Pydantic модели или словаря (только равенство полей).
+        :param values: Новые значения для обновления в виде Pydantic модели или словаря.
         :return: Количество обновленных записей.
         """
-        filter_dict = filters.model_dump(exclude_unset=True)
-        values_dict = values.model_dump(exclude_unset=True)
+        filter_dict = to_dict(filters)
+        values_dict = to_dict(values)
         logger.info(f'Обновление записей {cls.model.__name__} по фильтру: {filter_dict} с параметрами: {values_dict}')
-        query = (
-            sqlalchemy_update(cls.model)
-            .where(*[getattr(cls.model, k) == v for k, v in filter_dict.items()])
-            .values(**values_dict)
-            .execution_options(synchronize_session='fetch')
-        )
+        if any('__' in key for key in filter_dict):
+            # Готовое выражение UPDATE строится по именам полей и поддерживает только равенство
+            raise ValueError('update поддерживает только фильтры на равенство полей.')
+        query = cls._update_statement(tuple(filter_dict), tuple(values_dict))
+        params = {f'filter_{k}': v for k, v in filter_dict.items()}
+        params.update({f'value_{k}': v for k, v in values_dict.items()})
         try:
-            result = await session.execute(query)
+            record_ids = (await session.execute(query, params)).scalars().all()
+            # Готовое выражение не может синхронизировать сессию само: значения приходят через bindparam
+            cls._synchronize(session, record_ids, values_dict)
             await session.flush()
-            logger.info(f'Обновлено {result.rowcount} записей.')
-            return result.rowcount
+            logger.info(f'Обновлено {len(record_ids)} записей.')
+            return len(record_ids)
         except SQLAlchemyError as e:
             await session.rollback()
             logger.error(f'Ошибка при обновлении записей: {e}')
             raise e
 
     @classmethod
-    async def delete(cls, session: AsyncSession, filters: BaseModel):
+    async def delete(cls, session: AsyncSession, filters: Values):
         """
         Удаляет записи по фильтру.
 
         :param session: Асинхронная сессия SQLAlchemy.
-        :param filters: Фильтры для поиска записей в виде Pydantic модели.
+        :param filters: Фильтры для поиска записей в виде Pydantic модели или словаря (поддерживаются операторы, см. _where).
         :return: Количество удаленных записей.
         """
-        filter_dict = filters.model_dump(exclude_unset=True)
+        filter_dict = to_dict(filters)
         logger.info(f'Удаление записей {cls.model.__name__} по фильтру: {filter_dict}')
         if not filter_dict:
             logger.error('Нужен хотя бы один фильтр для удаления.')
             raise ValueError('Нужен хотя бы один фильтр для удаления.')
 
-        query = sqlalchemy_delete(cls.model).filter_by(**filter_dict)
+        query = sqlalchemy_delete(cls.model).where(*cls._where(filter_dict))
         try:
             result = await session.execute(query)
             await session.flush()
@@ -185,18 +343,18 @@ class BaseDAO(Generic[T]):
             raise e
 
     @classmethod
-    async def count(cls, session: AsyncSession, filters: BaseModel | None = None):
+    async def count(cls, session: AsyncSession, filters: Values | None = None):
         """
         Подсчитывает количество записей по фильтрам.
 
         :param session: Асинхронная сессия SQLAlchemy.
-        :param filters: Фильтры для поиска записей в виде Pydantic модели (опционально).
+        :param filters: Фильтры для поиска записей в виде Pydantic модели или словаря (опционально, поддерживаются операторы, см. _where).
         :return: Количество найденных записей.
         """
-        filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
+        filter_dict = to_dict(filters)
         logger.info(f'Подсчет количества записей {cls.model.__name__} по фильтру: {filter_dict}')
         try:
-            query = select(func.count(cls.model.id)).filter_by(**filter_dict)
+            query = select(func.count(cls.model.id)).where(*cls._where(filter_dict))
             result = await session.execute(query)
             count = result.scalar()
             logger.info(f'Найдено {count} записей.')
@@ -206,24 +364,41 @@ class BaseDAO(Generic[T]):
             raise
 
     @classmethod
-    async def paginate(cls, session: AsyncSession, page: int = 1, page_size: int = 10, filters: BaseModel = None):
+    async def paginate(
+        cls,
+        session: AsyncSession,
+        page: int = 1,
+        page_size: int = 10,
+        filters: Values | None = None,
+        order_by: Sequence[str] | None = None,
+        columns: Sequence[str] | None = None,
+        profile: str | None = None,
+    ):
         """
         Возвращает записи с пагинацией.
 
         :param session: Асинхронная сессия SQLAlchemy.
         :param page: Номер страницы.
         :param page_size: Размер страницы.
-        :param filters: Фильтры для поиска записей в виде Pydantic модели (опционально).
+        :param filters: Фильтры в виде Pydantic модели или словаря (опционально, поддерживаются операторы, см. _where).
+        :param order_by: Поля сортировки, '-поле' — по убыванию (опционально, по умолчанию по ID).
+        :param columns: Загружаемые колонки; записи возвращаются строками Row (опционально).
+        :param profile: Профиль загрузки связей из loader_profiles (опционально).
         :return: Список записей на указанной странице.
         """
-        filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
+        filter_dict = to_dict(filters)
         logger.info(
             f'Пагинация записей {cls.model.__name__} по фильтру: {filter_dict}, страница: {page}, размер страницы: {page_size}'
         )
         try:
-            query = select(cls.model).filter_by(**filter_dict)
+            # Без устойчивого порядка страницы могут пересекаться
+            query = (
+                cls._select(columns, profile)
+                .where(*cls._where(filter_dict))
+                .order_by(*cls._order_by(order_by or ('id',)))
+            )
             result = await session.execute(query.offset((page - 1) * page_size).limit(page_size))
-            records = result.scalars().all()
+            records = result.all() if columns else result.scalars().all()
             logger.info(f'Найдено {len(records)} записей на странице {page}.')
             return records
         except SQLAlchemyError as e:
@@ -231,19 +406,27 @@ class BaseDAO(Generic[T]):
             raise
 
     @classmethod
-    async def find_by_ids(cls, session: AsyncSession, ids: List[int]) -> List[Any]:
+    async def find_by_ids(
+        cls,
+        session: AsyncSession,
+        ids: List[int],
+        columns: Sequence[str] | None = None,
+        profile: str | None = None,
+    ) -> List[Any]:
         """
         Находит несколько записей по списку ID.
 
         :param session: Асинхронная сессия SQLAlchemy.
         :param ids: Список ID записей.
+        :param columns: Загружаемые колонки; записи возвращаются строками Row (опционально).
+        :param profile: Профиль загрузки связей из loader_profiles (опционально).
         :return: Список найденных записей.
         """
         logger.info(f'Поиск записей {cls.model.__name__} по списку ID: {ids}')
         try:
-            query = select(cls.model).filter(cls.model.id.in_(ids))
+            query = cls._select(columns, profile).filter(cls.model.id.in_(ids))
             result = await session.execute(query)
-            records = result.scalars().all()
+            records = result.all() if columns else result.scalars().all()
             logger.info(f'Найдено {len(records)} записей по списку ID.')
             return records
         except SQLAlchemyError as e:
@@ -251,21 +434,22 @@ class BaseDAO(Generic[T]):
             raise
 
     @classmethod
-    async def upsert(cls, session: AsyncSession, unique_fields: List[str], values: BaseModel):
+    async def upsert(cls, session: AsyncSession, unique_fields: List[str], values: Values):
         """
         Создает запись или обновляет существующую, если она уже есть.
 
         :param session: Асинхронная сессия SQLAlchemy.
         :param unique_fields: Список уникальных полей для поиска существующей записи.
-        :param values: Данные для создания или обновления записи в виде Pydantic модели.
+        :param values: Данные для создания или обновления записи в виде Pydantic модели или словаря.
         :return: Созданная или обновленная запись.
         """
-        values_dict = values.model_dump(exclude_unset=True)
+        values_dict = to_dict(values)
         filter_dict = {field: values_dict[field] for field in unique_fields if field in values_dict}
 
         logger.info(f'Upsert для {cls.model.__name__}')
         try:
-            existing = await cls.find_one_or_none(session, BaseModel.model_construct(**filter_dict))
+            result = await session.execute(select(cls.model).filter_by(**filter_dict))
+            existing = result.scalar_one_or_none()
             if existing:
                 # Обновляем существующую запись
                 for key, value in values_dict.items():
@@ -286,25 +470,38 @@ class BaseDAO(Generic[T]):
             raise
 
     @classmethod
-    async def bulk_update(cls, session: AsyncSession, records: List[BaseModel]) -> int:
+    def _update_by_id_statement(cls, value_keys: tuple):
+        """UPDATE записи по ID (bindparam record_id/value_*)."""
+        def build():
+            return (
+                sqlalchemy_update(cls.model)
+                .where(cls.model.id == bindparam('record_id'))
+                .values({k: bindparam(f'value_{k}') for k in value_keys})
+            )
+        return statements.get((cls.model, 'update_by_id', value_keys), build)
+
+    @classmethod
+    async def bulk_update(cls, session: AsyncSession, records: List[Values]) -> int:
         """
         Массово обновляет записи.
 
         :param session: Асинхронная сессия SQLAlchemy.
-        :param records: Список данных для обновления записей в виде Pydantic моделей.
+        :param records: Список данных для обновления записей в виде Pydantic моделей или словарей.
         :return: Количество обновленных записей.
         """
         logger.info(f'Массовое обновление записей {cls.model.__name__}')
         try:
             updated_count = 0
             for record in records:
-                record_dict = record.model_dump(exclude_unset=True)
+                record_dict = to_dict(record)
                 if 'id' not in record_dict:
                     continue
 
                 update_data = {k: v for k, v in record_dict.items() if k != 'id'}
-                stmt = sqlalchemy_update(cls.model).filter_by(id=record_dict['id']).values(**update_data)
-                result = await session.execute(stmt)
+                stmt = cls._update_by_id_statement(tuple(update_data))
+                params = {f'value_{k}': v for k, v in update_data.items()}
+                params['record_id'] = record_dict['id']
+                result = await session.execute(stmt, params)
                 updated_count += result.rowcount
 
             await session.flush()
@@ -1,20 +1,351 @@
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
+from typing import NamedTuple
 
 from loguru import logger
-from sqlalchemy import select, and_, or_, func, update, delete
+from sqlalchemy import Date, Row, bindparam, select, and_, or_, func, insert, update, delete, distinct, literal, text, true, union_all
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import aliased
 
-from app.dao.base_dao import BaseDAO
-from app.db.models.models import Booking, TimeSlot
+from app.core.config import settings
+from app.dao.base_dao import BaseDAO, Values, to_dict
+from app.dao.cache import TTLCache, reference_cache
+from app.dao.coalescing import single_flight
+from app.dao.statements import statements
+from app.dao.tables_dao import TableDAO
+from app.dao.time_slots_dao import TimeSlotDAO
+from app.dao.versioned_dao import VersionedDAO
+from app.db.enums import BookingStatus
+from app.db.models.models import Booking, BookingArchive, DailyOccupancy, Table, TimeSlot, User
 
 
-class BookingDAO(BaseDAO[Booking]):
-    """DAO для работы с бронированиями."""
+# Короткоживущий кеш сетки доступности; ключ включает версии bookings/tables/time_slots
+availability_cache = TTLCache(maxsize=256, ttl=settings.AVAILABILITY_CACHE_TTL)
+
+# Статусы, с которыми бронь переносится в архив
+FINISHED_STATUSES = (BookingStatus.COMPLETED, BookingStatus.CANCELED)
+
+# Статусы, которые учитываются в сводке занятости daily_occupancy
+OCCUPYING_STATUSES = (BookingStatus.BOOKED, BookingStatus.COMPLETED)
+
+# Поля брони, от которых зависит её вклад в daily_occupancy
+OCCUPANCY_FIELDS = ('date', 'time_slot_id', 'table_id', 'status')
+
+
+class _Occupancy(NamedTuple):
+    """Поля брони, определяющие её вклад в сводку занятости."""
+
+    id: int
+    date: date
+    time_slot_id: int
+    table_id: int
+    status: BookingStatus
+
+    @property
+    def occupying(self) -> bool:
+        return self.status in OCCUPYING_STATUSES
+
+
+class UserBookingsSummary(NamedTuple):
+    """
+    Сводка для экрана «Мои брони».
+
+    :param user_id: ID пользователя в БД.
+    :param active_count: Количество предстоящих активных броней.
+    :param upcoming: Ближайшие из них (строки с id, date, table_id, capacity, description, start_time, end_time).
+    """
+
+    user_id: int
+    active_count: int
+    upcoming: list[Row]
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+class BookingDAO(VersionedDAO[Booking]):
+    """
+    DAO для работы с бронированиями.
+
+    Сводка daily_occupancy обновляется при любой записи через DAO: add/add_many,
+    cancel_booking и delete_booking, а также общие update, bulk_update, upsert и delete,
+    если они меняют статус, дату, слот или стол брони (прежние значения читаются
+    до изменения). Запись в обход DAO исправляется rebuild_occupancy.
+    """
 
     model = Booking
 
+    loader_profiles = {
+        **BaseDAO.loader_profiles,
+        # Стол и слот — связи многие-к-одному: JOIN не размножает строки и выходит быстрее отдельных запросов
+        'details': {'table': 'joined', 'time_slot': 'joined', '*': 'raise'},
+        # Стол и слот отдельными запросами по IN: строки брони не расширяются колонками справочников
+        'details_selectin': {'table': 'selectin', 'time_slot': 'selectin', '*': 'raise'},
+    }
+
+    @classmethod
+    async def add(cls, session: AsyncSession, values: Values):
+        booking = await super().add(session=session, values=values)
+        if booking.status in OCCUPYING_STATUSES:
+            await cls._shift_occupancy(session, [booking], 1)
+        return booking
+
+    @classmethod
+    async def add_many(cls, session: AsyncSession, instances: list[Values]):
+        bookings = await super().add_many(session=session, instances=instances)
+        await cls._shift_occupancy(session, [b for b in bookings if b.status in OCCUPYING_STATUSES], 1)
+        return bookings
+
+    @classmethod
+    def _occupancy_upsert_statement(cls, dialect_name: str):
+        """INSERT ... ON CONFLICT DO UPDATE для daily_occupancy; значения строк передаются параметрами."""
+        def build():
+            insert_ = postgresql_insert if dialect_name == 'postgresql' else sqlite_insert
+            table = DailyOccupancy.__table__
+            query = insert_(table)
+            return query.on_conflict_do_update(
+                index_elements=['date', 'time_slot_id'],
+                set_={
+                    'tables_booked': table.c.tables_booked + query.excluded.tables_booked,
+                    'seats_booked': table.c.seats_booked + query.excluded.seats_booked,
+                    'updated_at': func.now(),
+                },
+            )
+        return statements.get((DailyOccupancy, 'shift', dialect_name), build)
+
+    @classmethod
+    async def _shift_occupancy(cls, session: AsyncSession, bookings, sign: int) -> None:
+        """
+        Сдвигает счётчики daily_occupancy на sign для каждой брони.
+
+        Готовый INSERT ... ON CONFLICT DO UPDATE выполняется для всех затронутых пар (дата, слот).
+        Вместимость столов берётся из кеша справочников; столов, которых в кеше нет (созданы
+        другим процессом без канала инвалидации), — из БД, а кеш столов сбрасывается.
+
+        :param session: Асинхронная сессия SQLAlchemy
+        :param bookings: Брони, занимающие стол (объекты или строки с date, time_slot_id, table_id)
+        :param sign: 1 — бронь добавлена, -1 — снята
+        :raises ValueError: Стола брони нет ни в кеше, ни в БД
+        """
+        bookings = list(bookings)
+        if not bookings:
+            return
+        capacities: dict[int, int] = {}
+        for table_id in {booking.table_id for booking in bookings}:
+            table = await TableDAO.find_one_or_none_by_id(table_id, session)
+            if table is not None:
+                capacities[table_id] = table.capacity
+        missing = {booking.table_id for booking in bookings} - capacities.keys()
+        if missing:
+            logger.warning(f'Столов {sorted(missing)} нет в кеше справочников: вместимость читается из БД')
+            reference_cache.invalidate(TableDAO.cache_name())
+            result = await session.execute(select(Table.id, Table.capacity).where(Table.id.in_(missing)))
+            capacities.update(result.tuples().all())
+            if missing - capacities.keys():
+                raise ValueError(f'Столы не найдены: {sorted(missing - capacities.keys())}')
+
+        deltas: dict[tuple[date, int], list[int]] = {}
+        for booking in bookings:
+            delta = deltas.setdefault((booking.date, booking.time_slot_id), [0, 0])
+            delta[0] += sign
+            delta[1] += sign * capacities[booking.table_id]
+
+        # Фиксированный порядок ключей исключает взаимные блокировки параллельных транзакций
+        await session.execute(cls._occupancy_upsert_statement(session.bind.dialect.name), [
+            {'date': day, 'time_slot_id': slot_id, 'tables_booked': tables, 'seats_booked': seats}
+            for (day, slot_id), (tables, seats) in sorted(deltas.items())
+        ])
+
+    @classmethod
+    async def _occupancy_before(cls, session: AsyncSession, *where) -> list[_Occupancy]:
+        """Читает поля занятости изменяемых броней до записи (строки блокируются до конца транзакции)."""
+        query = select(cls.model.id, *(getattr(cls.model, field) for field in OCCUPANCY_FIELDS)).where(*where)
+        result = await session.execute(query.with_for_update())
+        return [_Occupancy(*row) for row in result.all()]
+
+    @classmethod
+    async def _reshift_occupancy(cls, session: AsyncSession, before: list[_Occupancy], after: list[_Occupancy]) -> None:
+        """Снимает из сводки прежние значения изменённых броней и добавляет новые (пары по порядку)."""
+        changed = [(old, new) for old, new in zip(before, after) if old != new]
+        await cls._shift_occupancy(session, [old for old, _ in changed if old.occupying], -1)
+        await cls._shift_occupancy(session, [new for _, new in changed if new.occupying], 1)
+
+    @staticmethod
+    def _occupancy_changes(values: dict) -> dict:
+        return {key: value for key, value in values.items() if key in OCCUPANCY_FIELDS}
+
+    @classmethod
+    async def update(cls, session: AsyncSession, filters: Values, values: Values):
+        changes = cls._occupancy_changes(to_dict(values))
+        if not changes:
+            return await super().update(session=session, filters=filters, values=values)
+        before = await cls._occupancy_before(session, *cls._where(to_dict(filters)))
+        count = await super().update(session=session, filters=filters, values=values)
+        await cls._reshift_occupancy(session, before, [row._replace(**changes) for row in before])
+        return count
+
+    @classmethod
+    async def bulk_update(cls, session: AsyncSession, records: list[Values]) -> int:
+        changes = [(record['id'], cls._occupancy_changes(record)) for record in map(to_dict, records) if 'id' in record]
+        ids = {record_id for record_id, record_changes in changes if record_changes}
+        if not ids:
+            return await super().bulk_update(session=session, records=records)
+        before = await cls._occupancy_before(session, cls.model.id.in_(ids))
+        count = await super().bulk_update(session=session, records=records)
+        # Несколько записей с одним ID применяются по порядку, как в bulk_update
+        after = {row.id: row for row in before}
+        for record_id, record_changes in changes:
+            if record_changes and record_id in after:
+                after[record_id] = after[record_id]._replace(**record_changes)
+        await cls._reshift_occupancy(session, before, [after[row.id] for row in before])
+        return count
+
+    @classmethod
+    async def upsert(cls, session: AsyncSession, unique_fields: list[str], values: Values):
+        values_dict = to_dict(values)
+        filter_dict = {field: values_dict[field] for field in unique_fields if field in values_dict}
+        before = await cls._occupancy_before(session, *cls._where(filter_dict))
+        record = await super().upsert(session=session, unique_fields=unique_fields, values=values)
+        after = _Occupancy(record.id, *(getattr(record, field) for field in OCCUPANCY_FIELDS))
+        if before:
+            await cls._reshift_occupancy(session, before, [after])
+        elif after.occupying:
+            await cls._shift_occupancy(session, [after], 1)
+        return record
+
+    @classmethod
+    async def delete(cls, session: AsyncSession, filters: Values):
+        filter_dict = to_dict(filters)
+        before = await cls._occupancy_before(session, *cls._where(filter_dict)) if filter_dict else []
+        count = await super().delete(session=session, filters=filters)
+        await cls._shift_occupancy(session, [row for row in before if row.occupying], -1)
+        return count
+
+    @classmethod
+    async def rebuild_occupancy(cls, session: AsyncSession) -> int:
+        """
+        Полностью пересчитывает daily_occupancy по текущим и архивным броням.
+
+        :param session: Асинхронная сессия SQLAlchemy
+        :return: Количество строк сводки
+        """
+        logger.info('Пересчёт сводки занятости daily_occupancy')
+        try:
+            booking = cls.history(include_archive=True)
+            source = (
+                select(booking.date, booking.time_slot_id, func.count(), func.sum(Table.capacity))
+                .join(Table, Table.id == booking.table_id)
+                .where(booking.status.in_(OCCUPYING_STATUSES))
+                .group_by(booking.date, booking.time_slot_id)
+            )
+            await session.execute(delete(DailyOccupancy))
+            result = await session.execute(
+                insert(DailyOccupancy).from_select(['date', 'time_slot_id', 'tables_booked', 'seats_booked'], source)
+            )
+            await session.commit()
+            logger.info(f'Сводка занятости пересчитана: {result.rowcount} строк')
+            return result.rowcount
+        except SQLAlchemyError as e:
+            logger.error(f'Ошибка при пересчёте сводки занятости: {e}')
+            await session.rollback()
+            raise
+
+    @classmethod
+    @single_flight
+    async def get_occupancy(cls, session: AsyncSession, start_date: date, days: int = 7) -> dict[date, list[dict]]:
+        """
+        Занятость по дням и слотам из сводки daily_occupancy (без агрегации броней).
+
+        :param session: Асинхронная сессия SQLAlchemy
+        :param start_date: Первая дата
+        :param days: Количество дней
+        :return: Словарь {дата: [{time_slot_id, tables_booked, seats_booked, is_full}, ...]}
+        """
+        query = (
+            select(DailyOccupancy)
+            .where(DailyOccupancy.date >= start_date, DailyOccupancy.date < start_date + timedelta(days=days))
+            .order_by(DailyOccupancy.date, DailyOccupancy.time_slot_id)
+        )
+        total_tables = len(await TableDAO.get_cached())
+        occupancy = {start_date + timedelta(days=offset): [] for offset in range(days)}
+        for row in (await session.execute(query)).scalars():
+            occupancy[row.date].append({
+                'time_slot_id': row.time_slot_id,
+                'tables_booked': row.tables_booked,
+                'seats_booked': row.seats_booked,
+                'is_full': row.tables_booked >= total_tables,
+            })
+        return occupancy
+
+    @classmethod
+    async def is_full(cls, session: AsyncSession, day: date, time_slot_id: int | None = None) -> bool:
+        """
+        Проверяет по сводке, заняты ли все столы в слот (или во все слоты дня).
+
+        :param session: Асинхронная сессия SQLAlchemy
+        :param day: Дата
+        :param time_slot_id: ID временного слота; без него проверяется весь день
+        :return: True, если свободных столов нет
+        """
+        query = select(func.count()).select_from(DailyOccupancy).where(
+            DailyOccupancy.date == day, DailyOccupancy.tables_booked >= len(await TableDAO.get_cached())
+        )
+        if time_slot_id is not None:
+            query = query.where(DailyOccupancy.time_slot_id == time_slot_id)
+            slots = 1
+        else:
+            slots = len(await TimeSlotDAO.get_cached())
+        return (await session.execute(query)).scalar_one() >= slots
+
+    @classmethod
+    def history(cls, include_archive: bool = False):
+        """
+        Источник для исторических запросов: bookings или bookings ∪ bookings_archive.
+
+        Объединение отображается на модель Booking (aliased), поэтому в запросах доступны
+        те же атрибуты и связи. Архивные записи предназначены только для чтения.
+
+        :param include_archive: Включать ли архивные брони
+        :return: Booking или его псевдоним над UNION ALL
+        """
+        if not include_archive:
+            return cls.model
+        columns = cls.model.__table__.c
+        archive = BookingArchive.__table__.c
+        history = union_all(
+            select(*columns),
+            select(*(archive[column.name] for column in columns)),
+        ).subquery('bookings_history')
+        return aliased(cls.model, history)
+
+    @classmethod
+    def _active_booking_statement(cls):
+        """ID активной брони в ячейке (стол, дата, слот); bindparam table_id, booking_date, time_slot_id."""
+        return statements.get((cls.model, 'active_booking_in_cell'), lambda: (
+            select(cls.model.id)
+            .where(
+                cls.model.table_id == bindparam('table_id'),
+                cls.model.date == bindparam('booking_date'),
+                cls.model.time_slot_id == bindparam('time_slot_id'),
+                cls.model.status == BookingStatus.BOOKED,
+            )
+            .limit(1)
+        ))
+
+    @classmethod
+    def _booked_slots_statement(cls):
+        """Занятые слоты стола на дату; bindparam table_id, booking_date."""
+        return statements.get((cls.model, 'booked_slots_of_table'), lambda: (
+            select(cls.model.time_slot_id).where(
+                cls.model.table_id == bindparam('table_id'),
+                cls.model.date == bindparam('booking_date'),
+                cls.model.status == BookingStatus.BOOKED,
+            )
+        ))
+
     @classmethod
     async def check_available_bookings(
         cls, session: AsyncSession, table_id: int, booking_date: date, time_slot_id: int
@@ -30,20 +361,18 @@ class BookingDAO(BaseDAO[Booking]):
         """
         logger.info(f'Проверка доступности стола {table_id} на {booking_date} в слот {time_slot_id}')
         try:
-            query = select(cls.model).filter_by(table_id=table_id, date=booking_date, time_slot_id=time_slot_id)
-            result = await session.execute(query)
-            bookings = result.scalars().all()
-
-            if not bookings:
-                logger.info('Стол свободен - броней не найдено')
-                return True
+            # Ищем только активную бронь: достаточно её ID, а не всех броней ячейки
+            result = await session.execute(
+                cls._active_booking_statement(),
+                {'table_id': table_id, 'booking_date': booking_date, 'time_slot_id': time_slot_id},
+            )
+            booking_id = result.scalar_one_or_none()
 
-            for booking in bookings:
-                if booking.status == "booked":
-                    logger.info(f'Стол занят - найдена активная бронь ID {booking.id}')
-                    return False
+            if booking_id is not None:
+                logger.info(f'Стол занят - найдена активная бронь ID {booking_id}')
+                return False
 
-            logger.info('Стол свободен - все брони неактивны')
+            logger.info('Стол свободен - активных броней не найдено')
             return True
 
         except SQLAlchemyError as e:
@@ -51,6 +380,7 @@ class BookingDAO(BaseDAO[Booking]):
             raise
 
     @classmethod
+    @single_flight
     async def get_available_time_slots(cls, session: AsyncSession, table_id: int, booking_date: date) -> list[TimeSlot]:
         """
         Получает список доступных временных слотов для стола на указанную дату.
@@ -62,18 +392,14 @@ class BookingDAO(BaseDAO[Booking]):
         """
         logger.info(f'Получение доступных слотов для стола {table_id} на {booking_date}')
         try:
-            # Получаем все брони для данного стола и даты
-            bookings_query = select(cls.model).filter_by(table_id=table_id, date=booking_date)
-            bookings_result = await session.execute(bookings_query)
-            # Составляем набор занятых слотов (только с активными бронями)
-            booked_slots = {
-                booking.time_slot_id for booking in bookings_result.scalars().all() if booking.status == "booked"
-            }
-            # Получаем все доступные слоты
-            available_slots_query = select(TimeSlot).where(~TimeSlot.id.in_(booked_slots))
-            available_slots_result = await session.execute(available_slots_query)
-
-            slots = available_slots_result.scalars().all()
+            # Получаем занятые слоты (только с активными бронями) для данного стола и даты
+            booked_result = await session.execute(
+                cls._booked_slots_statement(), {'table_id': table_id, 'booking_date': booking_date}
+            )
+            booked_slots = set(booked_result.scalars().all())
+            # Все слоты берём из кеша справочников
+            all_slots = await TimeSlotDAO.get_cached()
+            slots = [slot for slot in all_slots if slot.id not in booked_slots]
             logger.info(f'Найдено {len(slots)} доступных слотов')
             return slots
         except SQLAlchemyError as e:
@@ -81,20 +407,115 @@ class BookingDAO(BaseDAO[Booking]):
             raise
 
     @classmethod
-    async def get_bookings_with_details(cls, session: AsyncSession, user_id: int) -> list[Booking]:
+    @single_flight
+    async def get_availability_grid(
+        cls,
+        session: AsyncSession,
+        start_date: date,
+        days: int = 7,
+        table_id: int | None = None,
+        capacity: int | None = None,
+    ) -> dict[date, list[dict]]:
+        """
+        Строит сетку доступности «дата × временной слот» одним запросом.
+
+        Серия дат генерируется в самом запросе и соединяется со слотами, подходящими
+        столами и активными бронями. Слот доступен, если свободен хотя бы один стол.
+        Результат кешируется на AVAILABILITY_CACHE_TTL секунд с учётом версий данных.
+
+        :param session: Асинхронная сессия SQLAlchemy
+        :param start_date: Первая дата сетки
+        :param days: Количество дней
+        :param table_id: ID конкретного стола (опционально)
+        :param capacity: Минимальная вместимость стола (опционально)
+        :return: Словарь {дата: [{time_slot_id, time, free_tables, is_available}, ...]}
+        """
+        cache_key = (
+            start_date, days, table_id, capacity,
+            cls.version(), TableDAO.version(), TimeSlotDAO.version(),
+        )
+        grid = availability_cache.get(cache_key)
+        if grid is not None:
+            return grid
+
+        logger.info(
+            f'Построение сетки доступности с {start_date} на {days} дн. '
+            f'(стол: {table_id}, вместимость: {capacity})'
+        )
+        try:
+            day_series = union_all(*[
+                select(literal(start_date + timedelta(days=offset), Date).label('day'))
+                for offset in range(days)
+            ]).subquery('days')
+
+            booked_tables = func.count(distinct(cls.model.table_id))
+            query = (
+                select(
+                    day_series.c.day,
+                    TimeSlot.id,
+                    TimeSlot.start_time,
+                    func.count(distinct(Table.id)).label('total_tables'),
+                    booked_tables.label('booked_tables'),
+                )
+                .select_from(day_series)
+                .join(TimeSlot, true())
+                .join(Table, true())
+                .outerjoin(
+                    cls.model,
+                    and_(
+                        cls.model.table_id == Table.id,
+                        cls.model.time_slot_id == TimeSlot.id,
+                        cls.model.date == day_series.c.day,
+                        cls.model.status == BookingStatus.BOOKED,
+                    ),
+                )
+                .group_by(day_series.c.day, TimeSlot.id, TimeSlot.start_time)
+                .order_by(day_series.c.day, TimeSlot.start_time)
+            )
+            if table_id is not None:
+                query = query.where(Table.id == table_id)
+            if capacity is not None:
+                query = query.where(Table.capacity >= capacity)
+
+            result = await session.execute(query)
+
+            grid = {start_date + timedelta(days=offset): [] for offset in range(days)}
+            for day, slot_id, start_time, total_tables, booked in result.all():
+                free_tables = total_tables - booked
+                grid[day].append({
+                    'time_slot_id': slot_id,
+                    'time': start_time.strftime('%H:%M'),
+                    'free_tables': free_tables,
+                    'is_available': free_tables > 0,
+                })
+
+            availability_cache.set(cache_key, grid)
+            return grid
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при построении сетки доступности: {e}")
+            raise
+
+    @classmethod
+    async def get_bookings_with_details(
+        cls, session: AsyncSession, user_id: int, include_archive: bool = False, profile: str = 'details'
+    ) -> list[Booking]:
         """
         Получает список бронирований пользователя с деталями о столе и времени.
 
         :param session: Асинхронная сессия SQLAlchemy
         :param user_id: ID пользователя
+        :param include_archive: Включать ли архивные (перенесённые) брони
+        :param profile: Профиль загрузки связей из loader_profiles
         :return: Список бронирований с деталями
         """
         logger.info(f'Получение бронирований с деталями для пользователя {user_id}')
         try:
+            booking = cls.history(include_archive)
             query = (
-                select(cls.model)
-                .options(joinedload(cls.model.table), joinedload(cls.model.time_slot))
-                .filter_by(user_id=user_id)
+                select(booking)
+                .options(*cls._loader_options(profile, entity=booking))
+                .where(booking.user_id == user_id)
+                .order_by(booking.date)
             )
 
             result = await session.execute(query)
@@ -106,6 +527,78 @@ class BookingDAO(BaseDAO[Booking]):
             logger.error(f"Ошибка при получении бронирований: {e}")
             raise
 
+    @classmethod
+    def _user_summary_statement(cls):
+        """
+        Пользователь по telegram_id с предстоящими активными бронями, столами и слотами.
+
+        Число броней считает оконный count(), номер брони по порядку — row_number(); LEFT JOIN
+        оставляет одну строку без брони, если их нет. Параметры: telegram_id, today, limit.
+        """
+        def build():
+            booking = cls.model
+            rows = (
+                select(
+                    User.id.label('user_id'),
+                    booking.id,
+                    booking.date,
+                    booking.table_id,
+                    Table.capacity,
+                    Table.description,
+                    TimeSlot.start_time,
+                    TimeSlot.end_time,
+                    func.count(booking.id).over().label('active_count'),
+                    func.row_number().over(order_by=(booking.date, TimeSlot.start_time, booking.id)).label('position'),
+                )
+                .select_from(User)
+                .outerjoin(booking, and_(
+                    booking.user_id == User.id,
+                    booking.status == BookingStatus.BOOKED,
+                    booking.date >= bindparam('today', type_=Date),
+                ))
+                .outerjoin(Table, Table.id == booking.table_id)
+                .outerjoin(TimeSlot, TimeSlot.id == booking.time_slot_id)
+                .where(User.telegram_id == bindparam('telegram_id'))
+                .subquery()
+            )
+            return select(rows).where(rows.c.position <= bindparam('limit')).order_by(rows.c.position)
+        return statements.get((cls.model, 'user_summary'), build)
+
+    @classmethod
+    async def get_user_summary(
+        cls, session: AsyncSession, telegram_id: int, limit: int = settings.MY_BOOKINGS_LIMIT
+    ) -> UserBookingsSummary | None:
+        """
+        Получает одним запросом сводку броней пользователя для экрана профиля бота.
+
+        :param session: Асинхронная сессия SQLAlchemy
+        :param telegram_id: Telegram ID пользователя
+        :param limit: Сколько ближайших броней вернуть с деталями
+        :return: Сводка или None, если пользователь не найден
+        """
+        logger.info(f'Получение сводки броней пользователя с telegram_id {telegram_id}')
+        try:
+            result = await session.execute(
+                cls._user_summary_statement(),
+                {'telegram_id': telegram_id, 'today': date.today(), 'limit': max(limit, 1)},
+            )
+            rows = result.all()
+            if not rows:
+                logger.info(f'Пользователь с telegram_id {telegram_id} не найден')
+                return None
+
+            summary = UserBookingsSummary(
+                user_id=rows[0].user_id,
+                active_count=rows[0].active_count,
+                upcoming=[row for row in rows[:limit] if row.id is not None],
+            )
+            logger.info(f'Активных броней: {summary.active_count}, показано: {len(summary.upcoming)}')
+            return summary
+
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при получении сводки броней: {e}")
+            raise
+
     @classmethod
     async def complete_past_bookings(cls, session: AsyncSession) -> None:
         """
@@ -123,7 +616,7 @@ class BookingDAO(BaseDAO[Booking]):
             # Запрос для получения ID бронирований для обновления
             query = select(cls.model.id).where(
                 and_(
-                    cls.model.status == "booked",
+                    cls.model.status == BookingStatus.BOOKED,
                     or_(cls.model.date < now.date(), and_(cls.model.date == now.date(), slot_time_subq < now.time())),
                 )
             )
@@ -135,10 +628,11 @@ class BookingDAO(BaseDAO[Booking]):
                 logger.info('Нет бронирований для обновления')
                 return
 
-            # Обновление статуса
-            update_query = update(cls.model).where(cls.model.id.in_(booking_ids)).values(status="completed")
+            # Обновление статуса; booked -> completed не меняет сводку занятости
+            update_query = update(cls.model).where(cls.model.id.in_(booking_ids)).values(status=BookingStatus.COMPLETED)
 
             await session.execute(update_query)
+            cls._invalidate(session)
             await session.commit()
             logger.info(f'Обновлено {len(booking_ids)} бронирований')
 
@@ -160,18 +654,23 @@ class BookingDAO(BaseDAO[Booking]):
         try:
             query = (
                 update(cls.model)
-                .where(cls.model.id == booking_id)
-                .values(status="canceled")
+                .where(cls.model.id == booking_id, cls.model.status != BookingStatus.CANCELED)
+                .values(status=BookingStatus.CANCELED)
+                .returning(cls.model.date, cls.model.time_slot_id, cls.model.table_id)
                 .execution_options(synchronize_session="fetch")
             )
             result = await session.execute(query)
+            # До отмены бронь была активной или завершённой — снимаем её из сводки
+            canceled = result.all()
+            await cls._shift_occupancy(session, canceled, -1)
             await session.flush()
+            cls._invalidate(session)
 
-            count = result.rowcount
+            count = len(canceled)
             if count:
                 logger.info(f'Бронирование {booking_id} отменено')
             else:
-                logger.warning(f'Бронирование {booking_id} не найдено')
+                logger.warning(f'Бронирование {booking_id} не найдено или уже отменено')
 
             return count
 
@@ -191,12 +690,19 @@ class BookingDAO(BaseDAO[Booking]):
         """
         logger.info(f'Удаление бронирования {booking_id}')
         try:
-            query = delete(cls.model).where(cls.model.id == booking_id)
+            query = (
+                delete(cls.model)
+                .where(cls.model.id == booking_id)
+                .returning(cls.model.date, cls.model.time_slot_id, cls.model.table_id, cls.model.status)
+            )
             result = await session.execute(query)
+            deleted = result.all()
+            await cls._shift_occupancy(session, [row for row in deleted if row.status in OCCUPYING_STATUSES], -1)
 
-            count = result.rowcount
+            count = len(deleted)
             logger.info(f'Удалено {count} бронирований')
             await session.flush()
+            cls._invalidate(session)
             return count
 
         except SQLAlchemyError as e:
@@ -205,28 +711,22 @@ class BookingDAO(BaseDAO[Booking]):
             raise
 
     @classmethod
-    async def book_count(cls, session: AsyncSession) -> dict[str, int]:
+    async def book_count(cls, session: AsyncSession, include_archive: bool = False) -> dict[str, int]:
         """
         Подсчитывает количество бронирований по каждому статусу и общее количество.
-        
+
         :param session: Асинхронная сессия SQLAlchemy
+        :param include_archive: Учитывать ли архивные брони
         :return: Словарь с количеством бронирований по статусам и общим количеством
         """
         logger.info('Подсчет статистики бронирований по статусам')
         try:
-            statuses = ["booked", "completed", "canceled"]
-            stats = {}
-
-            # Получаем количество по каждому статусу
-            for status in statuses:
-                query = select(func.count(cls.model.id)).where(cls.model.status == status)
-                result = await session.execute(query)
-                stats[status] = result.scalar_one()
-                logger.debug(f'Статус {status}: {stats[status]} бронирований')
+            booking = cls.history(include_archive)
+            query = select(booking.status, func.count()).group_by(booking.status)
+            counts = dict((await session.execute(query)).all())
 
-            # Получаем общее количество бронирований
-            total_query = select(func.count(cls.model.id))
-            stats['total'] = (await session.execute(total_query)).scalar_one()
+            stats = {status.value: counts.get(status, 0) for status in BookingStatus}
+            stats['total'] = sum(counts.values())
 
             logger.info(f'Итого бронирований: {stats["total"]} (booked: {stats["booked"]}, '
                     f'completed: {stats["completed"]}, canceled: {stats["canceled"]})')
@@ -236,3 +736,61 @@ class BookingDAO(BaseDAO[Booking]):
         except SQLAlchemyError as e:
             logger.error(f'Ошибка при подсчете статистики бронирований: {e}')
             raise
+
+    @classmethod
+    async def _ensure_archive_partitions(cls, session: AsyncSession, months: set[date]) -> None:
+        """Создаёт месячные секции bookings_archive в PostgreSQL (в SQLite ничего не делает)."""
+        if session.bind.dialect.name != 'postgresql':
+            return
+        for month in sorted(months):
+            await session.execute(text(
+                f'CREATE TABLE IF NOT EXISTS bookings_archive_{month:%Y_%m} PARTITION OF bookings_archive '
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+            ))
+
+    @classmethod
+    async def archive_finished_bookings(cls, session: AsyncSession, before: date, batch_size: int = 1000) -> int:
+        """
+        Переносит завершённые и отменённые брони с датой до before в bookings_archive.
+
+        Перенос идёт пакетами по batch_size записей, каждый пакет — отдельная транзакция,
+        поэтому блокировки основной таблицы короткие. Активные брони не затрагиваются,
+        так что версия таблицы (и кеши доступности) не меняется.
+
+        :param session: Асинхронная сессия SQLAlchemy
+        :param before: Граница: переносятся брони с датой строго раньше неё
+        :param batch_size: Размер пакета
+        :return: Количество перенесённых броней
+        """
+        logger.info(f'Перенос завершённых бронирований до {before} в архив')
+        columns = [column.name for column in cls.model.__table__.c]
+        moved = 0
+        try:
+            while True:
+                batch = (await session.execute(
+                    select(cls.model.id, cls.model.date)
+                    .where(cls.model.status.in_(FINISHED_STATUSES), cls.model.date < before)
+                    .order_by(cls.model.id)
+                    .limit(batch_size)
+                )).all()
+                if not batch:
+                    break
+
+                booking_ids = [booking_id for booking_id, _ in batch]
+                await cls._ensure_archive_partitions(session, {day.replace(day=1) for _, day in batch})
+                await session.execute(
+                    insert(BookingArchive).from_select(
+                        columns, select(*cls.model.__table__.c).where(cls.model.id.in_(booking_ids))
+                    )
+                )
+                await session.execute(delete(cls.model).where(cls.model.id.in_(booking_ids)))
+                await session.commit()
+                moved += len(booking_ids)
+
+            logger.info(f'Перенесено в архив {moved} бронирований')
+            return moved
+
+        except SQLAlchemyError as e:
+            logger.error(f'Ошибка при переносе бронирований в архив: {e}')
+            await session.rollback()
+            raise
@@ -0,0 +1,226 @@
+import asyncio
+from collections import OrderedDict
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    from faststream.rabbit import RabbitBroker
+
+
+# Идентификатор процесса, чтобы не обрабатывать собственные сообщения об инвалидации
+PROCESS_ID = uuid.uuid4().hex
+
+# Имя fanout-обменника: каждое сообщение получает каждый воркер
+CACHE_EXCHANGE_NAME = 'reference_cache'
+
+# Ключ в session.info, где копятся сущности, изменённые в текущей транзакции
+SESSION_DIRTY_KEY = 'reference_cache_dirty'
+
+
+class ReferenceCache:
+    """
+    Версионированный in-process кеш справочных сущностей (столы, временные слоты).
+
+    Каждая сущность хранится целиком (список записей + индекс по ID) вместе с версией.
+    Любая запись через DAO увеличивает версию, и при следующем чтении данные
+    загружаются заново. Если инвалидация произошла во время загрузки,
+    загруженный снимок не сохраняется.
+
+    Версии ведутся и для таблиц, которые сами не кешируются (например, bookings):
+    они служат ключами для кешей производных данных.
+    """
+
+    def __init__(self):
+        self._records: Dict[str, List[Any]] = {}
+        self._index: Dict[str, Dict[int, Any]] = {}
+        self._versions: Dict[str, int] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._publisher: Optional[Callable[[str], Awaitable[None]]] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def version(self, name: str) -> int:
+        """Возвращает текущую версию сущности."""
+        return self._versions.get(name, 0)
+
+    def get(self, name: str) -> List[Any] | None:
+        """Возвращает закешированные записи или None, если кеш пуст."""
+        return self._records.get(name)
+
+    def get_by_id(self, name: str, data_id: int) -> Any | None:
+        """Возвращает закешированную запись по ID."""
+        return self._index.get(name, {}).get(data_id)
+
+    async def load(self, name: str, loader: Callable[[], Awaitable[List[Any]]]) -> List[Any]:
+        """
+        Загружает записи сущности через loader, если их нет в кеше.
+
+        :param name: Имя сущности (имя таблицы).
+        :param loader: Асинхронная функция, возвращающая все записи сущности.
+        :return: Список записей.
+        """
+        records = self._records.get(name)
+        if records is not None:
+            return records
+
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            records = self._records.get(name)
+            if records is not None:
+                return records
+
+            version = self.version(name)
+            records = list(await loader())
+            if version == self.version(name):
+                self._records[name] = records
+                self._index[name] = {record.id: record for record in records}
+                logger.info(f'Кеш {name} загружен: {len(records)} записей (версия {version})')
+            else:
+                logger.info(f'Кеш {name} изменился во время загрузки, снимок не сохранён')
+            return records
+
+    def invalidate(self, name: str, publish: bool = False) -> None:
+        """
+        Сбрасывает кеш сущности и увеличивает её версию.
+
+        :param name: Имя сущности.
+        :param publish: Оповестить другие процессы через канал инвалидации.
+        """
+        self._versions[name] = self.version(name) + 1
+        self._records.pop(name, None)
+        self._index.pop(name, None)
+        logger.debug(f'Кеш {name} инвалидирован (версия {self._versions[name]})')
+        if publish and self._publisher is not None:
+            task = asyncio.get_running_loop().create_task(self._publisher(name))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def mark_dirty(self, session: Session, name: str) -> None:
+        """
+        Инвалидирует сущность сразу и повторно после коммита сессии.
+
+        Повторная инвалидация нужна, чтобы конкурентное чтение, успевшее
+        загрузить данные до коммита, не оставило в кеше устаревший снимок.
+        """
+        self.invalidate(name)
+        session.info.setdefault(SESSION_DIRTY_KEY, set()).add(name)
+
+    def set_publisher(self, publisher: Callable[[str], Awaitable[None]] | None) -> None:
+        """Подключает (или отключает) межпроцессный канал инвалидации."""
+        self._publisher = publisher
+
+
+class TTLCache:
+    """
+    Ограниченный по размеру LRU-кеш с временем жизни записей и счётчиками попаданий.
+
+    Предназначен для небольших горячих отображений (например, telegram_id -> users.id).
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        if maxsize <= 0:
+            raise ValueError('Значение maxsize должно быть положительным целым числом')
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """Возвращает значение по ключу или None, если его нет или оно устарело."""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Сохраняет значение, вытесняя самую давно использованную запись при переполнении."""
+        self._data[key] = (time.monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def items(self) -> List[tuple[Hashable, Any]]:
+        """Актуальные записи (ключ, значение) от самой старой по использованию; порядок LRU и счётчики не меняются."""
+        now = time.monotonic()
+        return [(key, value) for key, (expires_at, value) in self._data.items() if expires_at >= now]
+
+    def keys(self) -> List[Hashable]:
+        """Ключи актуальных записей (см. items)."""
+        return [key for key, _ in self.items()]
+
+    def invalidate(self, key: Hashable) -> None:
+        """Удаляет запись по ключу."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Полностью очищает кеш."""
+        self._data.clear()
+
+    def stats(self) -> dict[str, float]:
+        """Возвращает статистику кеша: размер, попадания, промахи и долю попаданий."""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+reference_cache = ReferenceCache()
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session: Session):
+    for name in session.info.pop(SESSION_DIRTY_KEY, ()):
+        reference_cache.invalidate(name, publish=True)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _invalidate_after_rollback(session: Session):
+    for name in session.info.pop(SESSION_DIRTY_KEY, ()):
+        reference_cache.invalidate(name)
+
+
+def setup_invalidation_channel(broker: 'RabbitBroker') -> None:
+    """
+    Подключает межпроцессную инвалидацию кеша через RabbitMQ.
+
+    Каждый процесс получает собственную эксклюзивную очередь, привязанную
+    к fanout-обменнику, поэтому сообщение об изменении доходит до всех воркеров.
+    Вызывать нужно до broker.start().
+    """
+    from faststream.rabbit import ExchangeType, RabbitExchange, RabbitQueue
+
+    exchange = RabbitExchange(CACHE_EXCHANGE_NAME, type=ExchangeType.FANOUT, auto_delete=True)
+    queue = RabbitQueue(f'reference_cache.{PROCESS_ID}', exclusive=True, auto_delete=True)
+
+    @broker.subscriber(queue, exchange)
+    async def handle_invalidation(message: dict):
+        if message.get('origin') == PROCESS_ID:
+            return
+        reference_cache.invalidate(message['model'])
+
+    async def publish(name: str):
+        try:
+            await broker.publish({'model': name, 'origin': PROCESS_ID}, exchange=exchange)
+        except Exception as e:
+            logger.error(f'Не удалось отправить инвалидацию кеша {name}: {e}')
+
+    reference_cache.set_publisher(publish)
@@ -0,0 +1,111 @@
+import asyncio
+from functools import wraps
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from app.core.config import settings
+
+
+R = TypeVar('R')
+
+
+class _LeaderCancelled(Exception):
+    """Ведущий вызов отменён: ожидающие вызовы повторяют запрос сами."""
+
+
+class SingleFlight:
+    """
+    Объединение одинаковых конкурентных запросов (single-flight).
+
+    Первый вызов с ключом выполняет запрос, остальные вызовы с тем же ключом, пришедшие
+    до его завершения, ждут тот же результат (или ту же ошибку). Результаты не хранятся:
+    следующий вызов после завершения снова идёт в БД. Если ведущий вызов отменён,
+    ожидающие не получают отмену, а один из них выполняет запрос заново.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[R]]) -> R:
+        """
+        Выполняет call или присоединяется к уже выполняющемуся вызову с тем же ключом.
+
+        :param key: Ключ запроса (метод и аргументы).
+        :param call: Функция, выполняющая запрос.
+        :return: Результат запроса.
+        """
+        self.calls += 1
+        while (future := self._in_flight.get(key)) is not None:
+            try:
+                # shield: отмена ожидающего не отменяет общий результат
+                result = await asyncio.shield(future)
+            except _LeaderCancelled:
+                continue
+            except Exception:
+                self.coalesced += 1
+                raise
+            self.coalesced += 1
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+            # Ошибку уже получил ведущий вызов: помечаем её полученной, чтобы без ожидающих
+            # asyncio не предупреждал о необработанном исключении Future
+            future.exception()
+
+    def stats(self) -> dict[str, float]:
+        """Статистика: вызовы, объединённые вызовы, запросы в полёте и доля объединённых вызовов."""
+        return {
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._in_flight),
+            'coalescing_ratio': self.coalesced / self.calls if self.calls else 0.0,
+        }
+
+    def reset_stats(self) -> None:
+        self.calls = 0
+        self.coalesced = 0
+
+
+flights = SingleFlight()
+
+
+def single_flight(method: Callable[..., Awaitable[R]]) -> Callable[..., Awaitable[R]]:
+    """
+    Декоратор чтения DAO: одинаковые конкурентные вызовы выполняют один запрос.
+
+    Ключ — класс DAO, имя метода и аргументы без session, поэтому аргументы должны быть
+    хешируемыми. Результат получают вызовы с разными сессиями, так что метод должен
+    возвращать данные, не привязанные к сессии (словари, строки, отсоединённые объекты
+    справочников), и не применяется там, где нужны несохранённые изменения своей сессии.
+    Ставится под @classmethod. Отключается настройкой DAO_SINGLE_FLIGHT.
+    """
+    signature = inspect.signature(method)
+
+    @wraps(method)
+    async def wrapper(cls, *args: Any, **kwargs: Any) -> R:
+        if not settings.DAO_SINGLE_FLIGHT:
+            return await method(cls, *args, **kwargs)
+        bound = signature.bind(cls, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = tuple(
+            (name, value) for name, value in list(bound.arguments.items())[1:] if name != 'session'
+        )
+        return await flights.do((cls, method.__name__, arguments), lambda: method(cls, *args, **kwargs))
+
+    return wrapper
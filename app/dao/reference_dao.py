@@ -0,0 +1,68 @@
+from typing import List, Sequence
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dao.base_dao import T, Values, to_dict
+from app.dao.cache import reference_cache
+from app.dao.versioned_dao import VersionedDAO
+from app.db.database import async_session_maker
+
+
+class ReferenceDAO(VersionedDAO[T]):
+    """
+    DAO для справочных сущностей, которые почти не меняются (столы, временные слоты).
+
+    Чтения обслуживаются из reference_cache, а записи через DAO инвалидируют кеш.
+    Кешированные объекты отсоединены от сессии и должны использоваться только для чтения.
+    """
+
+    @classmethod
+    async def _load_all(cls) -> List[T]:
+        """Загружает все записи отдельной сессией и отсоединяет их от неё."""
+        async with async_session_maker() as session:
+            result = await session.execute(select(cls.model).order_by(cls.model.id))
+            records = result.scalars().all()
+            session.expunge_all()
+            return records
+
+    @classmethod
+    async def get_cached(cls) -> List[T]:
+        """Возвращает все записи сущности из кеша, загружая их при необходимости."""
+        return await reference_cache.load(cls.cache_name(), cls._load_all)
+
+    @classmethod
+    async def warm_up(cls) -> None:
+        """Загружает кеш заранее (при старте приложения)."""
+        records = await cls.get_cached()
+        logger.info(f'Прогрев кеша {cls.model.__name__}: {len(records)} записей')
+
+    @classmethod
+    async def find_one_or_none_by_id(cls, data_id: int, session: AsyncSession):
+        await cls.get_cached()
+        return reference_cache.get_by_id(cls.cache_name(), data_id)
+
+    @classmethod
+    async def find_all(
+        cls,
+        session: AsyncSession,
+        filters: Values | None = None,
+        order_by: Sequence[str] | None = None,
+        limit: int | None = None,
+        columns: Sequence[str] | None = None,
+        profile: str | None = None,
+    ):
+        filter_dict = to_dict(filters)
+        if order_by or limit is not None or columns or profile or any('__' in key for key in filter_dict):
+            # Операторы, сортировка, лимит, проекция и профили загрузки выполняются в БД
+            return await super().find_all(
+                session=session, filters=filter_dict, order_by=order_by, limit=limit, columns=columns, profile=profile
+            )
+        records = await cls.get_cached()
+        if not filter_dict:
+            return list(records)
+        return [
+            record for record in records
+            if all(getattr(record, key) == value for key, value in filter_dict.items())
+        ]
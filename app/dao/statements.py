@@ -0,0 +1,44 @@
+from typing import Callable, Dict, Hashable, TypeVar
+
+from sqlalchemy.sql import Executable
+
+
+S = TypeVar('S', bound=Executable)
+
+
+class StatementRegistry:
+    """
+    Реестр готовых SQL-выражений для горячих запросов DAO.
+
+    Выражение строится один раз на ключ, значения передаются через bindparam при выполнении.
+    Повторно используемое выражение не собирается заново, а ключ кеша компиляции SQLAlchemy
+    для него запоминается, поэтому на вызов остаются только поиск в словаре и выполнение.
+    Ключ должен однозначно описывать форму запроса (модель, имя запроса, набор полей).
+    """
+
+    def __init__(self):
+        self._statements: Dict[Hashable, Executable] = {}
+        self.builds = 0
+
+    def get(self, key: Hashable, build: Callable[[], S]) -> S:
+        """
+        Возвращает выражение по ключу, строя его при первом обращении.
+
+        :param key: Ключ формы запроса.
+        :param build: Функция, строящая выражение с bindparam.
+        :return: Готовое выражение.
+        """
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = self._statements[key] = build()
+            self.builds += 1
+        return statement
+
+    def clear(self) -> None:
+        self._statements.clear()
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+
+statements = StatementRegistry()
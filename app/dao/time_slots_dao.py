@@ -1,6 +1,6 @@
-from app.dao.base_dao import BaseDAO
+from app.dao.reference_dao import ReferenceDAO
 from app.db.models.models import TimeSlot
 
 
-class TimeSlotDAO(BaseDAO[TimeSlot]):
+class TimeSlotDAO(ReferenceDAO[TimeSlot]):
     model = TimeSlot
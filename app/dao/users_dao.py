@@ -1,15 +1,125 @@
-from sqlalchemy import select
+from typing import List
+
+from loguru import logger
+from sqlalchemy import bindparam, event, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from app.dao.base_dao import BaseDAO
+from app.core.config import settings
+from app.dao.base_dao import BaseDAO, Values, to_dict
+from app.dao.cache import TTLCache
+from app.dao.statements import statements
 from app.db.models.models import User
 
 
+# Кеш telegram_id -> users.id, чтобы не ходить в БД на каждом апдейте бота
+user_id_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
+
+# Ключ в session.info для пар (telegram_id, users.id), которые попадут в кеш после коммита
+SESSION_PENDING_KEY = 'user_id_cache_pending'
+# Ключ в session.info для telegram_id удалённых пользователей, которые уйдут из кеша после коммита
+SESSION_EVICT_KEY = 'user_id_cache_evict'
+# Значение SESSION_EVICT_KEY: после коммита кеш сбрасывается целиком
+EVICT_ALL = None
+# Ключ в session.info для поколения удалений на момент начала транзакции сессии
+SESSION_GENERATION_KEY = 'user_id_cache_generation'
+
+# Счётчик закоммиченных удалений из кеша ID: get_user_id не кладёт в кеш результат
+# транзакции, начатой до удаления (её снимок ещё видит удалённую строку)
+_evict_generation = 0
+
+
+@event.listens_for(Session, 'after_begin')
+def _remember_generation(session: Session, transaction, connection):
+    session.info[SESSION_GENERATION_KEY] = _evict_generation
+
+
+@event.listens_for(Session, 'after_commit')
+def _remember_after_commit(session: Session):
+    global _evict_generation
+    # Сначала удаления: пары, добавленные после удаления в той же сессии, должны остаться в кеше
+    if SESSION_EVICT_KEY in session.info:
+        evict = session.info.pop(SESSION_EVICT_KEY)
+        _evict_generation += 1
+        if evict is EVICT_ALL:
+            user_id_cache.clear()
+        else:
+            for telegram_id in evict:
+                user_id_cache.invalidate(telegram_id)
+    for telegram_id, user_id in session.info.pop(SESSION_PENDING_KEY, ()):
+        user_id_cache.set(telegram_id, user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_after_rollback(session: Session):
+    session.info.pop(SESSION_PENDING_KEY, None)
+    session.info.pop(SESSION_EVICT_KEY, None)
+
+
 class UserDAO(BaseDAO[User]):
     model = User
 
+    @classmethod
+    def _remember(cls, session: AsyncSession, user: User) -> None:
+        session.info.setdefault(SESSION_PENDING_KEY, []).append((user.telegram_id, user.id))
+
+    @classmethod
+    def _id_by_telegram_id_statement(cls):
+        return statements.get(
+            (cls.model, 'id_by_telegram_id'),
+            lambda: select(cls.model.id).where(cls.model.telegram_id == bindparam('telegram_id')),
+        )
+
     @classmethod
     async def get_user_id(cls, session: AsyncSession, telegram_id: int) -> int | None:
-        query = select(cls.model.id).filter_by(telegram_id=telegram_id)
-        result = await session.execute(query)
-        return result.scalar_one_or_none()
+        user_id = user_id_cache.get(telegram_id)
+        if user_id is not None:
+            return user_id
+        result = await session.execute(cls._id_by_telegram_id_statement(), {'telegram_id': telegram_id})
+        user_id = result.scalar_one_or_none()
+        # Пока шёл запрос, могло закоммититься удаление: тогда снимок транзакции устарел
+        if user_id is not None and session.info.get(SESSION_GENERATION_KEY) == _evict_generation:
+            user_id_cache.set(telegram_id, user_id)
+        return user_id
+
+    @classmethod
+    async def add(cls, session: AsyncSession, values: Values):
+        new_instance = await super().add(session=session, values=values)
+        cls._remember(session, new_instance)
+        return new_instance
+
+    @classmethod
+    async def upsert(cls, session: AsyncSession, unique_fields: List[str], values: Values):
+        record = await super().upsert(session=session, unique_fields=unique_fields, values=values)
+        cls._remember(session, record)
+        return record
+
+    @classmethod
+    def _evict(cls, session: AsyncSession, telegram_id: int | None = None) -> None:
+        """
+        Откладывает удаление telegram_id из кеша до коммита (None — сброс всего кеша).
+
+        Сразу удалять нельзя: конкурентный get_user_id до коммита ещё видит строку
+        и вернул бы удалённый ID в кеш на весь TTL. После коммита поколение удалений
+        растёт, и get_user_id, чья транзакция началась раньше, не кладёт результат в кеш.
+        """
+        pending = session.info.get(SESSION_PENDING_KEY, [])
+        if telegram_id is None:
+            session.info[SESSION_EVICT_KEY] = EVICT_ALL
+            pending.clear()
+            return
+        evict = session.info.setdefault(SESSION_EVICT_KEY, set())
+        if evict is not EVICT_ALL:
+            evict.add(telegram_id)
+        pending[:] = [item for item in pending if item[0] != telegram_id]
+
+    @classmethod
+    async def delete(cls, session: AsyncSession, filters: Values):
+        filter_dict = to_dict(filters)
+        count = await super().delete(session=session, filters=filters)
+        if 'telegram_id' in filter_dict:
+            cls._evict(session, filter_dict['telegram_id'])
+        else:
+            logger.info('Удаление пользователей без telegram_id в фильтре: кеш ID будет сброшен после коммита')
+            cls._evict(session)
+        return count
@@ -0,0 +1,64 @@
+from typing import List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dao.base_dao import BaseDAO, T, Values
+from app.dao.cache import reference_cache
+
+
+class VersionedDAO(BaseDAO[T]):
+    """
+    DAO, который увеличивает версию таблицы при каждой записи.
+
+    Версия хранится в reference_cache и используется как ключ кешей,
+    зависящих от содержимого таблицы.
+    """
+
+    @classmethod
+    def cache_name(cls) -> str:
+        return cls.model.__tablename__
+
+    @classmethod
+    def version(cls) -> int:
+        """Текущая версия данных таблицы."""
+        return reference_cache.version(cls.cache_name())
+
+    @classmethod
+    def _invalidate(cls, session: AsyncSession) -> None:
+        reference_cache.mark_dirty(session, cls.cache_name())
+
+    @classmethod
+    async def add(cls, session: AsyncSession, values: Values):
+        new_instance = await super().add(session=session, values=values)
+        cls._invalidate(session)
+        return new_instance
+
+    @classmethod
+    async def add_many(cls, session: AsyncSession, instances: List[Values]):
+        new_instances = await super().add_many(session=session, instances=instances)
+        cls._invalidate(session)
+        return new_instances
+
+    @classmethod
+    async def update(cls, session: AsyncSession, filters: Values, values: Values):
+        count = await super().update(session=session, filters=filters, values=values)
+        cls._invalidate(session)
+        return count
+
+    @classmethod
+    async def delete(cls, session: AsyncSession, filters: Values):
+        count = await super().delete(session=session, filters=filters)
+        cls._invalidate(session)
+        return count
+
+    @classmethod
+    async def upsert(cls, session: AsyncSession, unique_fields: List[str], values: Values):
+        record = await super().upsert(session=session, unique_fields=unique_fields, values=values)
+        cls._invalidate(session)
+        return record
+
+    @classmethod
+    async def bulk_update(cls, session: AsyncSession, records: List[Values]) -> int:
+        count = await super().bulk_update(session=session, records=records)
+        cls._invalidate(session)
+        return count
@@ -1,17 +1,25 @@
 from datetime import datetime
-from decimal import Decimal
-import uuid
-from sqlalchemy import Integer, func, inspect
+from sqlalchemy import Integer, event, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.ext.asyncio import \
     AsyncAttrs, async_sessionmaker, create_async_engine, AsyncSession
 from app.core.config import settings
+from app.db.serializers import get_serializer
 
 
 engine = create_async_engine(url=settings.get_database_url)
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession)
 
 
+if engine.dialect.name == 'sqlite':
+    @event.listens_for(engine.sync_engine, 'connect')
+    def _sqlite_wal(dbapi_connection, connection_record):
+        # WAL: читатели не блокируют писателя и не ждут его коммита
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.close()
+
+
 class Base(AsyncAttrs, DeclarativeBase):
     """
     Класс Base будет использоваться для создания моделей таблиц, которые автоматически добавляют поля created_at и updated_at для отслеживания времени создания и обновления записей.
@@ -30,15 +38,13 @@ class Base(AsyncAttrs, DeclarativeBase):
         Args: exclude_none (bool): Исключать ли None значения из результата
         Returns: dict: Словарь с данными объекта
         """
-        result = {}
-        for column in inspect(self.__class__).columns:
-            value = getattr(self, column.key)
-            if isinstance(value, datetime):
-                value = value.isoformat()
-            elif isinstance(value, Decimal):
-                value = float(value)
-            elif isinstance(value, uuid.UUID):
-                value = str(value)
-            if not exclude_none or value is not None:
-                result[column.key] = value
-        return result
+        return get_serializer(self.__class__)(self, exclude_none)
+
+    @classmethod
+    def to_dicts(cls, rows, exclude_none: bool = False):
+        """
+        Пакетно преобразует объекты модели в список словарей.
+        Args: rows: Объекты модели; exclude_none (bool): Исключать ли None значения
+        Returns: list[dict]: Список словарей с данными объектов
+        """
+        return get_serializer(cls).many(rows, exclude_none)
@@ -0,0 +1,17 @@
+from enum import StrEnum
+
+
+class BookingStatus(StrEnum):
+    """Статус бронирования. В БД хранится как SMALLINT (коды — BOOKING_STATUS_CODES)."""
+
+    BOOKED = 'booked'
+    COMPLETED = 'completed'
+    CANCELED = 'canceled'
+
+
+# Коды статусов в БД: существующие значения не меняются, новые только добавляются
+BOOKING_STATUS_CODES = {
+    BookingStatus.BOOKED: 1,
+    BookingStatus.COMPLETED: 2,
+    BookingStatus.CANCELED: 3,
+}
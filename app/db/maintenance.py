@@ -0,0 +1,89 @@
+"""
+Обслуживание данных: перенос завершённых бронирований в архив, пересчёт сводок.
+
+Перенос в архив регистрируется в планировщике при старте приложения (выполняет его
+только воркер-лидер). Разовый запуск:
+    python -m app.db.maintenance archive
+    python -m app.db.maintenance rebuild-occupancy
+"""
+
+import argparse
+import asyncio
+from datetime import date, timedelta
+
+from loguru import logger
+
+from app.core.config import get_scheduler, settings
+from app.dao.bookings_dao import BookingDAO
+from app.db.database import async_session_maker
+
+
+async def archive_finished_bookings() -> int:
+    """Переносит в архив брони, завершённые раньше BOOKING_ARCHIVE_AFTER_DAYS дней назад."""
+    before = date.today() - timedelta(days=settings.BOOKING_ARCHIVE_AFTER_DAYS)
+    async with async_session_maker() as session:
+        return await BookingDAO.archive_finished_bookings(
+            session=session, before=before, batch_size=settings.BOOKING_ARCHIVE_BATCH_SIZE
+        )
+
+
+async def rebuild_occupancy() -> int:
+    """Полностью пересчитывает сводку занятости daily_occupancy."""
+    async with async_session_maker() as session:
+        return await BookingDAO.rebuild_occupancy(session=session)
+
+
+ARCHIVE_JOB_ID = 'archive_finished_bookings'
+
+
+def schedule_maintenance() -> None:
+    """
+    Регистрирует периодические задачи обслуживания (идемпотентно).
+
+    Вызывается каждым воркером при старте. Задача уже сохранена в общем хранилище задач,
+    поэтому существующая не пересоздаётся: иначе каждый рестарт воркера сдвигал бы
+    next_run_time и при частых рестартах перенос в архив не выполнялся бы никогда.
+    Расписание меняется, только если изменился BOOKING_ARCHIVE_INTERVAL.
+    """
+    scheduler = get_scheduler()
+    interval = settings.BOOKING_ARCHIVE_INTERVAL
+    job = scheduler.get_job(ARCHIVE_JOB_ID)
+    if interval <= 0:
+        if job is not None:
+            scheduler.remove_job(ARCHIVE_JOB_ID)
+            logger.info('Перенос бронирований в архив отключён')
+        return
+
+    if job is None:
+        scheduler.add_job(
+            archive_finished_bookings,
+            'interval',
+            seconds=interval,
+            id=ARCHIVE_JOB_ID,
+            coalesce=True,
+            max_instances=1,
+        )
+    elif getattr(job.trigger, 'interval', None) != timedelta(seconds=interval):
+        job.reschedule('interval', seconds=interval)
+    else:
+        logger.info(f'Перенос бронирований в архив: каждые {interval} с, следующий запуск {job.next_run_time}')
+        return
+    logger.info(f'Перенос бронирований в архив: каждые {interval} с')
+
+
+COMMANDS = {
+    'archive': archive_finished_bookings,
+    'rebuild-occupancy': rebuild_occupancy,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=COMMANDS)
+    args = parser.parse_args()
+    result = asyncio.run(COMMANDS[args.command]())
+    print(f'{args.command}: {result}')
+
+
+if __name__ == '__main__':
+    main()
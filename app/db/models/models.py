@@ -1,17 +1,12 @@
 from datetime import datetime, time
-# from enum import Enum
 from typing import Optional, List
-from sqlalchemy import BigInteger, Date, Integer, String, Text, ForeignKey, Time #, Enum as SQLEnum
+from sqlalchemy import BigInteger, Date, Index, Integer, String, Text, ForeignKey, Time, UniqueConstraint
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
-
-
-# class BookingStatus(str, Enum):
-#     CONFIRMED = 'ПОДТВЕРЖДЕНО'
-#     CANCELLED = 'ОТМЕНЕНО'
-#     PENDING = 'ОЖИДАНИЕ'
+from app.db.enums import BOOKING_STATUS_CODES, BookingStatus
+from app.db.types import SmallIntEnum
 
 
 class User(Base):
@@ -58,13 +53,19 @@ class TimeSlot(Base):
 
 class Booking(Base):
     __tablename__ = 'bookings'
+    __table_args__ = (
+        Index('ix_bookings_date_time_slot_id_table_id', 'date', 'time_slot_id', 'table_id'),
+        Index('ix_bookings_status_date', 'status', 'date'),
+        # Без AUTOINCREMENT SQLite снова выдаёт ID удалённых (перенесённых в архив) строк,
+        # и новая бронь совпала бы по ID с архивной в BookingDAO.history
+        {'sqlite_autoincrement': True},
+    )
 
     user_id: Mapped[int] = mapped_column(BigInteger, ForeignKey('users.id'), nullable=False)
     table_id: Mapped[int] = mapped_column(Integer, ForeignKey('tables.id'), nullable=False)
     time_slot_id: Mapped[int] = mapped_column(Integer, ForeignKey('time_slots.id'), nullable=False)
     date: Mapped[datetime] = mapped_column(Date, nullable=False)
-    # status: Mapped[BookingStatus] = mapped_column(SQLEnum(BookingStatus), nullable=False)
-    status: Mapped[str]
+    status: Mapped[BookingStatus] = mapped_column(SmallIntEnum(BookingStatus, BOOKING_STATUS_CODES), nullable=False)
 
     user: Mapped['User'] = relationship('User', back_populates='bookings')
     table: Mapped['Table'] = relationship('Table', back_populates='bookings')
@@ -75,3 +76,55 @@ class Booking(Base):
             f'Booking(id={self.id}, user_id={self.user_id}, table_id={self.table_id}, '
             f'time_slot_id={self.time_slot_id}, date={self.date}, status={self.status})'
         )
+
+
+class BookingArchive(Base):
+    """
+    Архив завершённых и отменённых бронирований (холодные данные).
+
+    Строки переносятся из bookings с теми же ID. В PostgreSQL таблица секционирована
+    по месяцам (RANGE по date, секции создаются при переносе), в SQLite — обычная таблица.
+    """
+
+    __tablename__ = 'bookings_archive'
+    __table_args__ = (
+        Index('ix_bookings_archive_user_id_date', 'user_id', 'date'),
+        {'postgresql_partition_by': 'RANGE (date)'},
+    )
+
+    # Ключ секционирования должен входить в первичный ключ
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    table_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    time_slot_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    date: Mapped[datetime] = mapped_column(Date, primary_key=True)
+    status: Mapped[BookingStatus] = mapped_column(SmallIntEnum(BookingStatus, BOOKING_STATUS_CODES), nullable=False)
+
+    def __repr__(self) -> str:
+        return f'BookingArchive(id={self.id}, user_id={self.user_id}, date={self.date}, status={self.status})'
+
+
+class DailyOccupancy(Base):
+    """
+    Сводка занятости по дням и временным слотам.
+
+    Учитываются активные и завершённые брони (в том числе архивные). Ведётся BookingDAO
+    инкрементально при создании, отмене и удалении броней; полностью пересчитывается
+    командой python -m app.db.maintenance rebuild-occupancy.
+    """
+
+    __tablename__ = 'daily_occupancy'
+    __table_args__ = (
+        UniqueConstraint('date', 'time_slot_id', name='uq_daily_occupancy_date_time_slot_id'),
+    )
+
+    date: Mapped[datetime] = mapped_column(Date, nullable=False)
+    time_slot_id: Mapped[int] = mapped_column(Integer, ForeignKey('time_slots.id'), nullable=False)
+    tables_booked: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    seats_booked: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f'DailyOccupancy(date={self.date}, time_slot_id={self.time_slot_id}, '
+            f'tables_booked={self.tables_booked}, seats_booked={self.seats_booked})'
+        )
@@ -0,0 +1,136 @@
+from datetime import datetime
+from decimal import Decimal
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import uuid
+
+from sqlalchemy import inspect
+
+
+def _convert_any(value: Any) -> Any:
+    """Универсальный конвертер для колонок, тип которых неизвестен заранее."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _convert_datetime(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _convert_decimal(value: Optional[Decimal]) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def _convert_uuid(value: Optional[uuid.UUID]) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+_CONVERTERS: Dict[type, Callable[[Any], Any]] = {
+    datetime: _convert_datetime,
+    Decimal: _convert_decimal,
+    uuid.UUID: _convert_uuid,
+}
+
+
+def _column_converter(column) -> Optional[Callable[[Any], Any]]:
+    """Подбирает конвертер по python-типу колонки (None — значение отдаётся как есть)."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return _convert_any
+    for base_type, converter in _CONVERTERS.items():
+        if issubclass(python_type, base_type):
+            return converter
+    return None
+
+
+class ModelSerializer:
+    """
+    Сериализатор модели в словарь, собранный один раз по маперу SQLAlchemy.
+
+    Ключи колонок и конвертеры значений вычисляются при создании,
+    поэтому на каждую строку остаётся только чтение атрибутов и сборка словаря.
+    """
+
+    def __init__(self, model: type):
+        columns = inspect(model).columns
+        self.keys: Tuple[str, ...] = tuple(column.key for column in columns)
+        self._converters: Tuple[Tuple[str, Callable[[Any], Any]], ...] = tuple(
+            (column.key, converter)
+            for column in columns
+            if (converter := _column_converter(column)) is not None
+        )
+        if len(self.keys) == 1:
+            key = self.keys[0]
+            self._item_getter = lambda state: (state[key],)
+            self._attr_getter = lambda obj: (getattr(obj, key),)
+        else:
+            self._item_getter = itemgetter(*self.keys)
+            self._attr_getter = attrgetter(*self.keys)
+
+    def _values(self, obj: Any) -> Tuple[Any, ...]:
+        """
+        Читает значения колонок.
+
+        Загруженные значения берутся прямо из __dict__ в обход инструментированных
+        атрибутов; если какая-то колонка не загружена (expired/deferred),
+        используется обычный getattr с ленивой загрузкой.
+        """
+        try:
+            return self._item_getter(obj.__dict__)
+        except KeyError:
+            return self._attr_getter(obj)
+
+    def __call__(self, obj: Any, exclude_none: bool = False) -> Dict[str, Any]:
+        result = dict(zip(self.keys, self._values(obj)))
+        for key, converter in self._converters:
+            result[key] = converter(result[key])
+        if exclude_none:
+            return {key: value for key, value in result.items() if value is not None}
+        return result
+
+    def many(self, rows: Iterable[Any], exclude_none: bool = False) -> List[Dict[str, Any]]:
+        """Сериализует набор строк одной модели."""
+        keys, values, converters = self.keys, self._values, self._converters
+        result = []
+        for row in rows:
+            item = dict(zip(keys, values(row)))
+            for key, converter in converters:
+                item[key] = converter(item[key])
+            if exclude_none:
+                item = {key: value for key, value in item.items() if value is not None}
+            result.append(item)
+        return result
+
+
+_serializers: Dict[type, ModelSerializer] = {}
+
+
+def get_serializer(model: type) -> ModelSerializer:
+    """Возвращает (и кеширует) сериализатор для класса модели."""
+    serializer = _serializers.get(model)
+    if serializer is None:
+        serializer = _serializers[model] = ModelSerializer(model)
+    return serializer
+
+
+def to_dicts(rows: Iterable[Any], exclude_none: bool = False) -> List[Dict[str, Any]]:
+    """
+    Пакетно преобразует объекты моделей в словари.
+
+    Сериализатор выбирается по классу каждой строки, поэтому допускаются смешанные наборы.
+    """
+    result = []
+    serializer = None
+    model = None
+    for row in rows:
+        if type(row) is not model:
+            model = type(row)
+            serializer = get_serializer(model)
+        result.append(serializer(row, exclude_none))
+    return result
@@ -0,0 +1,37 @@
+from enum import Enum
+from typing import Dict
+
+from sqlalchemy import SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+
+class SmallIntEnum(TypeDecorator):
+    """
+    Enum, хранящийся в БД как SMALLINT по явной таблице кодов.
+
+    Коды не зависят от порядка членов enum. В параметрах запросов можно передавать
+    как члены enum, так и их значения (например, строку 'booked').
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class: type[Enum], codes: Dict[Enum, int]):
+        super().__init__()
+        self.enum_class = enum_class
+        self._codes = dict(codes)
+        self._members = {code: member for member, code in codes.items()}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self._codes[self.enum_class(value)]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._members[value]
+
+    @property
+    def python_type(self):
+        return self.enum_class
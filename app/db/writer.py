@@ -0,0 +1,167 @@
+import asyncio
+from functools import cache
+from typing import Awaitable, Callable, List, Tuple, TypeVar
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.database import engine
+
+
+R = TypeVar('R')
+
+# Операция записи: получает сессию писателя, коммит выполняет очередь
+WriteOperation = Callable[[AsyncSession], Awaitable[R]]
+
+
+class WriteQueue:
+    """
+    Очередь записей с единственным писателем и групповыми коммитами.
+
+    Операции из всех корутин выполняются одной задачей-писателем: накопившиеся в очереди
+    (не больше max_batch) выполняются в одной сессии и фиксируются одним коммитом.
+    У каждой операции своя future: submit возвращает её результат после коммита.
+    Если операция пакета упала, пакет откатывается и операции выполняются по одной
+    (каждая со своим коммитом), так что ошибка достаётся только своей операции.
+
+    Для SQLite это убирает конкуренцию писателей за блокировку БД («database is locked»)
+    и число fsync на коммитах; чтения по-прежнему идут через пул соединений (WAL).
+    Операции не должны сами вызывать commit/rollback и могут быть выполнены повторно.
+    Объекты, возвращённые операциями, не истекают после коммита, но принадлежат сессии
+    писателя и должны использоваться только для чтения.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        max_batch: int = 64,
+        max_delay: float = 0.0,
+    ):
+        self._session_factory = session_factory
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self.operations = 0
+        self.batches = 0
+        self.fallbacks = 0
+
+    def start(self) -> None:
+        """Запускает задачу-писателя в текущем цикле событий."""
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run(), name='write-queue')
+
+    async def submit(self, operation: WriteOperation[R]) -> R:
+        """
+        Ставит операцию в очередь и ждёт её результата после группового коммита.
+
+        :param operation: Корутинная функция, получающая сессию писателя.
+        :return: Результат операции.
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((operation, future))
+        return await future
+
+    async def close(self) -> None:
+        """Выполняет уже поставленные операции и останавливает писателя."""
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+        logger.info(
+            f'Очередь записей остановлена: {self.operations} операций в {self.batches} коммитах '
+            f'({self.fallbacks} пакетов выполнено поштучно)'
+        )
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            if self._max_delay:
+                # Небольшая задержка собирает в пакет больше операций
+                await asyncio.sleep(self._max_delay)
+            batch = [item]
+            while len(batch) < self._max_batch and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._commit_batch([(op, future) for op, future in batch if not future.cancelled()])
+
+    async def _commit_batch(self, batch: List[Tuple[WriteOperation, asyncio.Future]]) -> None:
+        if not batch:
+            return
+        if len(batch) == 1:
+            await self._commit_one(*batch[0])
+            return
+        try:
+            async with self._session_factory() as session:
+                results = [await operation(session) for operation, _ in batch]
+                await session.commit()
+        except Exception as e:
+            self.fallbacks += 1
+            logger.warning(f'Групповой коммит {len(batch)} операций не удался ({e}), выполняем по одной')
+            for operation, future in batch:
+                await self._commit_one(operation, future)
+            return
+        self.batches += 1
+        self.operations += len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _commit_one(self, operation: WriteOperation, future: asyncio.Future) -> None:
+        try:
+            async with self._session_factory() as session:
+                result = await operation(session)
+                await session.commit()
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        self.batches += 1
+        self.operations += 1
+        if not future.done():
+            future.set_result(result)
+
+
+@cache
+def get_write_queue() -> WriteQueue:
+    """Возвращает очередь записей процесса (писатель запускается при первой операции)."""
+    return WriteQueue(
+        async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+        max_batch=settings.SQLITE_WRITE_BATCH,
+        max_delay=settings.SQLITE_WRITE_DELAY_MS / 1000,
+    )
+
+
+async def run_write(session: AsyncSession, operation: WriteOperation[R]) -> R:
+    """
+    Выполняет операцию записи и фиксирует её.
+
+    С SQLITE_WRITE_QUEUE операция уходит в очередь писателя (групповой коммит),
+    иначе выполняется в сессии вызывающего кода с коммитом этой сессии.
+
+    Все записи из обработчиков должны идти через run_write: запись, закоммиченная в своей
+    сессии, обходит очередь и снова конкурирует с писателем за блокировку SQLite.
+    Сейчас через неё идёт регистрация пользователя (cmd_start). Создание и отмену брони
+    (BookingDAO.add, BookingDAO.cancel_booking) обработчики пока не вызывают: диалог
+    бронирования (app.tg_bot.booking.handlers) пуст. Его записи нужно передавать сюда так же,
+    как это делает benchmarks.bench_sqlite_writes.
+
+    :param session: Сессия вызывающего кода.
+    :param operation: Корутинная функция, получающая сессию.
+    :return: Результат операции.
+    """
+    if settings.SQLITE_WRITE_QUEUE:
+        return await get_write_queue().submit(operation)
+    result = await operation(session)
+    await session.commit()
+    return result
@@ -1,3 +1,5 @@
+import asyncio
+import hashlib
 import json
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, status
@@ -5,9 +7,17 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 
+from app.api.controller.admin_router import router as router_admin
+from app.api.controller.bookings_router import router as router_bookings
+from app.api.middleware import CacheRule, ProfilingMiddleware, ResponseCacheMiddleware
 from app.async_client import http_client_manager
-from app.core.config import settings, scheduler
+from app.core.config import settings, get_broker, get_scheduler_leader
 from app.core.logger_config import setup_logger
+from app.dao.cache import setup_invalidation_channel
+from app.dao.tables_dao import TableDAO
+from app.dao.time_slots_dao import TimeSlotDAO
+from app.db.maintenance import schedule_maintenance
+from app.db.writer import get_write_queue
 from app.tg_bot.router import router as router_tg_bot
 
 
@@ -19,25 +29,65 @@ logger = setup_logger(
     retention="30 days",  # Хранить логи 30 дней
 )
 
-async def set_webhook(client):
+BOT_COMMANDS = [{'command': 'start', 'description': 'Главное меню'}]
+
+
+def webhook_fingerprint() -> str:
+    """Отпечаток конфигурации вебхука: токен, URL и список команд."""
+    payload = json.dumps([settings.BOT_TOKEN, settings.get_webhook_url, BOT_COMMANDS], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def webhook_is_current() -> bool:
+    """Проверяет, совпадает ли сохранённый отпечаток с текущей конфигурацией."""
+    try:
+        with open(settings.WEBHOOK_STATE_FILE) as state_file:
+            return state_file.read().strip() == webhook_fingerprint()
+    except OSError:
+        return False
+
+
+def save_webhook_state() -> None:
+    """Сохраняет отпечаток успешно применённой конфигурации вебхука."""
+    try:
+        with open(settings.WEBHOOK_STATE_FILE, 'w') as state_file:
+            state_file.write(webhook_fingerprint())
+    except OSError as e:
+        logger.warning(f'Не удалось сохранить состояние вебхука: {e}')
+
+
+async def set_webhook(client) -> bool:
     """Устанавливает вебхук для Telegram-бота."""
     try:
         response = await client.post(
-            f'{settings.get_tg_api_url()}/setWebhook', json={'url': settings.get_webhook_url()}
+            f'{settings.get_tg_api_url()}/setWebhook', json={'url': settings.get_webhook_url}
         )
-        logger.info(f'Webhook: {settings.get_webhook_url()}')
+        logger.info(f'Webhook: {settings.get_webhook_url}')
         response_data = response.json()
         if response.status_code == status.HTTP_200_OK and response_data.get('ok'):
             logger.info(f'Webhook установлен: {response_data}')
-        else:
-            logger.error(f'Ошибка при установке вебхука: {response_data}')
+            return True
+        logger.error(f'Ошибка при установке вебхука: {response_data}')
     except Exception as e:
         logger.exception(f'Не удалось установить вебхук: {e}')
+    return False
+
+
+async def set_commands(client) -> bool:
+    """Устанавливает список команд бота."""
+    try:
+        response = await client.post(
+            f'{settings.get_tg_api_url()}/setMyCommands', data={'commands': json.dumps(BOT_COMMANDS)}
+        )
+        return response.status_code == status.HTTP_200_OK
+    except Exception as e:
+        logger.exception(f'Не удалось установить команды бота: {e}')
+        return False
 
 
 async def send_admin_msg(client, text):
-    """Отправляет сообщение администраторам."""
-    for admin in settings.ADMIN_IDS:
+    """Отправляет сообщение администраторам (параллельно)."""
+    async def send(admin):
         try:
             await client.post(
                 f'{settings.get_tg_api_url()}/sendMessage', json={'chat_id': admin, 'text': text, 'parse_mode': 'HTML'}
@@ -45,27 +95,74 @@ async def send_admin_msg(client, text):
         except Exception as e:
             logger.exception(f'Ошибка при отправке сообщения админу: {e}')
 
+    await asyncio.gather(*(send(admin) for admin in settings.ADMIN_IDS))
+
+
+async def with_timeout(coro, name: str):
+    """Выполняет сетевой вызов при старте с ограничением по времени."""
+    try:
+        return await asyncio.wait_for(coro, timeout=settings.STARTUP_CALL_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.error(f'{name}: превышено время ожидания {settings.STARTUP_CALL_TIMEOUT} с')
+        return False
+
+
+async def setup_bot(client) -> None:
+    """Настраивает вебхук и команды (если конфигурация изменилась) и оповещает админов."""
+    calls = [with_timeout(send_admin_msg(client, 'Бот запущен!'), 'sendMessage')]
+    webhook_changed = not webhook_is_current()
+    if webhook_changed:
+        calls += [with_timeout(set_webhook(client), 'setWebhook'), with_timeout(set_commands(client), 'setMyCommands')]
+    else:
+        logger.info('Конфигурация вебхука не изменилась, setWebhook и setMyCommands пропущены')
+
+    results = await asyncio.gather(*calls)
+    if webhook_changed and all(results[1:]):
+        save_webhook_state()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Контекстный менеджер для настройки и завершения работы бота."""
     async with http_client_manager.client() as client:  # Используем контекстный менеджер
         logger.info('Настройка бота...')
-        scheduler.start()
-        await set_webhook(client)
-        await client.post(
-            f'{settings.get_tg_api_url()}/setMyCommands',
-            data={'commands': json.dumps([{'command': 'start', 'description': 'Главное меню'}])},
+        broker = get_broker() if settings.REFERENCE_CACHE_CHANNEL else None
+        if broker is not None:
+            setup_invalidation_channel(broker)
+        # Независимые шаги старта выполняются параллельно
+        await asyncio.gather(
+            get_scheduler_leader().start(),
+            broker.start() if broker is not None else asyncio.sleep(0),
+            TableDAO.warm_up(),
+            TimeSlotDAO.warm_up(),
+            setup_bot(client),
         )
-        await send_admin_msg(client, 'Бот запущен!')
+        schedule_maintenance()
         yield
         logger.info('Завершение работы бота...')
-        await send_admin_msg(client, 'Бот остановлен!')
-        scheduler.shutdown()
+        await with_timeout(send_admin_msg(client, 'Бот остановлен!'), 'sendMessage')
+        await get_scheduler_leader().stop()
+        if settings.SQLITE_WRITE_QUEUE:
+            await get_write_queue().close()
+        if broker is not None:
+            await broker.close()
 
 
 app = FastAPI(lifespan=lifespan)
-app.mount('/static', StaticFiles(directory='app/static'), name='static')
+app.mount('/static', StaticFiles(directory='app/static', check_dir=False), name='static')
+
+# Кеширование ответов читающих эндпоинтов (ETag по версиям таблиц).
+# Добавляется до CORS: CORS-заголовки ставятся поверх кешированных ответов и 304 для каждого Origin.
+# Без канала инвалидации записи других воркеров видны в кеше не позже чем через RESPONSE_CACHE_TTL
+app.add_middleware(
+    ResponseCacheMiddleware,
+    rules=[
+        CacheRule(r'/booking/available-slots', ('bookings', 'tables', 'time_slots'), max_age=10),
+    ],
+    maxsize=settings.RESPONSE_CACHE_SIZE,
+    ttl=settings.RESPONSE_CACHE_TTL,
+    shared_versions=settings.REFERENCE_CACHE_CHANNEL,
+)
 
 # Добавляем middleware для CORS
 app.add_middleware(
@@ -76,6 +173,15 @@ app.add_middleware(
     allow_headers=['*'],  # Разрешаем все заголовки
 )
 
+# Профилирование запросов: по заголовку X-Profile (с X-Admin-Token) и случайная доля запросов
+app.add_middleware(
+    ProfilingMiddleware,
+    sample_rate=settings.PROFILING_SAMPLE_RATE,
+    interval=settings.PROFILING_INTERVAL_MS / 1000,
+)
+
 # Подключаем роутеры
 
 app.include_router(router_tg_bot)
+app.include_router(router_admin)
+app.include_router(router_bookings)
@@ -8,7 +8,7 @@ from alembic import context
 
 from app.db.database import Base
 from app.core.config import settings
-from app.db.models.models import User, Table, TimeSlot, Booking
+from app.db.models.models import User, Table, TimeSlot, Booking, BookingArchive, DailyOccupancy
 
 
 config = context.config
@@ -0,0 +1,45 @@
+"""Bookings archive and hot-path index
+
+Revision ID: 20261019100000
+Revises: 3565e62ba6f2
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261019100000'
+down_revision: Union[str, None] = '3565e62ba6f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # В PostgreSQL архив секционирован по месяцам; секции создаёт BookingDAO при переносе
+    op.create_table('bookings_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('table_id', sa.Integer(), nullable=False),
+    sa.Column('time_slot_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id', 'date'),
+    postgresql_partition_by='RANGE (date)',
+    )
+    op.create_index('ix_bookings_archive_user_id_date', 'bookings_archive', ['user_id', 'date'])
+    op.create_index('ix_bookings_date_time_slot_id_table_id', 'bookings', ['date', 'time_slot_id', 'table_id'])
+
+
+def downgrade() -> None:
+    # Возвращаем архивные брони в основную таблицу, чтобы не потерять историю
+    columns = 'id, user_id, table_id, time_slot_id, date, status, created_at, updated_at'
+    op.execute(f'INSERT INTO bookings ({columns}) SELECT {columns} FROM bookings_archive')
+    op.drop_index('ix_bookings_date_time_slot_id_table_id', table_name='bookings')
+    op.drop_index('ix_bookings_archive_user_id_date', table_name='bookings_archive')
+    op.drop_table('bookings_archive')
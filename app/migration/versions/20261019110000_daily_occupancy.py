@@ -0,0 +1,47 @@
+"""Daily occupancy summary
+
+Revision ID: 20261019110000
+Revises: 20261019100000
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261019110000'
+down_revision: Union[str, None] = '20261019100000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('daily_occupancy',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('time_slot_id', sa.Integer(), nullable=False),
+    sa.Column('tables_booked', sa.Integer(), nullable=False),
+    sa.Column('seats_booked', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['time_slot_id'], ['time_slots.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('date', 'time_slot_id', name='uq_daily_occupancy_date_time_slot_id')
+    )
+    # Первичное заполнение по текущим и архивным броням
+    op.execute(
+        'INSERT INTO daily_occupancy (date, time_slot_id, tables_booked, seats_booked) '
+        'SELECT b.date, b.time_slot_id, COUNT(*), SUM(t.capacity) '
+        'FROM (SELECT date, time_slot_id, table_id, status FROM bookings '
+        'UNION ALL SELECT date, time_slot_id, table_id, status FROM bookings_archive) AS b '
+        'JOIN tables AS t ON t.id = b.table_id '
+        "WHERE b.status IN ('booked', 'completed') "
+        'GROUP BY b.date, b.time_slot_id'
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('daily_occupancy')
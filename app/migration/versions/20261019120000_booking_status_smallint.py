@@ -0,0 +1,83 @@
+"""Booking status as smallint
+
+Revision ID: 20261019120000
+Revises: 20261019110000
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261019120000'
+down_revision: Union[str, None] = '20261019110000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Коды как в app.db.enums.BOOKING_STATUS_CODES (миграция не зависит от кода приложения)
+STATUS_CODES = {'booked': 1, 'completed': 2, 'canceled': 3}
+BATCH_SIZE = 10_000
+TABLES = ('bookings', 'bookings_archive')
+
+
+def check_values(table: str, column: str, mapping: dict) -> None:
+    """
+    Проверяет, что все значения column есть в mapping. Вызывается до изменения схемы.
+
+    Строки с неизвестным значением остались бы без нового значения, а NOT NULL на новой
+    колонке сорвал бы миграцию уже после заполнения остальных пакетов.
+    """
+    values = op.get_bind().execute(sa.text(f'SELECT DISTINCT {column} FROM {table}')).scalars().all()
+    unknown = sorted((value for value in values if value not in mapping), key=repr)
+    if unknown:
+        raise RuntimeError(
+            f'{table}.{column}: неизвестные значения {unknown!r}, ожидались {sorted(mapping, key=repr)!r}. '
+            f'Исправьте эти строки и повторите миграцию'
+        )
+
+
+def backfill(table: str, target: str, source: str, mapping: dict) -> None:
+    """
+    Заполняет колонку target значениями mapping по колонке source пакетами по BATCH_SIZE строк.
+
+    Каждый пакет коммитится отдельно (autocommit_block), поэтому блокировки строк короткие
+    и большая таблица не блокируется на всё время миграции. Пакеты выбираются только среди
+    строк с известным значением source, поэтому цикл конечен.
+    """
+    whens = ' '.join(f'WHEN {source} = {key!r} THEN {value!r}' for key, value in mapping.items())
+    known = ', '.join(repr(key) for key in mapping)
+    query = sa.text(
+        f'UPDATE {table} SET {target} = CASE {whens} END '
+        f'WHERE id IN (SELECT id FROM {table} WHERE {target} IS NULL AND {source} IN ({known}) LIMIT :batch_size)'
+    )
+    with op.get_context().autocommit_block():
+        while op.get_bind().execute(query, {'batch_size': BATCH_SIZE}).rowcount:
+            pass
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        check_values(table, 'status', STATUS_CODES)
+    for table in TABLES:
+        op.add_column(table, sa.Column('status_code', sa.SmallInteger(), nullable=True))
+        backfill(table, 'status_code', 'status', STATUS_CODES)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('status')
+            batch_op.alter_column('status_code', new_column_name='status', existing_type=sa.SmallInteger(), nullable=False)
+    op.create_index('ix_bookings_status_date', 'bookings', ['status', 'date'])
+
+
+def downgrade() -> None:
+    names = {code: name for name, code in STATUS_CODES.items()}
+    for table in TABLES:
+        check_values(table, 'status', names)
+    op.drop_index('ix_bookings_status_date', table_name='bookings')
+    for table in TABLES:
+        op.add_column(table, sa.Column('status_name', sa.String(), nullable=True))
+        backfill(table, 'status_name', 'status', names)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('status')
+            batch_op.alter_column('status_name', new_column_name='status', existing_type=sa.String(), nullable=False)
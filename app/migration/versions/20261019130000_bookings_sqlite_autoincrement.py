@@ -0,0 +1,52 @@
+"""Bookings ids are never reused on SQLite
+
+Revision ID: 20261019130000
+Revises: 20261019120000
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261019130000'
+down_revision: Union[str, None] = '20261019120000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+def upgrade() -> None:
+    # В PostgreSQL ID выдаёт последовательность и не повторяются
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    with op.batch_alter_table('bookings', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+        pass
+    # Счётчик AUTOINCREMENT начинается после максимального ID, в том числе уже перенесённого в архив
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'bookings'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'bookings', max(coalesce(("
+        "SELECT max(id) FROM bookings), 0), coalesce((SELECT max(id) FROM bookings_archive), 0))"
+    )
+    collisions = op.get_bind().execute(
+        sa.text('SELECT count(*) FROM bookings JOIN bookings_archive USING (id)')
+    ).scalar()
+    if collisions:
+        logger.warning(
+            f'{collisions} броней уже совпадают по ID с архивными: они будут задвоены в истории '
+            f'до переноса в архив или ручного исправления'
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    with op.batch_alter_table('bookings', recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+        pass
@@ -31,7 +31,9 @@ class BookingSlot(BaseModel):
     Модель для представления временного слота.
     """
 
+    time_slot_id: int = Field(description='ID временного слота', example=1)
     time: str = Field(description='Время слота в формате HH:MM', example='14:30')
+    free_tables: int = Field(description='Количество свободных столов в слоте', example=2)
     is_available: bool = Field(description='Доступен ли слот для бронирования', example=True)
 
 
@@ -44,8 +46,8 @@ class BookingWeek(BaseModel):
         description='Словарь с доступными слотами по дням недели',
         example={
             '2023-10-15': [
-                {'time': '14:00', 'is_available': True},
-                {'time': '14:30', 'is_available': False},
+                {'time_slot_id': 1, 'time': '14:00', 'free_tables': 2, 'is_available': True},
+                {'time_slot_id': 2, 'time': '16:00', 'free_tables': 0, 'is_available': False},
             ]
         },
     )
@@ -1,5 +1,6 @@
 from typing import Optional
 from pydantic import BaseModel, ConfigDict, Field
+from typing_extensions import NotRequired, TypedDict
 
 
 class TelegramIDModel(BaseModel):
@@ -28,3 +29,14 @@ class UserModel(TelegramIDModel):
     username: Optional[str] = Field(None, description='Имя пользователя', example='john_doe')
     first_name: Optional[str] = Field(None, description='Имя', example='John')
     last_name: Optional[str] = Field(None, description='Фамилия', example='Doe')
+
+
+class UserValues(TypedDict):
+    """
+    Значения нового пользователя для UserDAO.add без создания модели (см. app.schemas.validation).
+    """
+
+    telegram_id: int
+    username: NotRequired[Optional[str]]
+    first_name: NotRequired[Optional[str]]
+    last_name: NotRequired[Optional[str]]
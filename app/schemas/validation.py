@@ -0,0 +1,27 @@
+from functools import cache
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+
+
+@cache
+def get_adapter(schema: Any) -> TypeAdapter:
+    """TypeAdapter схемы: сборка валидатора дорогая, поэтому он создаётся один раз на схему."""
+    return TypeAdapter(schema)
+
+
+def validate(schema: Any, data: Any) -> dict:
+    """
+    Проверяет внешние данные (апдейт Telegram, тело запроса) по схеме и возвращает словарь для DAO.
+
+    Для TypedDict-схем модель не создаётся: валидатор сразу возвращает словарь с заданными полями.
+    Для Pydantic моделей возвращаются только заданные поля (exclude_unset), как в BaseDAO.
+
+    :param schema: TypedDict или Pydantic модель.
+    :param data: Данные для проверки.
+    :return: Проверенные значения.
+    """
+    value = get_adapter(schema).validate_python(data)
+    if isinstance(value, BaseModel):
+        return value.model_dump(exclude_unset=True)
+    return value
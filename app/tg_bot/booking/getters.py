@@ -1,12 +1,14 @@
 from aiogram_dialog import DialogManager
 
+from app.db.serializers import to_dicts
+
 
 async def get_all_tables(dialog_manager: DialogManager, **kwargs):
     """Получение списка столов с учётом выбранной вместимости."""
     tables = dialog_manager.dialog_data['tables']
     capacity = dialog_manager.dialog_data['capacity']
     return {
-        'tables': [table.to_dict() for table in tables],
+        'tables': to_dicts(tables),
         'text_table': f'Всего для {capacity} человек найдено {len(tables)}столов. Выберите нужный по описанию'
     }
 
@@ -19,7 +21,7 @@ async def get_all_available_slots(dialog_manager: DialogManager, **kwargs):
         f'Для стола {selected_table.id} найдено {len(slots)} '
         f'{"свободных слотов" if len(slots) != 1 else "свободный слот"} '
     )
-    return {'slots': [slot.to_dict() for slot in slots], 'text_slots': text_slots}
+    return {'slots': to_dicts(slots), 'text_slots': text_slots}
 
 
 async def get_confirmed_data(dialog_manager: DialogManager, **kwargs):
@@ -1,6 +1,8 @@
 from datetime import date
 from pydantic import BaseModel
 
+from app.db.enums import BookingStatus
+
 
 class SCapacity(BaseModel):
     capacity: int
@@ -11,4 +13,4 @@ class SNewBooking(BaseModel):
     table_id: int
     time_slot_id: int
     date: date
-    status: str
\ No newline at end of file
+    status: BookingStatus
\ No newline at end of file
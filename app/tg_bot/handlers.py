@@ -2,25 +2,25 @@ from httpx import AsyncClient
 
 from app.dao.users_dao import UserDAO
 from app.dao.bookings_dao import BookingDAO
-from app.schemas.users_schemas import UserModel
-from app.schemas.specializations_schemas import TelegramIDModel
+from app.db.writer import run_write
+from app.schemas.users_schemas import UserValues
+from app.schemas.validation import validate
 from app.tg_bot.kbs import back_kb, main_kb, generate_kb_profile
 from app.tg_bot.methods import call_answer, bot_send_message, \
     get_about_text, get_booking_text, get_greeting_text
-from app.tg_bot.utils import format_appointment
+from app.tg_bot.utils import format_booking
 
 async def cmd_start(client: AsyncClient, session, user_info):
-    user_id_db = await UserDAO.find_one_or_none(
-        session=session, filters=TelegramIDModel(telegram_id=user_info['id']))
+    user_id_db = await UserDAO.get_user_id(session=session, telegram_id=user_info['id'])
 
     if not user_id_db:
-        values = UserModel(
-            telegram_id=user_info['id'],
-            username=user_info.get('username'),
-            first_name=user_info.get('first_name'),
-            last_name=user_info.get('last_name'),
-        )
-        await UserDAO.add(session=session, values=values)
+        values = validate(UserValues, {
+            'telegram_id': user_info['id'],
+            'username': user_info.get('username'),
+            'first_name': user_info.get('first_name'),
+            'last_name': user_info.get('last_name'),
+        })
+        await run_write(session, lambda write_session: UserDAO.add(session=write_session, values=values))
 
     greeting_message = get_greeting_text(user_info.get('first_name'))
     await bot_send_message(client, user_info['id'], greeting_message, main_kb)
@@ -40,20 +40,26 @@ async def handler_about_us(client: AsyncClient, callback_query_id: int, chat_id:
 async def handler_my_appointments(
         client: AsyncClient, callback_query_id: int, chat_id: int, session):
     await call_answer(client, callback_query_id, 'Ваши записи к врачам')
-    db_user_id = await UserDAO.get_user_id(session=session, telegram_id=chat_id)
-    appointment_count = await BookingDAO.count_user_booking(session=session, user_id=db_user_id)
+    # Количество броней и ID пользователя — одним запросом по telegram_id
+    summary = await BookingDAO.get_user_summary(session=session, telegram_id=chat_id, limit=0)
+    appointment_count = summary.active_count if summary else 0
     message_text = get_booking_text(appointment_count)
-    keyboard = generate_kb_profile(db_user_id, appointment_count)
+    keyboard = generate_kb_profile(summary.user_id if summary else None, appointment_count)
     await bot_send_message(client, chat_id, message_text, kb=keyboard)
 
 
-async def handler_my_appointments_all(
-    client: AsyncClient, callback_query_id: int, chat_id: int, user_db_id: int, session
-        ):
+async def handler_my_appointments_all(client: AsyncClient, callback_query_id: int, chat_id: int, session):
     await call_answer(client, callback_query_id, 'Ваши записи к врачам (подробно)')
-    appointments = await BookingDAO.get_user_bookings_with_doctor_info(session=session, user_id=user_db_id)
+    # Брони ищутся по telegram_id из апдейта, а не по ID из callback_data: чужие брони не показываются
+    summary = await BookingDAO.get_user_summary(session=session, telegram_id=chat_id)
+    upcoming = summary.upcoming if summary else []
 
-    for appointment in appointments:
-        await bot_send_message(client, chat_id, format_appointment(appointment))
+    for booking in upcoming:
+        await bot_send_message(client, chat_id, format_booking(booking))
 
-    await bot_send_message(client, chat_id, 'Это все ваши текущие записи.', main_kb)
+    if summary and summary.active_count > len(upcoming):
+        await bot_send_message(
+            client, chat_id, f'Показаны ближайшие {len(upcoming)} из {summary.active_count} броней.', main_kb
+        )
+    else:
+        await bot_send_message(client, chat_id, 'Это все ваши текущие записи.', main_kb)
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from app.core.config import settings
 
 main_kb = [
@@ -12,6 +14,8 @@ back_kb = [
 ]
 
 
+# Клавиатура кешируется, чтобы повторно не кодировать её при отправке (см. payloads.encode_markup)
+@lru_cache(maxsize=1024)
 def generate_kb_profile(user_db_id: int, count_booking: int):
     kb_profile = [
         [{'text': '🏠 Главное меню', 'callback_data': 'home'}],
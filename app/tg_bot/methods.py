@@ -1,21 +1,22 @@
+from functools import cache, lru_cache
+
 from httpx import AsyncClient
-from app.core.config import settings
+from app.tg_bot.payloads import JSON_HEADERS, answer_callback_payload, api_url, send_message_payload
 from app.tg_bot.utils import pluralize_appointments
 
 
 async def bot_send_message(client: AsyncClient, chat_id: int, text: str, kb: list | None = None):
-    send_data = {'chat_id': chat_id, 'text': text, 'parse_mode': 'HTML'}
-    if kb:
-        send_data['reply_markup'] = {'inline_keyboard': kb}
-    await client.post(f"{settings.get_tg_api_url()}/sendMessage", json=send_data)
+    await client.post(api_url('sendMessage'), content=send_message_payload(chat_id, text, kb), headers=JSON_HEADERS)
 
 
 async def call_answer(client: AsyncClient, callback_query_id: int, text: str):
     await client.post(
-        f"{settings.get_tg_api_url()}/answerCallbackQuery", json={"callback_query_id": callback_query_id, "text": text}
+        api_url('answerCallbackQuery'), content=answer_callback_payload(callback_query_id, text), headers=JSON_HEADERS
     )
 
 
+# Тексты кешируются: одинаковые строки дают попадание в кеш закодированных сообщений
+@lru_cache(maxsize=1024)
 def get_greeting_text(first_name: str):
     return f"""
             🏥 <b>Добро пожаловать в бот клиники "ЗдоровьеПлюс"!</b>
@@ -34,6 +35,7 @@ def get_greeting_text(first_name: str):
             """
 
 
+@cache
 def get_about_text():
     return """
         🏥 <b>Добро пожаловать в клинику "ЗдоровьеПлюс"!</b>
@@ -63,6 +65,7 @@ def get_about_text():
         """
 
 
+@lru_cache(maxsize=128)
 def get_booking_text(appointment_count):
     if appointment_count > 0:
         message_text = f"""
@@ -0,0 +1,99 @@
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict
+
+import orjson
+
+from app.core.config import settings
+
+
+# Заголовки для запросов с заранее закодированным телом
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Размер кеша закодированных клавиатур и хвостов сообщений
+PAYLOAD_CACHE_SIZE = 1024
+
+# id(клавиатуры) -> (клавиатура, JSON reply_markup). Ссылка на клавиатуру
+# держится в записи, поэтому id не может быть переиспользован, пока запись в кеше.
+_markup_cache: OrderedDict[int, tuple[list, bytes]] = OrderedDict()
+
+
+@lru_cache(maxsize=32)
+def api_url(method: str) -> str:
+    """Возвращает URL метода Bot API."""
+    return f'{settings.get_tg_api_url()}/{method}'
+
+
+def encode_markup(kb: list) -> bytes:
+    """
+    Возвращает reply_markup клавиатуры в виде JSON.
+
+    Клавиатура кодируется один раз и дальше находится по идентичности объекта,
+    поэтому клавиатуры, переданные сюда, нельзя изменять после первой отправки.
+
+    :param kb: Inline-клавиатура (список рядов кнопок).
+    """
+    item = _markup_cache.get(id(kb))
+    if item is not None and item[0] is kb:
+        _markup_cache.move_to_end(id(kb))
+        return item[1]
+    markup = orjson.dumps({'inline_keyboard': kb})
+    _markup_cache[id(kb)] = (kb, markup)
+    while len(_markup_cache) > PAYLOAD_CACHE_SIZE:
+        _markup_cache.popitem(last=False)
+    return markup
+
+
+@lru_cache(maxsize=PAYLOAD_CACHE_SIZE)
+def _message_tail(text: str, markup: bytes | None) -> bytes:
+    """Кодирует всё тело sendMessage, кроме chat_id: '"text":...}'."""
+    data: Dict[str, Any] = {'text': text, 'parse_mode': 'HTML'}
+    if markup is not None:
+        data['reply_markup'] = orjson.Fragment(markup)
+    return orjson.dumps(data)[1:]
+
+
+@lru_cache(maxsize=PAYLOAD_CACHE_SIZE)
+def _answer_tail(text: str) -> bytes:
+    """Кодирует тело answerCallbackQuery, кроме callback_query_id."""
+    return orjson.dumps({'text': text})[1:]
+
+
+def send_message_payload(chat_id: int, text: str, kb: list | None = None) -> bytes:
+    """
+    Собирает тело запроса sendMessage.
+
+    Текст и клавиатура кодируются один раз и кешируются, на каждый вызов
+    остаётся только подстановка chat_id в готовые байты.
+
+    :param chat_id: ID чата получателя.
+    :param text: Текст сообщения (HTML).
+    :param kb: Inline-клавиатура или None.
+    """
+    tail = _message_tail(text, encode_markup(kb) if kb else None)
+    return b'{"chat_id":' + orjson.dumps(chat_id) + b',' + tail
+
+
+def answer_callback_payload(callback_query_id: int | str, text: str) -> bytes:
+    """
+    Собирает тело запроса answerCallbackQuery.
+
+    :param callback_query_id: ID callback-запроса.
+    :param text: Текст уведомления.
+    """
+    return b'{"callback_query_id":' + orjson.dumps(callback_query_id) + b',' + _answer_tail(text)
+
+
+def payload_cache_stats() -> dict[str, int]:
+    """Возвращает размеры и попадания кешей закодированных фрагментов."""
+    message = _message_tail.cache_info()
+    answer = _answer_tail.cache_info()
+    return {
+        'markups': len(_markup_cache),
+        'messages': message.currsize,
+        'message_hits': message.hits,
+        'message_misses': message.misses,
+        'answers': answer.currsize,
+        'answer_hits': answer.hits,
+        'answer_misses': answer.misses,
+    }
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Request, Depends
+from fastapi import APIRouter, Request, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.async_client import http_client_manager
+from app.core.config import settings
 from app.db.session_maker_fast_api import db_session
 from app.tg_bot.handlers import (
     cmd_start, handler_my_appointments, handler_about_us, handler_back_home,
     handler_my_appointments_all,
     )
+from app.tg_bot.webhook_reply import WebhookReply
 
 
 router = APIRouter(tags=['Webhook'])
@@ -14,7 +16,10 @@ router = APIRouter(tags=['Webhook'])
 @router.post('/webhook')
 async def webhook(request: Request, session: AsyncSession = Depends(db_session.get_session)):
     data = await request.json()  # Получаем данные от Telegram
-    async with http_client_manager.client() as client:
+    async with http_client_manager.client() as http_client:
+        # Первый вызов Bot API можно вернуть прямо в ответе на вебхук
+        reply = WebhookReply(http_client) if settings.WEBHOOK_INLINE_REPLY else None
+        client = reply or http_client
         if 'message' in data and 'text' in data['message']:
             if data['message']['text'] == '/start':
                 user_info = data['message']['from']  # Извлекаем данные пользователя
@@ -27,11 +32,7 @@ async def webhook(request: Request, session: AsyncSession = Depends(db_session.g
 
             if callback_data.startswith('my_booking_'):
                 await handler_my_appointments_all(
-                    client=client,
-                    callback_query_id=callback_query_id,
-                    chat_id=chat_id,
-                    session=session,
-                    user_db_id=int(callback_data.replace('my_booking_', '')),
+                    client=client, callback_query_id=callback_query_id, chat_id=chat_id, session=session
                 )
             else:
                 if callback_data == 'booking':
@@ -42,4 +43,6 @@ async def webhook(request: Request, session: AsyncSession = Depends(db_session.g
                     await handler_about_us(client=client, callback_query_id=callback_query_id, chat_id=chat_id)
                 elif callback_data == 'home':
                     await handler_back_home(client=client, callback_query_id=callback_query_id, chat_id=chat_id)
+        if reply is not None and reply.payload is not None:
+            return Response(content=reply.payload, media_type='application/json')
         return {'ok': True}
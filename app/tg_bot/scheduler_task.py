@@ -2,7 +2,7 @@ from datetime import datetime
 from loguru import logger
 
 from app.async_client import http_client_manager
-from app.core.config import scheduler
+from app.core.config import get_scheduler
 from app.tg_bot.methods import bot_send_message
 from app.tg_bot.utils import format_appointment
 
@@ -31,7 +31,7 @@ async def schedule_appointment_notification(
 
     job_id = f'notification_{user_tg_id}_{appointment["id"]}_{reminder_label}'
 
-    scheduler.add_job(
+    get_scheduler().add_job(
         send_user_noti,  # Функция, которая будет выполнена
         'date',  # Тип триггера (в данном случае одноразовая задача)
         run_date=notification_time,  # Время выполнения задачи
@@ -39,3 +39,19 @@ def format_appointment(appointment, start_text='🗓 <b>Запись на при
 
             Пожалуйста, приходите за 10-15 минут до назначенного времени.
             """
+
+
+def format_booking(booking, start_text='🗓 <b>Бронь столика</b>'):
+    """Текст брони из сводки BookingDAO.get_user_summary."""
+    table_text = f'№{booking.table_id}, мест: {booking.capacity}'
+    if booking.description:
+        table_text += f' ({booking.description})'
+    return f"""
+            {start_text}
+
+            📅 Дата: {booking.date.strftime('%d.%m.%Y')}
+            🕒 Время: {booking.start_time.strftime('%H:%M')}-{booking.end_time.strftime('%H:%M')}
+            🍽 Стол: {table_text}
+
+            ℹ️ Номер брони: {booking.id}
+            """
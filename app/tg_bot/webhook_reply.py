@@ -0,0 +1,61 @@
+import httpx
+import orjson
+
+from app.tg_bot.payloads import JSON_HEADERS
+
+
+# Методы, порядок которых относительно сообщений в чате не важен
+ORDER_INSENSITIVE_METHODS = {'answerCallbackQuery', 'sendChatAction'}
+
+
+class WebhookReply:
+    """
+    Обёртка над httpx.AsyncClient для обработчиков вебхука.
+
+    Telegram позволяет вернуть один вызов Bot API прямо в теле ответа на вебхук.
+    Обёртка откладывает один JSON-вызов (json= или готовое тело content= с заголовками
+    JSON_HEADERS) и отдаёт его в ответе, остальные вызовы
+    уходят через обычный клиент. Чтобы не нарушить порядок сообщений, отложенный
+    sendMessage отправляется сразу, как только появляется следующий вызов,
+    а answerCallbackQuery остаётся отложенным до конца обработки.
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        self._client = client
+        self._held: tuple[str, str, bytes] | None = None
+
+    async def post(
+        self, url: str, *, json: dict | None = None, content: bytes | None = None, **kwargs
+    ) -> httpx.Response:
+        if json is not None and content is None and not kwargs:
+            body = orjson.dumps(json)
+        elif content is not None and json is None and kwargs == {'headers': JSON_HEADERS}:
+            body = content
+        else:
+            return await self._client.post(url, json=json, content=content, **kwargs)
+
+        if len(body) < 3:
+            # Пустой объект нельзя дополнить полем method
+            return await self._client.post(url, content=body, headers=JSON_HEADERS)
+
+        if self._held is not None:
+            held_method, _, _ = self._held
+            if held_method in ORDER_INSENSITIVE_METHODS:
+                return await self._client.post(url, content=body, headers=JSON_HEADERS)
+            await self._flush()
+
+        self._held = (url.rsplit('/', 1)[-1], url, body)
+        return httpx.Response(200, json={'ok': True, 'result': True})
+
+    async def _flush(self) -> None:
+        _, url, body = self._held
+        self._held = None
+        await self._client.post(url, content=body, headers=JSON_HEADERS)
+
+    @property
+    def payload(self) -> bytes | None:
+        """Тело ответа вебхука (JSON) с отложенным вызовом или None, если вызова нет."""
+        if self._held is None:
+            return None
+        method, _, body = self._held
+        return b'{"method":' + orjson.dumps(method) + b',' + body[1:]
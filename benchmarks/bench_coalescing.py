@@ -0,0 +1,122 @@
+"""
+Бенчмарк объединения одинаковых конкурентных чтений DAO (app.dao.coalescing).
+
+Моделирует наплыв «в 19:00»: --callers корутин одновременно, каждая в своей сессии, запрашивают
+одно и то же (свободные слоты стола на дату и холодную сетку доступности на неделю).
+Каждый из --bursts наплывов выполняется с DAO_SINGLE_FLIGHT выключенным и включённым;
+печатаются время наплыва (медиана), SQL-запросов на наплыв и доля объединённых вызовов.
+
+Запуск (нужен .env, как для приложения; DATABASE_URL подменяется):
+    python -m benchmarks.bench_coalescing
+    python -m benchmarks.bench_coalescing --callers 200 --bursts 20
+"""
+
+import argparse
+import asyncio
+from datetime import date
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, List, NamedTuple
+
+from benchmarks.seed_data import SeedConfig, seed
+
+
+SEED_CONFIG = SeedConfig(users=5_000, tables=50, days=90)
+
+
+class Case(NamedTuple):
+    """
+    Запрос наплыва.
+
+    :param name: Имя запроса (метод DAO).
+    :param call: Выполняет запрос в переданной сессии.
+    :param setup: Подготовка перед наплывом (сброс кешей), опционально.
+    """
+
+    name: str
+    call: Callable
+    setup: Callable[[], None] | None = None
+
+
+def build_cases() -> List[Case]:
+    from app.dao.bookings_dao import BookingDAO, availability_cache
+
+    day = date.today()
+    return [
+        Case('get_available_time_slots', lambda s: BookingDAO.get_available_time_slots(s, table_id=1, booking_date=day)),
+        Case('get_availability_grid[7d, cold]', lambda s: BookingDAO.get_availability_grid(s, day, days=7),
+             setup=availability_cache.clear),
+        Case('get_occupancy[7d]', lambda s: BookingDAO.get_occupancy(s, day, days=7)),
+    ]
+
+
+async def burst(case: Case, callers: int) -> float:
+    """Время одного наплыва: callers одинаковых вызовов, каждый в своей сессии."""
+    from app.db.database import async_session_maker
+
+    async def caller():
+        async with async_session_maker() as session:
+            await case.call(session)
+
+    if case.setup is not None:
+        case.setup()
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(callers)))
+    return time.perf_counter() - start
+
+
+async def run(args) -> None:
+    from sqlalchemy import event
+
+    from app.core.config import settings
+    from app.dao.coalescing import flights
+    from app.dao.tables_dao import TableDAO
+    from app.dao.time_slots_dao import TimeSlotDAO
+    from app.db.database import engine
+
+    queries = 0
+
+    def count_query(*_):
+        nonlocal queries
+        queries += 1
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', count_query)
+    # Справочники загружаются вне замера
+    await TableDAO.warm_up()
+    await TimeSlotDAO.warm_up()
+
+    print(f'{args.callers} одновременных вызовов, {args.bursts} наплывов, медиана')
+    print(f'{"запрос":<32} {"режим":<6} {"наплыв, ms":>11} {"SQL/наплыв":>11} {"объединено":>11}')
+    for case in build_cases():
+        for enabled in (False, True):
+            settings.DAO_SINGLE_FLIGHT = enabled
+            await burst(case, args.callers)  # Прогрев: компиляция и пул соединений
+            flights.reset_stats()
+            queries = 0
+            timings = [await burst(case, args.callers) for _ in range(args.bursts)]
+            print(f'{case.name:<32} {"вкл" if enabled else "выкл":<6} {statistics.median(timings) * 1000:11.1f} '
+                  f'{queries / args.bursts:11.1f} {flights.stats()["coalescing_ratio"]:11.1%}')
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--callers', type=int, default=50, help='Одновременных вызовов в наплыве')
+    parser.add_argument('--bursts', type=int, default=10, help='Наплывов на режим')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'coalescing.sqlite3')
+        # До импорта приложения: движок БД создаётся при импорте по DATABASE_URL
+        os.environ['DATABASE_URL'] = f'sqlite+aiosqlite:///{path}'
+        seed(f'sqlite:///{path}', SEED_CONFIG)
+
+        from loguru import logger
+        logger.remove()
+        asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
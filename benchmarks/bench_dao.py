@@ -0,0 +1,324 @@
+"""
+Бенчмарк слоя данных: методы BaseDAO и BookingDAO на SQLite разного масштаба.
+
+Для каждого масштаба (--scales) генератор benchmarks.seed_data заполняет временную БД,
+после чего в отдельном процессе (свой DATABASE_URL и свои кеши) каждый сценарий выполняется
+--repeat раз в новой сессии; в отчёт идёт медиана. Пишущие сценарии откатываются,
+complete_past_bookings после замера возвращает статусы, так что повторы идут по одним данным.
+Логи DAO форматируются, но не выводятся (--log-level задаёт уровень, как в продакшене).
+
+Результаты сравниваются с базовой линией benchmarks/baselines/dao.json: прогон падает
+(код 1), если медиана сценария выросла больше чем на --tolerance и больше чем на --min-delta-ms,
+а также если для сценария нет базовой линии: новый сценарий добавляется вместе с её обновлением.
+Базовая линия зависит от машины — после смены железа её нужно перезаписать:
+    python -m benchmarks.bench_dao --update-baseline
+
+Запуск (нужен .env, как для приложения; DATABASE_URL подменяется):
+    python -m benchmarks.bench_dao
+    python -m benchmarks.bench_dao --scales small,medium --repeat 7 --tolerance 0.3
+"""
+
+import argparse
+import asyncio
+from datetime import date, datetime, timedelta
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List, NamedTuple
+
+from benchmarks.seed_data import TELEGRAM_ID_BASE, SeedConfig, seed
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines', 'dao.json')
+
+SCALES = {
+    'small': SeedConfig(users=1_000, tables=20, days=60),
+    'medium': SeedConfig(users=20_000, tables=100, days=180),
+    'large': SeedConfig(users=100_000, tables=200, days=365),
+}
+
+
+class Case(NamedTuple):
+    """
+    Сценарий бенчмарка.
+
+    :param name: Имя сценария (ключ в базовой линии).
+    :param run: Замеряемый вызов DAO: run(session, context).
+    :param setup: Подготовка вне замера, возвращает context.
+    :param teardown: Восстановление данных вне замера.
+    """
+
+    name: str
+    run: Callable[..., Awaitable]
+    setup: Callable[..., Awaitable] | None = None
+    teardown: Callable[..., Awaitable] | None = None
+
+
+def build_cases(config: SeedConfig, booking_count: int) -> List[Case]:
+    from datetime import date as date_type
+    from typing import Optional
+
+    from pydantic import BaseModel
+    from sqlalchemy import select, update
+
+    from app.dao.bookings_dao import BookingDAO, availability_cache
+    from app.dao.users_dao import UserDAO, user_id_cache
+    from app.db.models.models import Booking
+    from app.schemas.users_schemas import UserModel
+
+    class BookingFilter(BaseModel):
+        user_id: int | None = None
+        status: str | None = None
+
+    class BookingValues(BaseModel):
+        id: int | None = None
+        user_id: int | None = None
+        table_id: int | None = None
+        time_slot_id: int | None = None
+        date: Optional[date_type] = None
+        status: str | None = None
+
+    rng = random.Random(0)
+    today = date.today()
+    user_id = rng.randrange(1, config.users + 1)
+    page_size = 50
+
+    def ids(count: int) -> List[int]:
+        return rng.sample(range(1, booking_count + 1), min(count, booking_count))
+
+    new_bookings = [
+        BookingValues(user_id=rng.randrange(1, config.users + 1), table_id=rng.randrange(1, config.tables + 1),
+                      time_slot_id=rng.randrange(1, 7), date=today + timedelta(days=400 + i % 30), status='booked')
+        for i in range(1000)
+    ]
+    status_updates = [BookingValues(id=booking_id, status='canceled') for booking_id in ids(1000)]
+    ids_10, ids_1k, ids_10k = ids(10), ids(1000), ids(10_000)
+    upsert_values = UserModel(telegram_id=TELEGRAM_ID_BASE + user_id, username='bench', first_name='Bench')
+
+    async def rollback(session, context):
+        await session.rollback()
+
+    async def clear_availability_cache(session):
+        availability_cache.clear()
+
+    async def past_booked_ids(session):
+        now = datetime.now()
+        result = await session.execute(
+            select(Booking.id).where(Booking.status == 'booked', Booking.date < now.date())
+        )
+        return result.scalars().all()
+
+    async def restore_booked(session, booking_ids):
+        for start in range(0, len(booking_ids), 10_000):
+            chunk = booking_ids[start:start + 10_000]
+            await session.execute(update(Booking).where(Booking.id.in_(chunk)).values(status='booked'))
+        await session.commit()
+
+    async def clear_user_cache(session):
+        user_id_cache.clear()
+
+    return [
+        Case('find_all[user_id]', lambda s, c: BookingDAO.find_all(s, BookingFilter(user_id=user_id))),
+        Case('find_all[status=canceled]', lambda s, c: BookingDAO.find_all(s, BookingFilter(status='canceled'))),
+        Case('find_one_or_none_by_id', lambda s, c: BookingDAO.find_one_or_none_by_id(ids_10[0], s)),
+        Case('find_all[user_id, date>=, top 10]', lambda s, c: BookingDAO.find_all(
+            s, {'user_id': user_id, 'date__gte': today, 'status__in': ['booked', 'completed']},
+            order_by=['date', 'time_slot_id'], limit=10)),
+        Case('count[status=booked]', lambda s, c: BookingDAO.count(s, BookingFilter(status='booked'))),
+        Case('paginate[page=1]', lambda s, c: BookingDAO.paginate(s, page=1, page_size=page_size)),
+        Case('paginate[last page]', lambda s, c: BookingDAO.paginate(
+            s, page=max(1, booking_count // page_size), page_size=page_size)),
+        Case('find_by_ids[10]', lambda s, c: BookingDAO.find_by_ids(s, ids_10)),
+        Case('find_by_ids[1k]', lambda s, c: BookingDAO.find_by_ids(s, ids_1k)),
+        Case('find_by_ids[10k]', lambda s, c: BookingDAO.find_by_ids(s, ids_10k)),
+        Case('add_many[1k]', lambda s, c: BookingDAO.add_many(s, new_bookings), teardown=rollback),
+        Case('bulk_update[1k]', lambda s, c: BookingDAO.bulk_update(s, status_updates), teardown=rollback),
+        Case('upsert[existing user]', lambda s, c: UserDAO.upsert(s, ['telegram_id'], upsert_values),
+             teardown=rollback),
+        Case('get_user_id[cold]', lambda s, c: UserDAO.get_user_id(s, TELEGRAM_ID_BASE + user_id),
+             setup=clear_user_cache),
+        Case('check_available_bookings', lambda s, c: BookingDAO.check_available_bookings(
+            s, table_id=1, booking_date=today, time_slot_id=1)),
+        Case('get_available_time_slots', lambda s, c: BookingDAO.get_available_time_slots(
+            s, table_id=1, booking_date=today)),
+        Case('get_availability_grid[7d, cold]', lambda s, c: BookingDAO.get_availability_grid(s, today, days=7),
+             setup=clear_availability_cache),
+        Case('get_bookings_with_details', lambda s, c: BookingDAO.get_bookings_with_details(s, user_id)),
+        Case('get_bookings_with_details[selectin]', lambda s, c: BookingDAO.get_bookings_with_details(
+            s, user_id, profile='details_selectin')),
+        Case('find_all[user_id, 3 columns]', lambda s, c: BookingDAO.find_all(
+            s, {'user_id': user_id}, columns=['id', 'date', 'status'])),
+        Case('cancel_booking', lambda s, c: BookingDAO.cancel_booking(s, ids_10[1]), teardown=rollback),
+        Case('complete_past_bookings', lambda s, c: BookingDAO.complete_past_bookings(s),
+             setup=past_booked_ids, teardown=restore_booked),
+        Case('book_count', lambda s, c: BookingDAO.book_count(s)),
+    ]
+
+
+async def run_cases(config: SeedConfig, booking_count: int, repeat: int) -> Dict[str, float | None]:
+    from loguru import logger
+
+    from app.db.database import async_session_maker, engine
+
+    results: Dict[str, float | None] = {}
+    for case in build_cases(config, booking_count):
+        timings = []
+        try:
+            # Первый прогон — прогрев (соединение, кеши справочников, компиляция запросов)
+            for _ in range(repeat + 1):
+                async with async_session_maker() as session:
+                    context = await case.setup(session) if case.setup else None
+                    start = time.perf_counter()
+                    await case.run(session, context)
+                    timings.append(time.perf_counter() - start)
+                    if case.teardown:
+                        await case.teardown(session, context)
+            results[case.name] = statistics.median(timings[1:]) * 1000
+        except Exception as e:
+            logger.opt(exception=e).critical(f'Сценарий {case.name} завершился ошибкой')
+            results[case.name] = None
+    await engine.dispose()
+    return results
+
+
+def run_worker(scale: str, repeat: int, log_level: str) -> None:
+    """Выполняется в дочернем процессе: DATABASE_URL уже указывает на заполненную БД."""
+    from loguru import logger
+
+    import app.db.models.models  # noqa: F401
+    logger.remove()
+    logger.add(lambda message: None, level=log_level)
+    logger.add(sys.stderr, level='CRITICAL')
+
+    import sqlite3
+    from sqlalchemy import make_url
+    from app.core.config import settings
+    path = make_url(settings.get_database_url).database
+    booking_count = sqlite3.connect(path).execute('SELECT COUNT(*) FROM bookings').fetchone()[0]
+
+    results = asyncio.run(run_cases(SCALES[scale], booking_count, repeat))
+    print(json.dumps({'bookings': booking_count, 'results': results}))
+
+
+def run_scale(scale: str, args, tmp: str) -> dict:
+    path = os.path.join(tmp, f'{scale}.sqlite3')
+    started = time.perf_counter()
+    seed(f'sqlite:///{path}', SCALES[scale])
+    print(f'\n[{scale}] БД заполнена за {time.perf_counter() - started:.1f} с', flush=True)
+    env = {
+        **os.environ,
+        'DATABASE_URL': f'sqlite+aiosqlite:///{path}',
+        'STORE_URL': f'sqlite:///{os.path.join(tmp, "jobs.sqlite")}',
+        'REFERENCE_CACHE_CHANNEL': '0',
+    }
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_dao', '--worker', scale,
+         '--repeat', str(args.repeat), '--log-level', args.log_level],
+        env=env, capture_output=True, text=True,
+    )
+    if output.returncode != 0:
+        sys.stderr.write(output.stderr)
+        raise SystemExit(f'[{scale}] процесс бенчмарка завершился с кодом {output.returncode}')
+    sys.stderr.write(output.stderr)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def compare(scale: str, results: Dict[str, float | None], baseline: Dict[str, float | None],
+            tolerance: float, min_delta_ms: float) -> List[str]:
+    """Печатает таблицу сравнения и возвращает список регрессий."""
+    regressions = []
+    print(f'{"сценарий":<34} {"база, ms":>10} {"сейчас, ms":>11} {"изм.":>8}')
+    for name, current in results.items():
+        base = baseline.get(name)
+        if current is None:
+            status, delta = 'ОШИБКА', ''
+            regressions.append(f'{scale}/{name}: ошибка выполнения')
+        elif base is None:
+            # Без базовой линии сценарий ничего не проверяет: её нужно записать вместе со сценарием
+            status, delta = 'НЕТ БАЗЫ', ''
+            regressions.append(f'{scale}/{name}: нет базовой линии (запишите --update-baseline)')
+        else:
+            change = current / base - 1 if base else 0.0
+            delta = f'{change:+.0%}'
+            if change > tolerance and current - base > min_delta_ms:
+                status = 'РЕГРЕССИЯ'
+                regressions.append(f'{scale}/{name}: {base:.2f} -> {current:.2f} ms ({delta})')
+            else:
+                status = 'ok'
+        base_text = f'{base:10.2f}' if base is not None else f'{"-":>10}'
+        current_text = f'{current:11.2f}' if current is not None else f'{"-":>11}'
+        print(f'{name:<34} {base_text} {current_text} {delta:>8}  {status}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', default=','.join(SCALES), help=f'Масштабы через запятую: {", ".join(SCALES)}')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=0.5, help='Допустимый рост медианы (0.5 = +50%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help='Игнорировать рост меньше этого, ms')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help='Перезаписать базовую линию')
+    parser.add_argument('--log-level', default='INFO', help='Уровень логов DAO (форматируются, но не выводятся)')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.repeat, args.log_level)
+        return
+
+    scales = [scale.strip() for scale in args.scales.split(',')]
+    unknown = set(scales) - set(SCALES)
+    if unknown:
+        parser.error(f'Неизвестные масштабы: {", ".join(sorted(unknown))}')
+
+    try:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    except FileNotFoundError:
+        baseline = {'scales': {}}
+
+    regressions = []
+    runs = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            run = run_scale(scale, args, tmp)
+            runs[scale] = run
+            print(f'[{scale}] бронирований: {run["bookings"]}, медиана из {args.repeat}')
+            regressions += compare(scale, run['results'], baseline['scales'].get(scale, {}),
+                                   args.tolerance, args.min_delta_ms)
+
+    if args.update_baseline:
+        baseline['meta'] = {
+            'recorded_at': date.today().isoformat(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'repeat': args.repeat,
+            'log_level': args.log_level,
+        }
+        for scale, run in runs.items():
+            baseline['scales'][scale] = {name: round(value, 3) if value is not None else None
+                                         for name, value in run['results'].items()}
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, ensure_ascii=False)
+            baseline_file.write('\n')
+        print(f'\nБазовая линия сохранена: {args.baseline}')
+        return
+
+    if regressions:
+        print('\nРегрессии производительности и сценарии без базовой линии:')
+        for regression in regressions:
+            print(f'  {regression}')
+        sys.exit(1)
+    print('\nРегрессий нет')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Бенчмарк сборки тел запросов Bot API: словарь + JSON от httpx против заранее закодированных байтов.
+
+Запуск (нужен .env, как для приложения):
+    python -m benchmarks.bench_payloads --calls 100000 --repeat 5
+"""
+
+import argparse
+import json
+import time
+
+import httpx
+import orjson
+
+from app.core.config import settings
+from app.tg_bot.kbs import back_kb, generate_kb_profile, main_kb
+from app.tg_bot.methods import get_about_text, get_booking_text, get_greeting_text
+from app.tg_bot.payloads import (
+    JSON_HEADERS, answer_callback_payload, api_url, payload_cache_stats, send_message_payload,
+)
+
+
+def legacy_kb_profile(user_db_id: int, count_booking: int):
+    """Прежняя generate_kb_profile: новый список на каждый вызов."""
+    kb_profile = [
+        [{'text': '🏠 Главное меню', 'callback_data': 'home'}],
+        [{'text': '🔖 Записаться', 'web_app': {'url': f'{settings.FRONT_SITE}'}}],
+    ]
+    if count_booking > 0:
+        kb_profile.append([{'text': f'🔒 Мои записи ({count_booking})', 'callback_data': f'my_booking_{user_db_id}'}])
+    return kb_profile
+
+
+def legacy_send_data(chat_id: int, text: str, kb: list | None = None) -> dict:
+    """Прежняя bot_send_message: словарь на каждый вызов."""
+    send_data = {'chat_id': chat_id, 'text': text, 'parse_mode': 'HTML'}
+    if kb:
+        send_data['reply_markup'] = {'inline_keyboard': kb}
+    return send_data
+
+
+def httpx_encode(data: dict) -> bytes:
+    """Кодирование json= так же, как это делает httpx."""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), allow_nan=False).encode('utf-8')
+
+
+def measure(label: str, func, calls: int, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    print(f'{label:<44} {best / calls * 1e6:8.2f} мкс/вызов')
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=100_000)
+    parser.add_argument('--users', type=int, default=500, help='Число разных пользователей (chat_id, имена)')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    calls, users = args.calls, args.users
+    # Сценарий похож на реальный поток апдейтов: /start, главное меню, «О нас», профиль
+    scenario = [(i % users + 1_000_000, f'User{i % users}', i % 4) for i in range(calls)]
+
+    def legacy():
+        for chat_id, name, count in scenario:
+            httpx_encode(legacy_send_data(chat_id, get_greeting_text.__wrapped__(name), main_kb))
+            httpx_encode(legacy_send_data(chat_id, get_about_text.__wrapped__(), back_kb))
+            httpx_encode(legacy_send_data(
+                chat_id, get_booking_text.__wrapped__(count), legacy_kb_profile(chat_id, count)))
+            httpx_encode({'callback_query_id': chat_id, 'text': 'О нас'})
+
+    def compiled():
+        for chat_id, name, count in scenario:
+            send_message_payload(chat_id, get_greeting_text(name), main_kb)
+            send_message_payload(chat_id, get_about_text(), back_kb)
+            send_message_payload(chat_id, get_booking_text(count), generate_kb_profile(chat_id, count))
+            answer_callback_payload(chat_id, 'О нас')
+
+    chat_id, name, count = scenario[-1]
+    for text, kb in ((get_greeting_text(name), main_kb), (get_booking_text(count), generate_kb_profile(chat_id, count))):
+        assert orjson.loads(send_message_payload(chat_id, text, kb)) == legacy_send_data(chat_id, text, kb)
+
+    print(f'Сборка тел запросов, {calls} апдейтов x 4 вызова, {users} пользователей (лучшее из {args.repeat}):')
+    legacy_time = measure('dict + json.dumps (как httpx json=)', legacy, calls * 4, args.repeat)
+    compiled_time = measure('готовые байты (payloads)', compiled, calls * 4, args.repeat)
+
+    url = api_url('sendMessage')
+    text = get_about_text()
+    print('\nПостроение httpx.Request для sendMessage «О нас»:')
+    measure('httpx.Request(json=...)', lambda: [
+        httpx.Request('POST', url, json=legacy_send_data(1, text, back_kb)) for _ in range(calls)
+    ], calls, args.repeat)
+    measure('httpx.Request(content=...)', lambda: [
+        httpx.Request('POST', url, content=send_message_payload(1, text, back_kb), headers=JSON_HEADERS)
+        for _ in range(calls)
+    ], calls, args.repeat)
+
+    print(f'\nКеши: {payload_cache_stats()}')
+    print(f'Ускорение сборки тел: x{legacy_time / compiled_time:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Бенчмарк и проверка кеширования ответов (ResponseCacheMiddleware) на GET /booking/available-slots.
+
+Запросы идут через весь стек middleware приложения (httpx.ASGITransport, без lifespan):
+    miss — версия bookings увеличена, ответ строится заново;
+    hit  — тело из кеша middleware;
+    304  — If-None-Match с актуальным ETag.
+Запросы чередуют два Origin (с cookie, как у фронтенда), и каждый ответ, включая
+кешированные и 304, проверяется на CORS-заголовки своего Origin. Отдельно проверяется,
+что If-None-Match: * не даёт 304 на запрос с неверными параметрами. При ошибке
+скрипт завершается с кодом 1.
+
+Запуск (нужен .env, как для приложения; DATABASE_URL подменяется):
+    python -m benchmarks.bench_response_cache
+    python -m benchmarks.bench_response_cache --requests 2000
+"""
+
+import argparse
+import asyncio
+from datetime import date
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+from benchmarks.seed_data import SeedConfig, seed
+
+
+SEED_CONFIG = SeedConfig(users=1_000, tables=50, days=30)
+ORIGINS = ('https://front.example', 'https://other.example')
+PATH = '/booking/available-slots'
+
+
+def check_cors(response, origin: str) -> List[str]:
+    """Ошибки CORS-заголовков ответа для запроса с Origin и cookie."""
+    errors = []
+    allow_origin = response.headers.get('access-control-allow-origin')
+    if allow_origin != origin:
+        errors.append(f'{response.status_code}: Access-Control-Allow-Origin={allow_origin!r}, ожидался {origin!r}')
+    if response.headers.get('access-control-allow-credentials') != 'true':
+        errors.append(f'{response.status_code}: нет Access-Control-Allow-Credentials')
+    return errors
+
+
+async def run(args) -> List[str]:
+    import httpx
+    from loguru import logger
+
+    from app.dao.cache import reference_cache
+    from app.db.database import engine
+    from app.main import app
+
+    logger.remove()  # Приложение при импорте добавляет свои обработчики логов
+
+    params = {'start_date': date.today().isoformat()}
+    errors: List[str] = []
+    timings = {'miss': [], 'hit': [], '304': []}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench') as client:
+        async def request(mode: str, number: int, etag: str | None = None) -> httpx.Response:
+            origin = ORIGINS[number % len(ORIGINS)]
+            headers = {'Origin': origin, 'Cookie': 'session=bench'}
+            if etag is not None:
+                headers['If-None-Match'] = etag
+            start = time.perf_counter()
+            response = await client.get(PATH, params=params, headers=headers)
+            timings[mode].append(time.perf_counter() - start)
+            expected = 304 if mode == '304' else 200
+            if response.status_code != expected:
+                errors.append(f'{mode}: статус {response.status_code}, ожидался {expected}')
+            errors.extend(f'{mode} {error}' for error in check_cors(response, origin))
+            return response
+
+        await client.get(PATH, params=params)  # Прогрев: справочники и компиляция запросов
+        for number in range(args.requests):
+            reference_cache.invalidate('bookings')
+            etag = (await request('miss', number)).headers.get('etag')
+            # Следующий запрос с другим Origin получает закешированный ответ первого
+            await request('hit', number + 1)
+            await request('304', number, etag)
+
+        response = await client.get(PATH, params={'start_date': 'invalid'}, headers={'If-None-Match': '*'})
+        if response.status_code == 304:
+            errors.append('If-None-Match: * с неверными параметрами: 304 вместо ошибки обработчика')
+
+    await engine.dispose()
+    print(f'{args.requests} запросов на режим, медиана')
+    print(f'{"режим":<6} {"ms":>8}')
+    for mode, values in timings.items():
+        print(f'{mode:<6} {statistics.median(values) * 1000:8.3f}')
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500, help='Запросов на режим')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'response_cache.sqlite3')
+        # До импорта приложения: движок БД создаётся при импорте по DATABASE_URL
+        os.environ['DATABASE_URL'] = f'sqlite+aiosqlite:///{path}'
+        # Без канала инвалидации ключ меняется раз в RESPONSE_CACHE_TTL: граница интервала не должна
+        # попасть между miss и 304 одного шага
+        os.environ['RESPONSE_CACHE_TTL'] = '3600'
+        seed(f'sqlite:///{path}', SEED_CONFIG)
+
+        errors = asyncio.run(run(args))
+
+    if errors:
+        print('\nОшибки кеширования ответов:')
+        for error in sorted(set(errors)):
+            print(f'  {error}')
+        sys.exit(1)
+    print('\nCORS-заголовки верны для miss, hit и 304, If-None-Match: * не скрывает ошибки')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Задержка цикла событий при массовом планировании напоминаний.
+
+Одновременно планирует N задач (как schedule_appointment_notification при наплыве броней)
+и измеряет максимальное отставание цикла событий для прежней конфигурации
+(AsyncIOScheduler + SQLAlchemyJobStore) и текущей (CoalescingAsyncIOScheduler +
+BufferedSQLAlchemyJobStore). Завершается с кодом 1, если отставание для текущей
+конфигурации превысило порог.
+
+Оставшееся отставание — это CPU на создание объектов Job в самом APScheduler
+(все N задач готовы к выполнению в одной итерации цикла), а не ввод-вывод.
+
+Запуск (нужен .env, как для приложения):
+    python -m benchmarks.bench_scheduler_loop_lag --jobs 1000 --threshold-ms 250
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+import os
+import sys
+import tempfile
+import time
+
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from app.core.job_store import BufferedSQLAlchemyJobStore
+from app.core.scheduler import CoalescingAsyncIOScheduler
+
+
+async def noop_notification(user_tg_id: int, appointment: dict):
+    pass
+
+
+async def monitor_loop_lag(stop: asyncio.Event, interval: float = 0.001) -> float:
+    """Возвращает максимальное отставание цикла событий (секунды) до установки stop."""
+    loop = asyncio.get_running_loop()
+    max_lag = 0.0
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, loop.time() - expected)
+    return max_lag
+
+
+async def schedule_one(scheduler: AsyncIOScheduler, index: int, run_date: datetime):
+    appointment = {'id': index, 'day_booking': run_date.strftime('%Y-%m-%d'), 'time_booking': '12:00'}
+    scheduler.add_job(
+        noop_notification,
+        'date',
+        run_date=run_date,
+        args=[index, appointment],
+        id=f'notification_{index}_{index}_24h',
+        replace_existing=True,
+    )
+
+
+async def run_case(scheduler_class, store_factory, jobs: int) -> tuple[float, float]:
+    scheduler = scheduler_class(jobstores={'default': store_factory()})
+    scheduler.start()
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_loop_lag(stop))
+    await asyncio.sleep(0.01)
+
+    run_date = datetime.now().astimezone() + timedelta(days=1)
+    start = time.perf_counter()
+    await asyncio.gather(*(schedule_one(scheduler, i, run_date) for i in range(jobs)))
+    elapsed = time.perf_counter() - start
+
+    await asyncio.sleep(0.01)
+    stop.set()
+    max_lag = await monitor
+    scheduler.shutdown()
+    return max_lag, elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=1000)
+    parser.add_argument('--threshold-ms', type=float, default=250.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = {
+            'прежняя (sync store)': (
+                AsyncIOScheduler,
+                lambda: SQLAlchemyJobStore(url=f'sqlite:///{os.path.join(tmp, "sync.sqlite")}'),
+            ),
+            'текущая (buffered store)': (
+                CoalescingAsyncIOScheduler,
+                lambda: BufferedSQLAlchemyJobStore(url=f'sqlite:///{os.path.join(tmp, "buffered.sqlite")}'),
+            ),
+        }
+        results = {}
+        for name, (scheduler_class, factory) in cases.items():
+            max_lag, elapsed = await run_case(scheduler_class, factory, args.jobs)
+            results[name] = max_lag
+            print(f'{name:<26} задач: {args.jobs:>6}  макс. отставание цикла: {max_lag * 1000:8.1f} ms  '
+                  f'время планирования: {elapsed * 1000:8.1f} ms')
+
+    buffered_lag_ms = results['текущая (buffered store)'] * 1000
+    if buffered_lag_ms > args.threshold_ms:
+        print(f'FAIL: отставание {buffered_lag_ms:.1f} ms превышает порог {args.threshold_ms} ms')
+        sys.exit(1)
+    print(f'OK: отставание {buffered_lag_ms:.1f} ms не превышает порог {args.threshold_ms} ms')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
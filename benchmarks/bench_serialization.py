@@ -0,0 +1,94 @@
+"""
+Бенчмарк сериализации моделей: рефлексивный to_dict против скомпилированного сериализатора.
+
+Запуск (нужен .env, как для приложения):
+    python -m benchmarks.bench_serialization --rows 10000 --repeat 5
+"""
+
+import argparse
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+import json
+import time
+import uuid
+
+import orjson
+from sqlalchemy import inspect
+
+from app.api.responses import ORJSONResponse
+from app.db.models.models import Booking
+from app.db.serializers import get_serializer, to_dicts
+
+
+def legacy_to_dict(obj, exclude_none: bool = False):
+    """Прежняя реализация Base.to_dict (inspect и цепочка isinstance на каждую строку)."""
+    result = {}
+    for column in inspect(obj.__class__).columns:
+        value = getattr(obj, column.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = float(value)
+        elif isinstance(value, uuid.UUID):
+            value = str(value)
+        if not exclude_none or value is not None:
+            result[column.key] = value
+    return result
+
+
+def make_bookings(count: int) -> list[Booking]:
+    now = datetime.now()
+    today = date.today()
+    statuses = ('booked', 'completed', 'canceled')
+    return [
+        Booking(
+            id=i,
+            user_id=i % 1000 + 1,
+            table_id=i % 20 + 1,
+            time_slot_id=i % 6 + 1,
+            date=today + timedelta(days=i % 30),
+            status=statuses[i % 3],
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def measure(label: str, func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    print(f'{label:<40} {best * 1000:9.2f} ms')
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_bookings(args.rows)
+    serializer = get_serializer(Booking)
+    assert [legacy_to_dict(row) for row in rows[:100]] == serializer.many(rows[:100])
+
+    print(f'Сериализация {args.rows} строк Booking (лучшее из {args.repeat}):')
+    legacy = measure('legacy to_dict (inspect)', lambda: [legacy_to_dict(row) for row in rows], args.repeat)
+    measure('Base.to_dict (скомпилированный)', lambda: [row.to_dict() for row in rows], args.repeat)
+    compiled = measure('Booking.to_dicts (пакетный)', lambda: Booking.to_dicts(rows), args.repeat)
+    measure('to_dicts (смешанные модели)', lambda: to_dicts(rows), args.repeat)
+
+    print(f'\nОтвет API для {args.rows} строк:')
+    measure('json.dumps(legacy to_dict)', lambda: json.dumps(
+        [legacy_to_dict(row) for row in rows], default=str).encode(), args.repeat)
+    measure('orjson.dumps(to_dicts)', lambda: orjson.dumps(Booking.to_dicts(rows)), args.repeat)
+    measure('ORJSONResponse(rows)', lambda: ORJSONResponse(rows), args.repeat)
+
+    print(f'\nУскорение to_dict: x{legacy / compiled:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""
+Бенчмарк конкурентной записи в SQLite: напрямую и через очередь писателя (app.db.writer).
+
+Для каждого режима генератор benchmarks.seed_data заполняет свою временную БД, после чего
+в отдельном процессе --concurrency корутин выполняют всего --writes операций записи через
+app.db.writer.run_write (как обработчики вебхука). Смесь операций (--mix): start — новый
+пользователь (UserDAO.add), booking — новая бронь (BookingDAO.add), cancel — отмена брони.
+
+Режимы:
+    direct — каждая операция в своей сессии со своим коммитом (SQLITE_WRITE_QUEUE=0);
+    queue  — единственный писатель с групповыми коммитами (SQLITE_WRITE_QUEUE=1).
+
+Печатаются записи в секунду, задержки p50/p95/p99, ошибки (в том числе «database is locked»)
+и среднее число операций на коммит.
+
+Запуск (нужен .env, как для приложения; DATABASE_URL подменяется):
+    python -m benchmarks.bench_sqlite_writes
+    python -m benchmarks.bench_sqlite_writes --concurrency 100 --writes 5000 --batch 128
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+from datetime import date, timedelta
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.seed_data import TELEGRAM_ID_BASE, SeedConfig, seed
+
+
+MODES = ('direct', 'queue')
+OPERATIONS = ('start', 'booking', 'cancel')
+
+SEED_CONFIG = SeedConfig(users=5_000, tables=50, days=60)
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Разбирает смесь операций вида 'start=1,booking=2,cancel=1'."""
+    mix = {}
+    for part in value.split(','):
+        kind, _, weight = part.partition('=')
+        if kind not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f'Неизвестная операция: {kind}')
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def build_operations(args, booking_count: int) -> List:
+    """Детерминированный список операций записи (функции сессии)."""
+    from app.dao.bookings_dao import BookingDAO
+    from app.dao.users_dao import UserDAO
+    from app.db.enums import BookingStatus
+    from app.schemas.users_schemas import UserModel
+    from app.tg_bot.booking.schemas import SNewBooking
+
+    rng = random.Random(args.seed)
+    kinds = rng.choices(list(args.mix), weights=list(args.mix.values()), k=args.writes)
+    first_free_date = date.today() + timedelta(days=SEED_CONFIG.days + 30)
+    # Новые telegram_id не пересекаются с пользователями из генератора
+    telegram_ids = itertools.count(TELEGRAM_ID_BASE + SEED_CONFIG.users + 1)
+
+    operations = []
+    for kind in kinds:
+        if kind == 'start':
+            values = UserModel(telegram_id=next(telegram_ids), username=None, first_name='Бенчмарк', last_name=None)
+            operations.append((kind, lambda s, values=values: UserDAO.add(session=s, values=values)))
+        elif kind == 'booking':
+            values = SNewBooking(
+                user_id=rng.randrange(1, SEED_CONFIG.users + 1),
+                table_id=rng.randrange(1, SEED_CONFIG.tables + 1),
+                time_slot_id=rng.randrange(1, 7),
+                date=first_free_date + timedelta(days=rng.randrange(30)),
+                status=BookingStatus.BOOKED,
+            )
+            operations.append((kind, lambda s, values=values: BookingDAO.add(session=s, values=values)))
+        else:
+            booking_id = rng.randrange(1, booking_count + 1)
+            operations.append((kind, lambda s, booking_id=booking_id: BookingDAO.cancel_booking(s, booking_id)))
+    return operations
+
+
+async def run_writes(args, booking_count: int) -> dict:
+    from app.dao.tables_dao import TableDAO
+    from app.db.database import async_session_maker, engine
+    from app.db.writer import get_write_queue, run_write
+
+    # Кеш столов нужен BookingDAO для сводки занятости — загружаем вне замера
+    await TableDAO.warm_up()
+    operations = build_operations(args, booking_count)
+    indexes = itertools.count()
+    latencies: Dict[str, List[float]] = {kind: [] for kind in OPERATIONS}
+    errors: Counter = Counter()
+
+    async def worker():
+        while (index := next(indexes)) < len(operations):
+            kind, operation = operations[index]
+            start = time.perf_counter()
+            try:
+                async with async_session_maker() as session:
+                    await run_write(session, operation)
+            except Exception as e:
+                errors[f'{kind}: {type(e).__name__}: {str(e).splitlines()[0][:80]}'] += 1
+            else:
+                latencies[kind].append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    queue = get_write_queue()
+    commits = queue.batches if args.mode == 'queue' else sum(len(values) for values in latencies.values())
+    await queue.close()
+    await engine.dispose()
+    return {
+        'elapsed': elapsed,
+        'latencies': latencies,
+        'errors': dict(errors),
+        'commits': commits,
+        'fallbacks': queue.fallbacks,
+    }
+
+
+def run_worker(args) -> None:
+    """Выполняется в дочернем процессе: DATABASE_URL и SQLITE_WRITE_QUEUE уже заданы."""
+    from loguru import logger
+
+    import app.db.models.models  # noqa: F401
+    logger.remove()
+    logger.add(sys.stderr, level='CRITICAL')
+
+    import sqlite3
+    from sqlalchemy import make_url
+    from app.core.config import settings
+    path = make_url(settings.get_database_url).database
+    booking_count = sqlite3.connect(path).execute('SELECT COUNT(*) FROM bookings').fetchone()[0]
+
+    print(json.dumps(asyncio.run(run_writes(args, booking_count))))
+
+
+def run_mode(mode: str, args, tmp: str) -> dict:
+    path = os.path.join(tmp, f'{mode}.sqlite3')
+    seed(f'sqlite:///{path}', SEED_CONFIG)
+    env = {
+        **os.environ,
+        'DATABASE_URL': f'sqlite+aiosqlite:///{path}',
+        'STORE_URL': f'sqlite:///{os.path.join(tmp, "jobs.sqlite")}',
+        'REFERENCE_CACHE_CHANNEL': '0',
+        'SQLITE_WRITE_QUEUE': '1' if mode == 'queue' else '0',
+        'SQLITE_WRITE_BATCH': str(args.batch),
+        'SQLITE_WRITE_DELAY_MS': str(args.delay_ms),
+    }
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_sqlite_writes', '--worker', mode,
+         '--concurrency', str(args.concurrency), '--writes', str(args.writes),
+         '--mix', ','.join(f'{kind}={weight}' for kind, weight in args.mix.items()), '--seed', str(args.seed)],
+        env=env, capture_output=True, text=True,
+    )
+    sys.stderr.write(output.stderr)
+    if output.returncode != 0:
+        raise SystemExit(f'[{mode}] процесс бенчмарка завершился с кодом {output.returncode}')
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def report(mode: str, result: dict) -> None:
+    latencies = result['latencies']
+    done = sum(len(values) for values in latencies.values())
+    print(f'\n[{mode}] {done} записей за {result["elapsed"]:.2f} с: {done / result["elapsed"]:.0f} записей/с, '
+          f'{done / max(result["commits"], 1):.1f} операций на коммит')
+    print(f'{"операция":<10} {"кол-во":>7} {"p50, ms":>8} {"p95, ms":>8} {"p99, ms":>8}')
+    for kind, values in [*latencies.items(), ('всего', [v for values in latencies.values() for v in values])]:
+        if values:
+            print(f'{kind:<10} {len(values):>7} {percentile(values, 0.5) * 1000:8.1f} '
+                  f'{percentile(values, 0.95) * 1000:8.1f} {percentile(values, 0.99) * 1000:8.1f}')
+    for error, count in result['errors'].items():
+        print(f'  ошибка ×{count}: {error}')
+    if result['fallbacks']:
+        print(f'  пакетов выполнено поштучно: {result["fallbacks"]}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', default=','.join(MODES), help=f'Режимы через запятую: {", ".join(MODES)}')
+    parser.add_argument('--concurrency', type=int, default=50, help='Одновременно пишущих корутин')
+    parser.add_argument('--writes', type=int, default=2000, help='Всего операций записи')
+    parser.add_argument('--mix', type=parse_mix, default='start=1,booking=2,cancel=1')
+    parser.add_argument('--batch', type=int, default=64, help='SQLITE_WRITE_BATCH для режима queue')
+    parser.add_argument('--delay-ms', type=float, default=0.0, help='SQLITE_WRITE_DELAY_MS для режима queue')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        args.mode = args.worker
+        run_worker(args)
+        return
+
+    modes = [mode.strip() for mode in args.modes.split(',')]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f'Неизвестные режимы: {", ".join(sorted(unknown))}')
+
+    print(f'{args.writes} операций, {args.concurrency} корутин, смесь {args.mix}')
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in modes:
+            results[mode] = run_mode(mode, args, tmp)
+            report(mode, results[mode])
+
+    if len(results) == 2:
+        rates = {
+            mode: sum(len(values) for values in result['latencies'].values()) / result['elapsed']
+            for mode, result in results.items()
+        }
+        print(f'\nqueue / direct: ×{rates["queue"] / max(rates["direct"], 1e-9):.2f} по записям в секунду')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Бенчмарк холодного старта приложения.
+
+1. Разбор `python -X importtime -c "import app.main"`: самые тяжёлые модули.
+2. Время до первого ответа: запуск uvicorn и опрос POST /webhook до первого 200.
+   Telegram Bot API подменяется недоступным адресом, поэтому сетевые вызовы при старте
+   завершаются сразу ошибкой, а измеряется собственная работа приложения.
+
+Запуск (нужен .env, как для приложения):
+    python -m benchmarks.bench_startup --runs 3 --top 15
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from sqlalchemy import create_engine
+
+
+def import_time_breakdown(top: int) -> None:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app.main'],
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        prefix, cumulative_us, name = line.split('|', 2)
+        self_us = int(prefix.split(':')[1])
+        rows.append((int(cumulative_us), self_us, name.rstrip()))
+
+    total = max(rows)[0]
+    print(f'Импорт app.main: {total / 1000:.1f} ms')
+    print(f'{"cumulative, ms":>15} {"self, ms":>9}  модуль')
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f'{cumulative_us / 1000:15.1f} {self_us / 1000:9.1f}  {name}')
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def prepare_database(path: str) -> str:
+    from app.db.database import Base
+    import app.db.models.models  # noqa: F401 — регистрация моделей в metadata
+
+    engine = create_engine(f'sqlite:///{path}')
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    return f'sqlite+aiosqlite:///{path}'
+
+
+def time_to_first_request(env: dict, timeout: float = 30.0) -> float:
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app.main:app', '--port', str(port), '--log-level', 'warning'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client() as client:
+            while time.perf_counter() - start < timeout:
+                try:
+                    if client.post(f'http://127.0.0.1:{port}/webhook', json={}).status_code == 200:
+                        return time.perf_counter() - start
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+        raise TimeoutError('Приложение не ответило за отведённое время')
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    import_time_breakdown(args.top)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            'DATABASE_URL': prepare_database(os.path.join(tmp, 'db.sqlite3')),
+            'STORE_URL': f'sqlite:///{os.path.join(tmp, "jobs.sqlite")}',
+            'TG_API_URL': 'http://127.0.0.1:9',
+            'WEBHOOK_STATE_FILE': os.path.join(tmp, 'webhook_state'),
+            'REFERENCE_CACHE_CHANNEL': '0',
+        }
+        print('\nВремя до первого ответа:')
+        for run in range(1, args.runs + 1):
+            print(f'  запуск {run}: {time_to_first_request(env) * 1000:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
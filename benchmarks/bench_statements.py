@@ -0,0 +1,154 @@
+"""
+Микро-бенчмарк Python-накладных горячих запросов DAO: выражение, построенное на каждый вызов,
+против готового выражения из реестра app.dao.statements.
+
+Для каждого запроса измеряются:
+    build+key — сборка выражения и вычисление ключа кеша компиляции SQLAlchemy (без БД);
+                эту работу SQLAlchemy выполняет при каждом execute;
+    execute   — полный session.execute на заполненной SQLite-БД с чтением результата.
+Вариант «до» повторяет прежний код (select(...).filter_by(...) на каждый вызов),
+вариант «после» — выражения с bindparam, которые используют DAO.
+
+Запуск (нужен .env, как для приложения; DATABASE_URL подменяется):
+    python -m benchmarks.bench_statements
+    python -m benchmarks.bench_statements --number 5000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Callable, List, NamedTuple, Tuple
+
+from benchmarks.seed_data import TELEGRAM_ID_BASE, SeedConfig, seed
+
+
+SEED_CONFIG = SeedConfig(users=5_000, tables=50, days=90)
+
+
+class Case(NamedTuple):
+    """
+    Запрос бенчмарка.
+
+    :param name: Имя запроса (метод DAO).
+    :param before: Возвращает (выражение, параметры), как строил прежний код.
+    :param after: Возвращает (выражение, параметры) из реестра.
+    :param fetch: Читать ли строки результата.
+    """
+
+    name: str
+    before: Callable[[], Tuple]
+    after: Callable[[], Tuple]
+    fetch: bool = True
+
+
+def build_cases() -> List[Case]:
+    from sqlalchemy import select, update
+
+    from app.dao.bookings_dao import BookingDAO
+    from app.dao.users_dao import UserDAO
+    from app.db.enums import BookingStatus
+    from app.db.models.models import Booking, User
+
+    booking_id = 1
+    telegram_id = TELEGRAM_ID_BASE + 1
+    booking_date = SEED_CONFIG.first_day()
+    cell = {'table_id': 1, 'date': booking_date, 'time_slot_id': 1}
+
+    return [
+        Case(
+            'find_one_or_none_by_id',
+            lambda: (select(Booking).filter_by(id=booking_id), {}),
+            lambda: (BookingDAO._by_id_statement(), {'data_id': booking_id}),
+        ),
+        Case(
+            'get_user_id',
+            lambda: (select(User.id).filter_by(telegram_id=telegram_id), {}),
+            lambda: (UserDAO._id_by_telegram_id_statement(), {'telegram_id': telegram_id}),
+        ),
+        Case(
+            'check_available_bookings',
+            lambda: (select(Booking).filter_by(**cell), {}),
+            lambda: (BookingDAO._active_booking_statement(),
+                     {'table_id': 1, 'booking_date': booking_date, 'time_slot_id': 1}),
+        ),
+        Case(
+            'get_available_time_slots',
+            lambda: (select(Booking.time_slot_id).filter_by(table_id=1, date=booking_date, status=BookingStatus.BOOKED), {}),
+            lambda: (BookingDAO._booked_slots_statement(), {'table_id': 1, 'booking_date': booking_date}),
+        ),
+        Case(
+            'update[id -> status]',
+            lambda: (update(Booking).where(Booking.id == booking_id).values(status=BookingStatus.CANCELED)
+                     .execution_options(synchronize_session='fetch'), {}),
+            lambda: (BookingDAO._update_statement(('id',), ('status',)),
+                     {'filter_id': booking_id, 'value_status': BookingStatus.CANCELED}),
+        ),
+        Case(
+            'bulk_update[1 row]',
+            lambda: (update(Booking).filter_by(id=booking_id).values(status=BookingStatus.CANCELED), {}),
+            lambda: (BookingDAO._update_by_id_statement(('status',)),
+                     {'record_id': booking_id, 'value_status': BookingStatus.CANCELED}),
+            fetch=False,
+        ),
+    ]
+
+
+def measure_build(factory: Callable[[], Tuple], number: int) -> float:
+    """Микросекунд на сборку выражения и вычисление ключа кеша компиляции."""
+    start = time.perf_counter()
+    for _ in range(number):
+        statement, _ = factory()
+        statement._generate_cache_key()
+    return (time.perf_counter() - start) / number * 1e6
+
+
+async def measure_execute(factory: Callable[[], Tuple], fetch: bool, number: int) -> float:
+    """Микросекунд на session.execute (запись откатывается после замера)."""
+    from app.db.database import async_session_maker
+
+    async with async_session_maker() as session:
+        statement, params = factory()
+        await session.execute(statement, params)  # Прогрев: компиляция и соединение
+        start = time.perf_counter()
+        for _ in range(number):
+            statement, params = factory()
+            result = await session.execute(statement, params)
+            if fetch:
+                result.all()
+        elapsed = time.perf_counter() - start
+        await session.rollback()
+    return elapsed / number * 1e6
+
+
+async def run(args) -> None:
+    from app.db.database import engine
+
+    print(f'{"запрос":<26} {"build+key до":>13} {"после":>8} {"execute до":>11} {"после":>8}  (мкс)')
+    for case in build_cases():
+        build = [measure_build(factory, args.number) for factory in (case.before, case.after)]
+        execute = [await measure_execute(factory, case.fetch, args.number // 5) for factory in (case.before, case.after)]
+        print(f'{case.name:<26} {build[0]:13.1f} {build[1]:8.1f} {execute[0]:11.1f} {execute[1]:8.1f}  '
+              f'(−{build[0] - build[1]:.0f} мкс на запрос)')
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=2000, help='Повторов на замер build+key (execute — в 5 раз меньше)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'statements.sqlite3')
+        # До импорта приложения: движок БД создаётся при импорте по DATABASE_URL
+        os.environ['DATABASE_URL'] = f'sqlite+aiosqlite:///{path}'
+        seed(f'sqlite:///{path}', SEED_CONFIG)
+
+        from loguru import logger
+        logger.remove()
+        asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Микро-бенчмарк подготовки фильтров и значений для BaseDAO: Pydantic модель против словаря.
+
+Для каждой схемы измеряется, сколько микросекунд уходит на получение словаря, который
+BaseDAO передаёт в SQLAlchemy (без БД):
+    model     — прежний путь: создание модели с валидацией и model_dump(exclude_unset=True);
+    validate  — проверка на границе через кешированный TypeAdapter TypedDict-схемы
+                (app.schemas.validation), модель не создаётся;
+    mapping   — внутренний вызов с готовым словарём (to_dict только копирует его).
+Для add_many/bulk_update на 1000 записей то же считается для всего списка.
+
+Запуск (нужен .env, как для приложения):
+    python -m benchmarks.bench_values
+    python -m benchmarks.bench_values --number 20000
+"""
+
+import argparse
+from datetime import date
+import time
+from typing import Callable, List, NamedTuple
+
+
+class Case(NamedTuple):
+    """
+    Вариант подготовки данных.
+
+    :param name: Имя варианта.
+    :param prepare: Возвращает то, что DAO превратит в словарь(и).
+    :param items: Сколько записей готовит один вызов.
+    """
+
+    name: str
+    prepare: Callable[[], object]
+    items: int = 1
+
+
+def build_cases() -> List[Case]:
+    from pydantic import BaseModel
+
+    from app.dao.base_dao import to_dict
+    from app.db.enums import BookingStatus
+    from app.schemas.users_schemas import UserModel, UserValues
+    from app.schemas.validation import validate
+    from app.tg_bot.booking.schemas import SNewBooking
+
+    user = {'telegram_id': 1_000_000_001, 'username': 'bench', 'first_name': 'Бенчмарк', 'last_name': None}
+    booking = {'user_id': 1, 'table_id': 2, 'time_slot_id': 3, 'date': date(2026, 10, 19),
+               'status': BookingStatus.BOOKED}
+    bookings = [{**booking, 'table_id': i % 50 + 1} for i in range(1000)]
+    updates = [{'id': i, 'status': BookingStatus.CANCELED} for i in range(1, 1001)]
+
+    class StatusUpdate(BaseModel):
+        id: int
+        status: BookingStatus
+
+    return [
+        Case('user: model', lambda: to_dict(UserModel(**user))),
+        Case('user: validate', lambda: to_dict(validate(UserValues, user))),
+        Case('user: mapping', lambda: to_dict(user)),
+        Case('booking: model', lambda: to_dict(SNewBooking(**booking))),
+        Case('booking: mapping', lambda: to_dict(booking)),
+        Case('add_many[1k]: models', lambda: [to_dict(SNewBooking(**item)) for item in bookings], 1000),
+        Case('add_many[1k]: mappings', lambda: [to_dict(item) for item in bookings], 1000),
+        Case('bulk_update[1k]: models', lambda: [to_dict(StatusUpdate(**item)) for item in updates], 1000),
+        Case('bulk_update[1k]: mappings', lambda: [to_dict(item) for item in updates], 1000),
+    ]
+
+
+def measure(prepare: Callable[[], object], number: int) -> float:
+    """Микросекунд на один вызов prepare."""
+    prepare()  # Прогрев: сборка валидаторов и TypeAdapter
+    start = time.perf_counter()
+    for _ in range(number):
+        prepare()
+    return (time.perf_counter() - start) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=10000, help='Повторов на вариант (для 1k — в 1000 раз меньше)')
+    args = parser.parse_args()
+
+    print(f'{"вариант":<28} {"мкс на вызов":>13} {"мкс на запись":>14}')
+    for case in build_cases():
+        elapsed = measure(case.prepare, max(1, args.number // case.items))
+        print(f'{case.name:<28} {elapsed:13.2f} {elapsed / case.items:14.3f}')
+
+
+if __name__ == '__main__':
+    main()
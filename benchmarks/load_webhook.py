@@ -0,0 +1,338 @@
+"""
+Нагрузочный тест вебхука: синтетические апдейты Telegram против FastAPI-приложения в процессе.
+
+Генератор создаёт апдейты /start, booking, my_booking_<id> и about_us для пула пользователей
+и отправляет их в POST /webhook через httpx.ASGITransport (lifespan приложения выполняется).
+Исходящие вызовы Bot API уходят в локальную заглушку (httpx.MockTransport) с настраиваемой
+задержкой и долей ответов 429. БД — временный SQLite-файл, заполненный генератором
+benchmarks.seed_data.
+
+Отчёт: пропускная способность, p50/p95/p99 задержки, SQL-запросы на апдейт, исходящие
+вызовы на апдейт (HTTP и ответы прямо в теле вебхука) — суммарно и по типам апдейтов.
+
+Режимы нагрузки:
+    --rate N          открытая модель: N апдейтов в секунду независимо от ответов;
+    --rate 0          закрытая модель: --concurrency воркеров шлют апдейты без пауз.
+
+Запуск (нужен .env, как для приложения; БД, STORE_URL и TG_API_URL подменяются):
+    python -m benchmarks.load_webhook --users 1000 --rate 200 --duration 20
+    python -m benchmarks.load_webhook --rate 0 --concurrency 50 --latency-ms 80 --rate-limit 0.05
+"""
+
+import argparse
+import asyncio
+import contextvars
+from collections import Counter, defaultdict
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+import orjson
+
+from benchmarks.seed_data import TELEGRAM_ID_BASE, SeedConfig, seed
+from sqlalchemy import event
+
+# Тип апдейта, который сейчас обрабатывается (для разбивки счётчиков по типам)
+current_kind: contextvars.ContextVar[str] = contextvars.ContextVar('current_kind', default='startup')
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Разбирает смесь апдейтов вида 'start=1,booking=2,my_booking=1,about_us=1'."""
+    mix = {}
+    for part in value.split(','):
+        kind, _, weight = part.partition('=')
+        if kind not in ('start', 'booking', 'my_booking', 'about_us', 'home'):
+            raise argparse.ArgumentTypeError(f'Неизвестный тип апдейта: {kind}')
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+class FakeBotAPI:
+    """
+    Заглушка Telegram Bot API для httpx.MockTransport.
+
+    Отвечает {"ok": true} после задержки latency; с вероятностью rate_limit отвечает 429
+    с retry_after. Считает вызовы по методам и по типу апдейта, который их породил.
+    """
+
+    def __init__(self, latency: float = 0.0, rate_limit: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self._random = random.Random(seed)
+        self.calls: Counter = Counter()
+        self.calls_by_kind: Counter = Counter()
+        self.throttled = 0
+
+    @property
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handler)
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.calls_by_kind.clear()
+        self.throttled = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        method = request.url.path.rsplit('/', 1)[-1]
+        self.calls[method] += 1
+        self.calls_by_kind[current_kind.get()] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.rate_limit and self._random.random() < self.rate_limit:
+            self.throttled += 1
+            return httpx.Response(429, json={
+                'ok': False, 'error_code': 429, 'description': 'Too Many Requests: retry after 1',
+                'parameters': {'retry_after': 1},
+            })
+        return httpx.Response(200, json={'ok': True, 'result': True})
+
+
+class UpdateFactory:
+    """Генератор синтетических апдейтов Telegram для пула пользователей."""
+
+    def __init__(self, users: int, mix: Dict[str, float], seed: int = 0):
+        self._users = users
+        self._kinds = list(mix)
+        self._weights = list(mix.values())
+        self._random = random.Random(seed)
+        self._update_id = 0
+
+    def user(self, index: int) -> dict:
+        return {
+            'id': TELEGRAM_ID_BASE + index,
+            'is_bot': False,
+            'first_name': f'User{index}',
+            'username': f'user_{index}',
+            'language_code': 'ru',
+        }
+
+    def next(self) -> tuple[str, dict]:
+        self._update_id += 1
+        kind = self._random.choices(self._kinds, self._weights)[0]
+        index = self._random.randrange(1, self._users + 1)
+        user = self.user(index)
+        chat = {'id': user['id'], 'type': 'private', 'first_name': user['first_name']}
+        now = int(time.time())
+
+        if kind == 'start':
+            update = {'message': {
+                'message_id': self._update_id, 'from': user, 'chat': chat, 'date': now, 'text': '/start',
+                'entities': [{'offset': 0, 'length': 6, 'type': 'bot_command'}],
+            }}
+        else:
+            # Пользователи в БД создаются в том же порядке, поэтому users.id == index
+            data = f'my_booking_{index}' if kind == 'my_booking' else kind
+            update = {'callback_query': {
+                'id': str(self._update_id), 'from': user, 'chat_instance': str(index), 'data': data,
+                'message': {'message_id': self._update_id, 'chat': chat, 'date': now, 'text': 'menu'},
+            }}
+        return kind, {'update_id': self._update_id, **update}
+
+
+class Stats:
+    """Сбор задержек, ошибок и счётчиков по типам апдейтов."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.inline_replies: Counter = Counter()
+        self.statements: Counter = Counter()
+
+    def record(self, kind: str, latency: float, status: int | str, inline: bool) -> None:
+        self.latencies[kind].append(latency)
+        self.statuses[kind][status] += 1
+        if inline:
+            self.inline_replies[kind] += 1
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+async def send_update(client: httpx.AsyncClient, stats: Stats, kind: str, update: dict) -> None:
+    token = current_kind.set(kind)
+    start = time.perf_counter()
+    try:
+        response = await client.post('/webhook', content=orjson.dumps(update),
+                                      headers={'Content-Type': 'application/json'})
+        status = response.status_code
+        inline = status == 200 and b'"method"' in response.content
+    except Exception as e:
+        status, inline = type(e).__name__, False
+    finally:
+        current_kind.reset(token)
+    stats.record(kind, time.perf_counter() - start, status, inline)
+
+
+async def run_open_loop(client, factory: UpdateFactory, stats: Stats, rate: float, duration: float) -> None:
+    """Открытая модель: апдейты приходят с заданной частотой, не дожидаясь ответов."""
+    loop = asyncio.get_running_loop()
+    tasks = set()
+    start = loop.time()
+    sent = 0
+    while loop.time() - start < duration:
+        due = start + sent / rate
+        delay = due - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(send_update(client, stats, *factory.next()))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        sent += 1
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+async def run_closed_loop(client, factory: UpdateFactory, stats: Stats, concurrency: int, duration: float) -> None:
+    """Закрытая модель: concurrency воркеров отправляют апдейты один за другим."""
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            await send_update(client, stats, *factory.next())
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+def report(stats: Stats, fake_api: FakeBotAPI, elapsed: float) -> None:
+    kinds = sorted(stats.latencies)
+    all_latencies = [value for kind in kinds for value in stats.latencies[kind]]
+    total = len(all_latencies)
+    print(f'\nОбработано {total} апдейтов за {elapsed:.1f} с: {total / elapsed:.1f} апдейтов/с')
+    print(f'Ответы Bot API 429: {fake_api.throttled}; вызовы по методам: {dict(fake_api.calls)}\n')
+
+    header = (f'{"тип":<12} {"кол-во":>7} {"p50, ms":>8} {"p95, ms":>8} {"p99, ms":>8} '
+              f'{"SQL/апд":>8} {"HTTP/апд":>9} {"inline/апд":>10}  статусы')
+    print(header)
+    print('-' * len(header))
+    for kind in kinds + ['всего']:
+        if kind == 'всего':
+            values, names = all_latencies, kinds
+        else:
+            values, names = stats.latencies[kind], [kind]
+        count = len(values)
+        statuses = sum((stats.statuses[name] for name in names), Counter())
+        print(
+            f'{kind:<12} {count:>7} '
+            f'{percentile(values, 50) * 1000:8.1f} {percentile(values, 95) * 1000:8.1f} '
+            f'{percentile(values, 99) * 1000:8.1f} '
+            f'{sum(stats.statements[name] for name in names) / count:8.2f} '
+            f'{sum(fake_api.calls_by_kind[name] for name in names) / count:9.2f} '
+            f'{sum(stats.inline_replies[name] for name in names) / count:10.2f}  '
+            f'{dict(statuses)}'
+        )
+
+
+async def run_load(client, factory: UpdateFactory, stats: Stats, args) -> float:
+    """Подаёт нагрузку в выбранной модели и возвращает её длительность."""
+    start = time.perf_counter()
+    if args.rate > 0:
+        await run_open_loop(client, factory, stats, args.rate, args.duration)
+    else:
+        await run_closed_loop(client, factory, stats, args.concurrency, args.duration)
+    return time.perf_counter() - start
+
+
+def install_app(args, fake_api: FakeBotAPI, stats: Stats):
+    """Подключает счётчик SQL-запросов и заглушку Bot API к приложению и возвращает его."""
+    from app.async_client import http_client_manager
+    from app.db.database import engine
+    from app.main import app
+
+    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        stats.statements[current_kind.get()] += 1
+
+    # Все исходящие вызовы приложения идут в заглушку Bot API
+    http_client_manager._client_kwargs['transport'] = fake_api.transport
+    http_client_manager._pool_size = max(http_client_manager._pool_size, args.http_pool)
+    return app
+
+
+async def warm_up(client, factory: UpdateFactory, args) -> None:
+    """Прогрев: кеши, соединения с БД, пул HTTP-клиентов (апдейты не учитываются)."""
+    for _ in range(min(args.warmup, args.users)):
+        await send_update(client, Stats(), *factory.next())
+
+
+async def run(args, fake_api: FakeBotAPI) -> None:
+    stats = Stats()
+    app = install_app(args, fake_api, stats)
+    factory = UpdateFactory(args.users, args.mix, seed=args.seed)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url='http://loadtest') as client:
+            await warm_up(client, factory, args)
+            fake_api.reset()
+            stats.statements.clear()
+            elapsed = await run_load(client, factory, stats, args)
+
+    report(stats, fake_api, elapsed)
+
+
+def build_parser(description: str) -> argparse.ArgumentParser:
+    """Общие параметры нагрузки (используются и в benchmarks.soak_webhook)."""
+    parser = argparse.ArgumentParser(description=description, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000, help='Размер пула пользователей')
+    parser.add_argument('--rate', type=float, default=100, help='Апдейтов в секунду (0 — закрытая модель)')
+    parser.add_argument('--concurrency', type=int, default=20, help='Воркеров в закрытой модели')
+    parser.add_argument('--duration', type=float, default=10, help='Длительность нагрузки, с')
+    parser.add_argument('--warmup', type=int, default=50, help='Апдейтов на прогрев (не учитываются)')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('start=1,booking=1,my_booking=1,about_us=1'),
+                        help='Веса типов апдейтов: start, booking, my_booking, about_us, home')
+    parser.add_argument('--latency-ms', type=float, default=50, help='Задержка ответа заглушки Bot API')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='Доля ответов 429 от Bot API')
+    parser.add_argument('--http-pool', type=int, default=20, help='Размер пула HTTP-клиентов приложения')
+    parser.add_argument('--tables', type=int, default=20)
+    parser.add_argument('--days', type=int, default=60, help='Период бронирований (половина в прошлом), дни')
+    parser.add_argument('--occupancy', type=float, default=0.5, help='Доля занятых ячеек (дата, слот, стол)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--log-level', default='CRITICAL',
+                        help='Уровень логов приложения во время теста (ERROR — показать ошибки обработчиков)')
+    return parser
+
+
+def prepare_environment(tmp: str, args) -> FakeBotAPI:
+    """Заполняет временную БД, настраивает окружение и логи приложения, возвращает заглушку Bot API."""
+    # Настройки читаются при импорте приложения, поэтому окружение задаётся до него
+    db_path = os.path.join(tmp, 'db.sqlite3')
+    os.environ.update({
+        'DATABASE_URL': f'sqlite+aiosqlite:///{db_path}',
+        'STORE_URL': f'sqlite:///{os.path.join(tmp, "jobs.sqlite")}',
+        'TG_API_URL': 'http://bot-api.loadtest',
+        'WEBHOOK_STATE_FILE': os.path.join(tmp, 'webhook_state'),
+        'REFERENCE_CACHE_CHANNEL': '0',
+    })
+    seed(f'sqlite:///{db_path}', SeedConfig(
+        users=args.users, tables=args.tables, days=args.days, occupancy=args.occupancy, seed=args.seed,
+    ))
+
+    import app.main  # noqa: F401 — настраивает логгер, который ниже переопределяется
+    from loguru import logger
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+    logging.getLogger().setLevel(args.log_level)
+
+    print(f'Нагрузка: {"%.0f апдейтов/с" % args.rate if args.rate > 0 else f"{args.concurrency} воркеров"}, '
+          f'{args.duration:.0f} с, {args.users} пользователей, смесь {args.mix}, '
+          f'Bot API {args.latency_ms:.0f} ms / 429 {args.rate_limit:.0%}')
+    return FakeBotAPI(latency=args.latency_ms / 1000, rate_limit=args.rate_limit, seed=args.seed)
+
+
+def main():
+    args = build_parser(__doc__).parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        fake_api = prepare_environment(tmp, args)
+        asyncio.run(run(args, fake_api))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,312 @@
+"""
+Генератор синтетических данных для бенчмарков и нагрузочных тестов.
+
+Заполняет БД пользователями, столами, временными слотами и бронированиями заданного масштаба.
+Бронирования раскладываются по ячейкам (дата, слот, стол): каждая ячейка занята с вероятностью
+--occupancy, статус выбирается по --status-mix. Генерация детерминирована (--seed): одинаковые
+параметры дают одинаковые данные, ID строк явные (users.id == i, telegram_id == TELEGRAM_ID_BASE + i).
+
+Загрузка пакетами по --chunk-size строк: SQLite — executemany одной транзакцией с отключённым
+журналированием на время загрузки; PostgreSQL — COPY через asyncpg (DATABASE_URL вида
+postgresql+asyncpg://...), после загрузки последовательности ID сдвигаются за максимальный ID.
+
+Запуск (нужен .env, как для приложения; по умолчанию — DATABASE_URL из настроек):
+    python -m benchmarks.seed_data --users 100000 --tables 200 --days 365 --occupancy 0.6
+    python -m benchmarks.seed_data --url sqlite:///bench.sqlite3 --drop --status-mix booked=1,canceled=1
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+from datetime import date, time as dt_time, timedelta
+import random
+import sqlite3
+import time
+from typing import Dict, Iterator, List, Tuple
+
+from sqlalchemy import URL, make_url, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.db.enums import BOOKING_STATUS_CODES, BookingStatus
+
+
+TELEGRAM_ID_BASE = 1_000_000_000
+
+STATUSES = tuple(status.value for status in BookingStatus)
+
+TIME_SLOTS = [(dt_time(hour, 0), dt_time(hour + 2, 0)) for hour in range(10, 22, 2)]
+
+FIRST_NAMES = ('Иван', 'Пётр', 'Анна', 'Мария', 'Алексей', 'Ольга', 'Дмитрий', 'Елена', 'Сергей', 'Наталья')
+LAST_NAMES = ('Иванов', 'Петров', 'Смирнов', 'Кузнецов', 'Попов', 'Соколов', 'Лебедев', 'Козлов', 'Новиков')
+TABLE_PLACES = ('У окна', 'В центре зала', 'На террасе', 'У бара', 'В VIP-зоне')
+
+USER_COLUMNS = ('id', 'telegram_id', 'username', 'first_name', 'last_name')
+TABLE_COLUMNS = ('id', 'capacity', 'description')
+TIME_SLOT_COLUMNS = ('id', 'start_time', 'end_time')
+BOOKING_COLUMNS = ('id', 'user_id', 'table_id', 'time_slot_id', 'date', 'status')
+
+
+def parse_status_mix(value: str) -> Dict[str, float]:
+    """Разбирает смесь статусов вида 'booked=6,completed=3,canceled=1'."""
+    mix = {}
+    for part in value.split(','):
+        status, _, weight = part.partition('=')
+        if status not in STATUSES:
+            raise argparse.ArgumentTypeError(f'Неизвестный статус: {status}')
+        mix[status] = float(weight or 1)
+    return mix
+
+
+@dataclass
+class SeedConfig:
+    """
+    Параметры генерации.
+
+    :param users: Количество пользователей.
+    :param tables: Количество столов.
+    :param days: Количество дней с бронированиями.
+    :param start_date: Первый день; по умолчанию половина периода в прошлом, половина в будущем.
+    :param occupancy: Доля занятых ячеек (дата, слот, стол).
+    :param status_mix: Веса статусов бронирований.
+    :param seed: Зерно генератора случайных чисел.
+    :param chunk_size: Размер пакета при загрузке.
+    """
+
+    users: int = 1000
+    tables: int = 20
+    days: int = 90
+    start_date: date | None = None
+    occupancy: float = 0.5
+    status_mix: Dict[str, float] = field(default_factory=lambda: {'booked': 6, 'completed': 3, 'canceled': 1})
+    seed: int = 42
+    chunk_size: int = 50_000
+
+    def first_day(self) -> date:
+        return self.start_date or date.today() - timedelta(days=self.days // 2)
+
+
+def generate_users(config: SeedConfig) -> Iterator[Tuple]:
+    rng = random.Random(f'{config.seed}:users')
+    for i in range(1, config.users + 1):
+        yield (i, TELEGRAM_ID_BASE + i, f'user_{i}', rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES))
+
+
+def generate_tables(config: SeedConfig) -> Iterator[Tuple]:
+    rng = random.Random(f'{config.seed}:tables')
+    for i in range(1, config.tables + 1):
+        yield (i, rng.choice((2, 2, 4, 4, 4, 6, 8)), f'{rng.choice(TABLE_PLACES)} №{i}')
+
+
+def generate_time_slots(config: SeedConfig) -> Iterator[Tuple]:
+    for i, (start, end) in enumerate(TIME_SLOTS, start=1):
+        yield (i, start, end)
+
+
+def generate_bookings(config: SeedConfig) -> Iterator[Tuple]:
+    """Бронирования по ячейкам (дата, слот, стол) в порядке дат: не больше одного на ячейку."""
+    rng = random.Random(f'{config.seed}:bookings')
+    statuses = list(config.status_mix)
+    # Статус хранится кодом SMALLINT
+    status_codes = [BOOKING_STATUS_CODES[BookingStatus(status)] for status in statuses]
+    cum_weights = []
+    total = 0.0
+    for status in statuses:
+        total += config.status_mix[status]
+        cum_weights.append(total)
+
+    table_ids = range(1, config.tables + 1)
+    booking_id = 0
+    first_day = config.first_day()
+    for day in range(config.days):
+        booking_date = first_day + timedelta(days=day)
+        for slot_id in range(1, len(TIME_SLOTS) + 1):
+            booked = [table_id for table_id in table_ids if rng.random() < config.occupancy]
+            if not booked:
+                continue
+            user_ids = rng.choices(range(1, config.users + 1), k=len(booked))
+            slot_statuses = rng.choices(status_codes, cum_weights=cum_weights, k=len(booked))
+            for table_id, user_id, status in zip(booked, user_ids, slot_statuses):
+                booking_id += 1
+                yield (booking_id, user_id, table_id, slot_id, booking_date, status)
+
+
+def chunked(rows: Iterator[Tuple], size: int) -> Iterator[List[Tuple]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class LoadReport:
+    """Замеры загрузки по таблицам."""
+
+    def __init__(self):
+        self.rows: Dict[str, Tuple[int, float]] = {}
+
+    def add(self, table: str, count: int, seconds: float) -> None:
+        self.rows[table] = (count, seconds)
+
+    def print(self) -> None:
+        print(f'{"таблица":<12} {"строк":>12} {"секунд":>8} {"строк/с":>12}')
+        for table, (count, seconds) in self.rows.items():
+            print(f'{table:<12} {count:>12} {seconds:8.2f} {count / max(seconds, 1e-9):12.0f}')
+        count = sum(count for count, _ in self.rows.values())
+        seconds = sum(seconds for _, seconds in self.rows.values())
+        print(f'{"всего":<12} {count:>12} {seconds:8.2f} {count / max(seconds, 1e-9):12.0f}')
+
+
+def table_sources(config: SeedConfig):
+    return [
+        ('users', USER_COLUMNS, generate_users(config)),
+        ('tables', TABLE_COLUMNS, generate_tables(config)),
+        ('time_slots', TIME_SLOT_COLUMNS, generate_time_slots(config)),
+        ('bookings', BOOKING_COLUMNS, generate_bookings(config)),
+    ]
+
+
+async def prepare_schema(url: URL, drop: bool) -> None:
+    """Создаёт схему; с drop — пересоздаёт. Отказывается заполнять непустую БД без drop."""
+    # Импорт здесь: модуль приложения читает настройки, которые вызывающий код может подменить
+    from app.db.database import Base
+    from app.db.models import models  # noqa: F401 — регистрация моделей в metadata
+
+    engine = create_async_engine(url)
+    try:
+        async with engine.begin() as connection:
+            if drop:
+                await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+            if (await connection.execute(text('SELECT 1 FROM users LIMIT 1'))).first() is not None:
+                raise SystemExit('БД уже содержит данные: используйте --drop, чтобы пересоздать схему')
+    finally:
+        await engine.dispose()
+
+
+def load_sqlite(path: str, config: SeedConfig) -> LoadReport:
+    """Загрузка в SQLite: executemany пакетами в одной транзакции."""
+    report = LoadReport()
+    connection = sqlite3.connect(path)
+    try:
+        connection.execute('PRAGMA journal_mode = MEMORY')
+        connection.execute('PRAGMA synchronous = OFF')
+        for table, columns, rows in table_sources(config):
+            sql = f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})'
+            count = 0
+            start = time.perf_counter()
+            for chunk in chunked(rows, config.chunk_size):
+                # Формат хранения даты и времени совпадает с типами Date/Time SQLAlchemy для SQLite
+                connection.executemany(sql, [
+                    tuple(value.isoformat() if isinstance(value, (date, dt_time)) else value for value in row)
+                    for row in chunk
+                ])
+                count += len(chunk)
+            connection.commit()
+            report.add(table, count, time.perf_counter() - start)
+        connection.execute('PRAGMA journal_mode = DELETE')
+    finally:
+        connection.close()
+    return report
+
+
+async def load_postgres(dsn: str, config: SeedConfig) -> LoadReport:
+    """Загрузка в PostgreSQL: COPY пакетами через asyncpg, затем сдвиг последовательностей ID."""
+    try:
+        import asyncpg
+    except ImportError:
+        raise SystemExit('Для загрузки в PostgreSQL нужен пакет asyncpg')
+
+    report = LoadReport()
+    connection = await asyncpg.connect(dsn)
+    try:
+        for table, columns, rows in table_sources(config):
+            count = 0
+            start = time.perf_counter()
+            async with connection.transaction():
+                for chunk in chunked(rows, config.chunk_size):
+                    await connection.copy_records_to_table(table, records=chunk, columns=columns)
+                    count += len(chunk)
+                await connection.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 1)) FROM {table}"
+                )
+            report.add(table, count, time.perf_counter() - start)
+        await connection.execute('ANALYZE')
+    finally:
+        await connection.close()
+    return report
+
+
+async def rebuild_summaries(url: URL, report: LoadReport) -> None:
+    """Пересчитывает сводные таблицы (daily_occupancy) по загруженным броням."""
+    from app.dao.bookings_dao import BookingDAO
+
+    engine = create_async_engine(url)
+    try:
+        start = time.perf_counter()
+        async with AsyncSession(engine) as session:
+            count = await BookingDAO.rebuild_occupancy(session)
+        report.add('daily_occupancy', count, time.perf_counter() - start)
+    finally:
+        await engine.dispose()
+
+
+def seed(url: str, config: SeedConfig, drop: bool = False) -> LoadReport:
+    """
+    Заполняет БД синтетическими данными.
+
+    :param url: URL базы в формате SQLAlchemy (sync или async драйвер).
+    :param config: Параметры генерации.
+    :param drop: Пересоздать схему перед загрузкой.
+    :return: Замеры загрузки по таблицам.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == 'sqlite':
+        if not parsed.database or parsed.database == ':memory:':
+            raise SystemExit('Для SQLite нужен путь к файлу БД')
+        async_url = parsed.set(drivername='sqlite+aiosqlite')
+        asyncio.run(prepare_schema(async_url, drop))
+        report = load_sqlite(parsed.database, config)
+    elif backend == 'postgresql':
+        async_url = parsed.set(drivername='postgresql+asyncpg')
+        asyncio.run(prepare_schema(async_url, drop))
+        dsn = parsed.set(drivername='postgresql').render_as_string(hide_password=False)
+        report = asyncio.run(load_postgres(dsn, config))
+    else:
+        raise SystemExit(f'Неподдерживаемая БД: {backend}')
+    asyncio.run(rebuild_summaries(async_url, report))
+    return report
+
+
+def main():
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default=settings.get_database_url, help='URL БД (по умолчанию DATABASE_URL)')
+    parser.add_argument('--users', type=int, default=SeedConfig.users)
+    parser.add_argument('--tables', type=int, default=SeedConfig.tables)
+    parser.add_argument('--days', type=int, default=SeedConfig.days)
+    parser.add_argument('--start-date', type=date.fromisoformat, default=None,
+                        help='Первый день (YYYY-MM-DD); по умолчанию половина периода в прошлом')
+    parser.add_argument('--occupancy', type=float, default=SeedConfig.occupancy, help='Доля занятых ячеек, 0..1')
+    parser.add_argument('--status-mix', type=parse_status_mix, default='booked=6,completed=3,canceled=1')
+    parser.add_argument('--seed', type=int, default=SeedConfig.seed)
+    parser.add_argument('--chunk-size', type=int, default=SeedConfig.chunk_size)
+    parser.add_argument('--drop', action='store_true', help='Пересоздать схему перед загрузкой')
+    args = parser.parse_args()
+
+    config = SeedConfig(
+        users=args.users, tables=args.tables, days=args.days, start_date=args.start_date,
+        occupancy=args.occupancy, status_mix=args.status_mix, seed=args.seed, chunk_size=args.chunk_size,
+    )
+    cells = config.days * len(TIME_SLOTS) * config.tables
+    print(f'Генерация: {config.users} пользователей, {config.tables} столов, {config.days} дней '
+          f'с {config.first_day()}, ~{int(cells * config.occupancy)} бронирований, seed={config.seed}')
+    seed(args.url, config, drop=args.drop).print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""
+Тест на утечки памяти вебхука: длительная синтетическая нагрузка со снимками tracemalloc.
+
+Нагрузка та же, что в benchmarks.load_webhook (те же параметры). Каждые --interval секунд
+снимаются показатели процесса: RSS, объём памяти под tracemalloc, живые HTTP-клиенты
+(и размер пула HTTPClientManager), живые сессии SQLAlchemy, суммарный размер их identity map,
+задачи планировщика. Перед замером выполняется gc.collect(), чтобы считать только живые объекты.
+
+В конце печатаются места с наибольшим приростом памяти между первым (после прогрева)
+и последним снимком и отмечаются показатели, которые росли монотонно (не убывали ни разу
+и продолжали расти во второй половине теста): HTTP-клиенты, сессии, identity map,
+задачи планировщика.
+С --fail-on-growth такие показатели дают код завершения 1.
+
+Запуск (нужен .env, как для приложения; БД, STORE_URL и TG_API_URL подменяются):
+    python -m benchmarks.soak_webhook --duration 600 --interval 30 --rate 50
+    python -m benchmarks.soak_webhook --duration 120 --interval 10 --top 15 --fail-on-growth
+"""
+
+import asyncio
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.load_webhook import (
+    Stats, UpdateFactory, build_parser, install_app, prepare_environment, report, run_load, warm_up,
+)
+
+
+# Показатели, монотонный рост которых считается утечкой
+LEAK_GAUGES = ('http_clients', 'sessions', 'identity_map', 'scheduler_jobs')
+
+
+def rss_mb() -> float:
+    """RSS процесса в МБ (Linux: /proc/self/status, иначе пиковое значение из resource)."""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def sample_gauges(exclude: httpx.AsyncClient) -> Dict[str, float]:
+    """Снимает показатели процесса после полной сборки мусора (exclude — клиент самого теста)."""
+    from sqlalchemy.orm import Session
+
+    from app.async_client import http_client_manager
+    from app.core.config import get_scheduler
+
+    gc.collect()
+    http_clients = sessions = identity_map = 0
+    for obj in gc.get_objects():
+        if isinstance(obj, httpx.AsyncClient):
+            http_clients += obj is not exclude and not obj.is_closed
+        elif isinstance(obj, Session):
+            sessions += 1
+            identity_map += len(obj.identity_map)
+
+    return {
+        'rss_mb': rss_mb(),
+        'traced_mb': tracemalloc.get_traced_memory()[0] / 1024 / 1024,
+        'http_clients': http_clients,
+        'http_pool': len(http_client_manager._clients),
+        'sessions': sessions,
+        'identity_map': identity_map,
+        'scheduler_jobs': len(get_scheduler().get_jobs()),
+    }
+
+
+def monotonic_growth(values: List[float]) -> bool:
+    """
+    Ряд ни разу не убывал и продолжал расти во второй половине теста.
+
+    Рост только в начале (например, заполнение пула до предела) утечкой не считается.
+    """
+    return (
+        len(values) > 2
+        and all(b >= a for a, b in zip(values, values[1:]))
+        and values[-1] > values[len(values) // 2]
+    )
+
+
+def print_sample(elapsed: float, gauges: Dict[str, float], updates: int) -> None:
+    print(
+        f'{elapsed:7.0f} с  апдейтов {updates:>8}  RSS {gauges["rss_mb"]:7.1f} МБ  '
+        f'traced {gauges["traced_mb"]:6.1f} МБ  HTTP {gauges["http_clients"]:>3} (пул {gauges["http_pool"]:>2})  '
+        f'сессий {gauges["sessions"]:>4}  identity map {gauges["identity_map"]:>6}  '
+        f'задач {gauges["scheduler_jobs"]:>5}',
+        flush=True,
+    )
+
+
+async def sample_loop(client: httpx.AsyncClient, stats: Stats, interval: float, samples: List[Dict[str, float]],
+                      snapshots: List[tracemalloc.Snapshot], stop: asyncio.Event) -> None:
+    start = time.perf_counter()
+    while True:
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        gauges = sample_gauges(client)
+        samples.append(gauges)
+        snapshots[1:] = [tracemalloc.take_snapshot()]
+        print_sample(time.perf_counter() - start, gauges, sum(len(values) for values in stats.latencies.values()))
+        if stop.is_set():
+            return
+
+
+def print_top_growth(first: tracemalloc.Snapshot, last: tracemalloc.Snapshot, top: int) -> None:
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    ]
+    stats = last.filter_traces(filters).compare_to(first.filter_traces(filters), 'lineno')
+    print(f'\nНаибольший прирост памяти (топ-{top}):')
+    for stat in sorted(stats, key=lambda item: item.size_diff, reverse=True)[:top]:
+        frame = stat.traceback[0]
+        print(f'  {stat.size_diff / 1024:+10.1f} КБ  {stat.count_diff:+8} блоков  {frame.filename}:{frame.lineno}')
+
+
+def print_growth_flags(samples: List[Dict[str, float]]) -> List[str]:
+    first, last = samples[0], samples[-1]
+    print(f'\nRSS: {first["rss_mb"]:.1f} -> {last["rss_mb"]:.1f} МБ, '
+          f'tracemalloc: {first["traced_mb"]:.1f} -> {last["traced_mb"]:.1f} МБ')
+    flagged = [name for name in LEAK_GAUGES if monotonic_growth([sample[name] for sample in samples])]
+    for name in LEAK_GAUGES:
+        mark = 'МОНОТОННЫЙ РОСТ' if name in flagged else 'ok'
+        print(f'  {name:<16} {first[name]:>8} -> {last[name]:<8} {mark}')
+    return flagged
+
+
+async def run_soak(args, fake_api) -> List[str]:
+    stats = Stats()
+    app = install_app(args, fake_api, stats)
+    factory = UpdateFactory(args.users, args.mix, seed=args.seed)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    samples: List[Dict[str, float]] = []
+    snapshots: List[tracemalloc.Snapshot] = []
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url='http://loadtest') as client:
+            await warm_up(client, factory, args)
+            fake_api.reset()
+            stats.statements.clear()
+
+            # Точка отсчёта — после прогрева: кеши и пулы уже заполнены
+            samples.append(sample_gauges(client))
+            snapshots.append(tracemalloc.take_snapshot())
+            print_sample(0, samples[0], 0)
+
+            stop = asyncio.Event()
+            sampler = asyncio.create_task(sample_loop(client, stats, args.interval, samples, snapshots, stop))
+            elapsed = await run_load(client, factory, stats, args)
+            stop.set()
+            await sampler
+
+    report(stats, fake_api, elapsed)
+    print_top_growth(snapshots[0], snapshots[-1], args.top)
+    return print_growth_flags(samples)
+
+
+def main():
+    parser = build_parser(__doc__)
+    parser.set_defaults(duration=300, rate=50)
+    parser.add_argument('--interval', type=float, default=15, help='Интервал снимков, с')
+    parser.add_argument('--top', type=int, default=10, help='Сколько мест прироста памяти показать')
+    parser.add_argument('--frames', type=int, default=1, help='Глубина стека tracemalloc')
+    parser.add_argument('--fail-on-growth', action='store_true', help='Код 1 при монотонном росте показателей')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fake_api = prepare_environment(tmp, args)
+        tracemalloc.start(args.frames)
+        flagged = asyncio.run(run_soak(args, fake_api))
+        tracemalloc.stop()
+
+    if flagged and args.fail_on_growth:
+        print(f'\nПодозрение на утечку: {", ".join(flagged)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()